@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.forms import UserCreationForm, UserChangeForm
-from .models import User, Item, Sale, SaleItem, Rating
+from .models import User, Item, ItemBarcode, Sale, SaleItem, SaleReturn, SaleReturnLine, Shift, StockAdjustment, StockAdjustmentLine, Rating, ItemForecast, OutboxEvent, PromotionRule, PromotionItem, TaxRule, Task
 
 admin.site.site_header = "Kali Coffee Dashboard"  
 admin.site.site_title = "Kali Coffee Admin" 
@@ -55,13 +55,21 @@ class UserAdmin(BaseUserAdmin):
                 obj.set_password(form.cleaned_data["password1"])
         super().save_model(request, obj, form, change)
 
+# Item Barcode Inline
+class ItemBarcodeInline(admin.TabularInline):
+    model = ItemBarcode
+    extra = 1
+    fields = ["code"]
+
 # Item Admin
 class ItemAdmin(admin.ModelAdmin):
-    list_display = ["item_name", "price", "quantity", "created_at"]
+    list_display = ["item_name", "sku", "price", "quantity", "created_at"]
+    search_fields = ["item_name", "sku", "barcodes__code"]
+    inlines = [ItemBarcodeInline]
 
 # Sale Item Admin
 class SaleItemAdmin(admin.ModelAdmin):
-    list_display = ["item", "sale", "quantity", "subtotal"]
+    list_display = ["item", "sale", "quantity", "unit_price", "discount", "subtotal"]
 
 # Rating Admin
 class RatingAdmin(admin.ModelAdmin):
@@ -69,11 +77,83 @@ class RatingAdmin(admin.ModelAdmin):
 
 # Sale Admin
 class SaleAdmin(admin.ModelAdmin):
-    list_display = ["staff", "sale_date", "total_amount", "created_at"]
+    list_display = ["staff", "sale_date", "total_amount", "is_void", "created_at"]
+    list_filter = ["is_void"]
+
+# Sale Return Line Inline
+class SaleReturnLineInline(admin.TabularInline):
+    model = SaleReturnLine
+    extra = 0
+    readonly_fields = ["sale_item", "item", "quantity", "unit_price", "refund_amount"]
+
+# Sale Return Admin
+class SaleReturnAdmin(admin.ModelAdmin):
+    list_display = ["sale", "staff", "return_date", "refund_amount"]
+    inlines = [SaleReturnLineInline]
+
+# Stock Adjustment Line Inline
+class StockAdjustmentLineInline(admin.TabularInline):
+    model = StockAdjustmentLine
+    extra = 0
+    readonly_fields = ["item", "expected", "counted", "delta"]
+
+# Stock Adjustment Admin
+class StockAdjustmentAdmin(admin.ModelAdmin):
+    list_display = ["reason", "staff", "created_at", "line_count", "variance_units", "variance_value"]
+    list_filter = ["reason"]
+    inlines = [StockAdjustmentLineInline]
+
+# Shift Admin
+class ShiftAdmin(admin.ModelAdmin):
+    list_display = ["staff", "opened_at", "closed_at", "sale_count", "item_count", "revenue"]
+    list_filter = ["closed_at"]
+
+# Item Forecast Admin
+class ItemForecastAdmin(admin.ModelAdmin):
+    list_display = ["item", "avg_daily_demand", "stock_on_hand", "days_until_stockout", "reorder_quantity", "computed_at"]
+
+# Outbox Event Admin
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ["event_id", "topic", "key", "status", "attempts", "created_at", "sent_at"]
+    list_filter = ["status", "topic"]
+    search_fields = ["key"]
+    readonly_fields = ["topic", "key", "payload", "created_at", "sent_at", "last_error"]
+
+# Pricing Rule Admin
+class PromotionItemInline(admin.TabularInline):
+    model = PromotionItem
+    extra = 1
+    autocomplete_fields = ["item"]
+
+class PromotionRuleAdmin(admin.ModelAdmin):
+    list_display = ["name", "kind", "value", "applies_to_all", "weekdays", "start_time", "end_time", "starts_at", "ends_at", "is_active"]
+    list_filter = ["kind", "is_active"]
+    search_fields = ["name"]
+    inlines = [PromotionItemInline]
+
+class TaxRuleAdmin(admin.ModelAdmin):
+    list_display = ["name", "rate", "applies_to_all", "is_active"]
+    list_filter = ["is_active"]
+    filter_horizontal = ["items"]
+
+# Task Admin
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ["task_id", "job", "status", "run_at", "attempts", "locked_by", "finished_at"]
+    list_filter = ["status", "job"]
+    search_fields = ["dedupe_key"]
+    readonly_fields = ["result", "last_error", "created_at", "started_at", "finished_at"]
 
 # Register models
 admin.site.register(User, UserAdmin)
 admin.site.register(Item, ItemAdmin)
 admin.site.register(Sale, SaleAdmin)
 admin.site.register(SaleItem, SaleItemAdmin)
-admin.site.register(Rating, RatingAdmin)
\ No newline at end of file
+admin.site.register(SaleReturn, SaleReturnAdmin)
+admin.site.register(StockAdjustment, StockAdjustmentAdmin)
+admin.site.register(Shift, ShiftAdmin)
+admin.site.register(Rating, RatingAdmin)
+admin.site.register(ItemForecast, ItemForecastAdmin)
+admin.site.register(OutboxEvent, OutboxEventAdmin)
+admin.site.register(PromotionRule, PromotionRuleAdmin)
+admin.site.register(TaxRule, TaxRuleAdmin)
+admin.site.register(Task, TaskAdmin)
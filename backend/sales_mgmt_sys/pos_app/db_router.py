@@ -0,0 +1,140 @@
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = "replica"
+FRESH_VALUES = ("1", "true", "yes")
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Alias reads go to in the current request; None means the primary
+_reads = contextvars.ContextVar("pos_reads", default=None)
+
+
+def replica_path():
+    return getattr(settings, "REPLICA_PATH", None)
+
+
+def replica_ready():
+    """
+    Whether the replica can serve reads. A snapshot copy (``REPLICA_PATH``)
+    must exist and be younger than ``REPLICA_MAX_LAG`` seconds, so a refresher
+    that stopped running sends reports back to the primary instead of serving
+    ever older numbers; a replica without a path is trusted as configured.
+    """
+    if REPLICA_ALIAS not in connections.databases:
+        return False
+    # A test mirror is the primary itself; a second connection to it would not see the test's transaction
+    if connections.databases[REPLICA_ALIAS]["NAME"] == connections.databases[DEFAULT_DB_ALIAS]["NAME"]:
+        return False
+    path = replica_path()
+    if not path:
+        return True
+    try:
+        age = time.time() - os.stat(path).st_mtime
+    except OSError:
+        return False
+    return age <= getattr(settings, "REPLICA_MAX_LAG", 300)
+
+
+def snapshot():
+    """Identify the replica copy current reads see, or ``None`` when they go to the primary."""
+    if _reads.get() != REPLICA_ALIAS:
+        return None
+    try:
+        return os.stat(replica_path()).st_mtime_ns
+    except OSError:
+        return None
+
+
+@contextmanager
+def reading_from(alias):
+    token = _reads.set(alias)
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+def use_replica():
+    """Send reads in this block to the replica when it is ready, otherwise to the primary."""
+    return reading_from(REPLICA_ALIAS if replica_ready() else None)
+
+
+def use_primary():
+    """Send reads in this block to the primary, e.g. a report that must include the sale just made."""
+    return reading_from(None)
+
+
+def bind(iterable):
+    """
+    Iterate ``iterable`` with the reads routing of the caller.
+
+    Streaming responses are consumed after the view has returned and its
+    routing has been reset, so each step re-enters the routing that was
+    current when the response was built.
+    """
+    # Captured now, not on the first step: this function is not itself a generator
+    return _iterate_reading_from(_reads.get(), iter(iterable))
+
+
+def _iterate_reading_from(alias, iterator):
+    while True:
+        token = _reads.set(alias)
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _reads.reset(token)
+        yield item
+
+
+class ReplicaRouter:
+    """
+    Route reads to the alias chosen for the current request and every write to the primary.
+
+    Outside ``use_replica()`` blocks all queries go to the primary, so
+    checkout, stock and other write paths never read a stale copy.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _reads.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica is a copy of the primary, so rows from either may be related
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the copy, never from migrations
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaReadMixin:
+    """
+    Serve a view's read requests from the replica; ``?fresh=1`` reads from the primary.
+
+    Routing starts after authentication so a user created since the last
+    copy can still sign in.
+    """
+
+    _reads_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and request.query_params.get("fresh", "").lower() not in FRESH_VALUES:
+            self._reads_token = _reads.set(REPLICA_ALIAS if replica_ready() else None)
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._reads_token is not None:
+                _reads.reset(self._reads_token)
+                self._reads_token = None
@@ -0,0 +1,62 @@
+"""
+Jobs the task queue can run (see pos_app.services.tasks.JOBS).
+
+Each takes JSON-friendly keyword arguments and returns a JSON-friendly
+result. Services are imported inside the jobs, so NumPy and the archive
+code only load in the worker that needs them.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+
+def refresh_staff_performance(days=30):
+    """Materialize the stale staff performance rows of the last ``days`` days, keeping the dashboard warm."""
+    from pos_app.services import staff_performance
+
+    today = timezone.localdate()
+    return {"rows": staff_performance.ensure(today - timedelta(days=days - 1), today)}
+
+
+def compute_forecasts(**options):
+    from pos_app.services import forecasting
+
+    return {"items": forecasting.compute_forecasts(**options)}
+
+
+def archive_sales(**options):
+    from pos_app.services import archive
+
+    return archive.archive_sales(**options)
+
+
+def backup_db():
+    from pos_app.services import backups
+
+    result = backups.create_backup()
+    return {"path": str(result["path"]), "bytes": result["bytes"], "seconds": result["seconds"]}
+
+
+def refresh_replica():
+    from pos_app.services import replica
+
+    result = replica.refresh()
+    return {"path": str(result["path"]), "bytes": result["bytes"], "seconds": result["seconds"]}
+
+
+def dispatch_outbox():
+    """Deliver every pending outbox event that is due, batch by batch."""
+    from pos_app.services import outbox
+
+    sinks, sent = outbox.load_sinks(), 0
+    while True:
+        result = outbox.dispatch(sinks)
+        sent += result["sent"]
+        if not result["sent"]:
+            return {"sent": sent, "failed": result["failed"], "held": result["held"]}
+
+
+def purge_tasks(days=None):
+    from pos_app.services import tasks
+
+    return {"purged": tasks.purge(days) if days is not None else tasks.purge()}
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from pos_app.services import archive
+
+
+class Command(BaseCommand):
+    help = "Move sales older than the archive horizon into compressed archive files."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=archive.HORIZON_DAYS,
+                            help="Archive sales dated more than this many days ago.")
+        parser.add_argument("--chunk-size", type=int, default=archive.CHUNK_SIZE,
+                            help="Sales per archive file and transaction.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many sales would move.")
+        parser.add_argument("--vacuum", action="store_true",
+                            help="Reclaim freed pages afterwards so the hot database file shrinks.")
+
+    def handle(self, *args, **options):
+        result = archive.archive_sales(
+            horizon_days=options["days"], chunk_size=options["chunk_size"], dry_run=options["dry_run"]
+        )
+        if options["dry_run"]:
+            self.stdout.write(f"{result['sales']} sales would be archived.")
+            return
+
+        if options["vacuum"] and result["sales"] and connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM")
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {result['sales']} sales into {result['files']} files."))
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pos_app.services import backups
+
+
+class Command(BaseCommand):
+    help = (
+        "Snapshot the SQLite database into BACKUP_ROOT with the online backup API while terminals keep writing, "
+        "then rotate old snapshots. Runs once, or every --interval seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0,
+                            help="Keep taking backups every this many seconds (0 backs up once).")
+        parser.add_argument("--pages", type=int, default=backups.STEP_PAGES,
+                            help="Pages copied per step; writers wait for at most one step.")
+        parser.add_argument("--sleep", type=float, default=backups.STEP_SLEEP, help="Pause between steps, in seconds.")
+        parser.add_argument("--keep", type=int, default=backups.KEEP, help="Always keep this many newest backups.")
+        parser.add_argument("--keep-daily", type=int, default=backups.KEEP_DAILY,
+                            help="Also keep the newest backup of each of this many days.")
+        parser.add_argument("--list", action="store_true", help="List existing backups and exit.")
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for path in backups.list_backups():
+                self.stdout.write(f"{path.name}  {path.stat().st_size / 1024:.0f} KiB")
+            return
+
+        while True:
+            try:
+                result = backups.create_backup(
+                    pages=options["pages"], sleep=options["sleep"], keep=options["keep"], keep_daily=options["keep_daily"],
+                )
+            except backups.BackupError as e:
+                raise CommandError(str(e))
+            self.stdout.write(
+                f"Backed up {result['pages']} pages ({result['bytes'] / 1024:.0f} KiB) to {result['path']} "
+                f"in {result['seconds']:.3f} s: {result['steps']} steps, {result['restarts']} restarts"
+                + (", finished in one step" if result["single_step"] else "")
+            )
+            if result["rotated"]:
+                self.stdout.write(f"Rotated out {len(result['rotated'])} old backups.")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
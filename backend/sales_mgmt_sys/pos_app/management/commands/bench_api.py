@@ -0,0 +1,64 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from pos_app.renderers import FastJSONRenderer, orjson
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Benchmark list endpoints: bytes on the wire and server CPU per response, per encoder."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", default=["/v1/items/", "/v1/sales/"])
+        parser.add_argument("--username", help="User to authenticate as (default: first manager or superuser).")
+        parser.add_argument("--requests", type=int, default=50, help="Requests per path and configuration.")
+
+    def get_user(self, username):
+        users = User.objects.filter(is_active=True)
+        if username:
+            users = users.filter(username=username)
+        else:
+            users = users.filter(role__in=["Manager", "Superuser"])
+        user = users.order_by("user_id").first()
+        if user is None:
+            raise CommandError("No matching active user to authenticate as.")
+        return user
+
+    def handle(self, *args, **options):
+        token = self.get_user(options["username"]).get_tokens()["access"]
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        encoders = ["stdlib"] + (["orjson"] if orjson is not None else [])
+        original = FastJSONRenderer.encoder
+        self.stdout.write(f"{'path':<16} {'encoder':<8} {'gzip':<5} {'bytes':>9} {'cpu ms p50':>11} {'cpu ms p95':>11}")
+        try:
+            for path in options["paths"]:
+                for encoder in encoders:
+                    FastJSONRenderer.encoder = encoder
+                    for gzip in (False, True):
+                        size, cpu = self.measure(client, path, gzip, options["requests"])
+                        p95 = statistics.quantiles(cpu, n=20)[-1] if len(cpu) > 1 else cpu[0]
+                        self.stdout.write(
+                            f"{path:<16} {encoder:<8} {'yes' if gzip else 'no':<5} {size:>9} "
+                            f"{statistics.median(cpu):>11.2f} {p95:>11.2f}"
+                        )
+        finally:
+            FastJSONRenderer.encoder = original
+
+    def measure(self, client, path, gzip, count):
+        headers = {"HTTP_ACCEPT_ENCODING": "gzip"} if gzip else {}
+        cpu, size = [], 0
+        client.get(path, **headers)  # warm caches and imports
+        for _ in range(count):
+            start = time.process_time()
+            response = client.get(path, **headers)
+            cpu.append((time.process_time() - start) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f"{path} returned {response.status_code}")
+            size = len(response.content)
+        return size, cpu
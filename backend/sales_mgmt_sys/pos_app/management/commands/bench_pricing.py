@@ -0,0 +1,93 @@
+import random
+import statistics
+import time
+from datetime import time as dt_time, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from pos_app.models.pricing_rule import PromotionRule
+from pos_app.services import pricing
+
+KINDS = [PromotionRule.PERCENT_OFF, PromotionRule.AMOUNT_OFF, PromotionRule.FIXED_PRICE]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the pricing engine: compile synthetic promotion and tax rules, then price large baskets against them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=2000, help="Items in the synthetic catalog.")
+        parser.add_argument("--rules", type=int, default=5000, help="Promotion rules (a quarter of them combos).")
+        parser.add_argument("--taxes", type=int, default=20, help="Tax rules (two of them cover every item).")
+        parser.add_argument("--lines", type=int, default=500, help="Lines per basket.")
+        parser.add_argument("--baskets", type=int, default=200, help="Baskets to price.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def rules(self, options, rng):
+        """Rule rows shaped like those pricing.build loads from the database."""
+        now = timezone.now()
+        items = range(1, options["items"] + 1)
+        promotions, members = [], []
+        for rule_id in range(1, options["rules"] + 1):
+            combo = rule_id % 4 == 0
+            kind = PromotionRule.COMBO if combo else rng.choice(KINDS)
+            happy_hour = rng.random() < 0.5
+            start = rng.randrange(24)
+            promotions.append({
+                "rule_id": rule_id,
+                "name": f"Rule {rule_id}",
+                "kind": kind,
+                "value": Decimal(rng.randrange(5, 40)) if kind == PromotionRule.PERCENT_OFF else Decimal(rng.randrange(50, 500)) / 100,
+                # A handful of store-wide rules, as a shop would have
+                "applies_to_all": not combo and rule_id % 1000 == 1,
+                "starts_at": now - timedelta(days=rng.randrange(1, 30)) if rng.random() < 0.3 else None,
+                "ends_at": now + timedelta(days=rng.randrange(1, 30)) if rng.random() < 0.3 else None,
+                "weekdays": "".join(sorted(rng.sample("1234567", rng.randint(1, 7)))) if rng.random() < 0.3 else "",
+                "start_time": dt_time(start) if happy_hour else None,
+                "end_time": dt_time((start + rng.randint(1, 4)) % 24) if happy_hour else None,
+                "created_at": now - timedelta(days=60),
+            })
+            for item_id in rng.sample(items, rng.randint(2, 3) if combo else rng.randint(1, 5)):
+                members.append((rule_id, item_id, rng.randint(1, 2) if combo else 1))
+        taxes = [(rule_id, Decimal(rng.choice([8, 16])), rule_id <= 2) for rule_id in range(1, options["taxes"] + 1)]
+        tax_items = [(rule_id, item_id) for rule_id, _, _ in taxes[2:] for item_id in rng.sample(items, 50)]
+        return promotions, members, taxes, tax_items
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        rows = self.rules(options, rng)
+
+        started = time.perf_counter()
+        table = pricing.compile_rules(0, *rows)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        prices = {item_id: Decimal(rng.randrange(100, 2000)) / 100 for item_id in range(1, options["items"] + 1)}
+        baskets = []
+        for _ in range(options["baskets"]):
+            picks = rng.sample(sorted(prices), min(options["lines"], len(prices)))
+            baskets.append([(item_id, rng.randint(1, 4), prices[item_id]) for item_id in picks])
+
+        now = timezone.now()
+        pricing.quote(baskets[0], at=now, table=table)  # warm up
+        timings, discounted, promotions = [], 0, 0
+        for n, basket in enumerate(baskets):
+            # Spread the baskets over a week so time windows open and close
+            at = now + timedelta(minutes=n * 7 * 24 * 60 // len(baskets))
+            started = time.perf_counter()
+            quote = pricing.quote(basket, at=at, table=table)
+            timings.append((time.perf_counter() - started) * 1000)
+            discounted += sum(1 for line in quote.lines if line.discount)
+            promotions += sum(len(line.promotions) for line in quote.lines)
+
+        lines = sum(len(basket) for basket in baskets)
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        self.stdout.write(
+            f"Compiled {options['rules']} promotions and {options['taxes']} tax rules over {options['items']} items "
+            f"in {compile_ms:.1f} ms"
+        )
+        self.stdout.write(
+            f"Priced {len(baskets)} baskets of {options['lines']} lines: p50 {statistics.median(timings):.2f} ms, "
+            f"p95 {p95:.2f} ms, {sum(timings) * 1000 / lines:.1f} us per line"
+        )
+        self.stdout.write(f"{discounted} of {lines} lines discounted, {promotions} promotions applied")
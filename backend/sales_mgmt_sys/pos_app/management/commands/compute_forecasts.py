@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pos_app.services import forecasting
+
+
+class Command(BaseCommand):
+    help = "Precompute restock forecasts for all active items (run nightly)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lookback", type=int, default=forecasting.LOOKBACK_DAYS,
+                            help=f"Days of sales history to learn demand from (at least {forecasting.MIN_LOOKBACK_DAYS}).")
+        parser.add_argument("--horizon", type=int, default=forecasting.HORIZON_DAYS,
+                            help="Days ahead to project stock levels (at least 1).")
+
+    def handle(self, *args, **options):
+        try:
+            count = forecasting.compute_forecasts(lookback=options["lookback"], horizon=options["horizon"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Computed forecasts for {count} items."))
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from pos_app.services import outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver pending sale and stock events from the outbox to the configured sinks (OUTBOX_SINKS)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0,
+                            help="Keep polling every this many seconds once the outbox is drained (0 drains it once).")
+        parser.add_argument("--batch-size", type=int, default=outbox.BATCH_SIZE,
+                            help="Events per delivery.")
+        parser.add_argument("--requeue-dead", action="store_true",
+                            help="Retry events that ran out of attempts before dispatching.")
+        parser.add_argument("--purge-days", type=int, default=outbox.RETAIN_DAYS,
+                            help="Delete events sent more than this many days ago.")
+
+    def handle(self, *args, **options):
+        sinks = outbox.load_sinks()
+        if options["requeue_dead"]:
+            self.stdout.write(f"Requeued {outbox.requeue_dead()} dead events")
+
+        while True:
+            totals = {"sent": 0, "failed": 0}
+            while True:
+                result = outbox.dispatch(sinks, batch_size=options["batch_size"])
+                totals["sent"] += result["sent"]
+                totals["failed"] += result["failed"]
+                # Stop on an empty or failed batch; failed events wait out their backoff
+                if not result["sent"]:
+                    break
+            purged = outbox.purge(options["purge_days"])
+            if totals["sent"] or totals["failed"] or purged or not options["interval"]:
+                self.stdout.write(
+                    f"Sent {totals['sent']} events, {totals['failed']} failed, {result['held']} held back, {purged} purged"
+                )
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pos_app.services import item_import
+
+
+class Command(BaseCommand):
+    help = "Create or update items from a CSV (with a header row) or NDJSON file, matching on sku, else item_name."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument("--format", choices=item_import.FORMATS,
+                            help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=item_import.CHUNK_SIZE,
+                            help="Rows per bulk_create/bulk_update.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only; nothing is written.")
+        parser.add_argument("--strict", action="store_true", help="Write nothing unless every row is valid.")
+
+    def handle(self, *args, **options):
+        try:
+            fmt = options["format"] or item_import.detect_format(options["path"])
+            with open(options["path"], "rb") as binary:
+                result = item_import.import_items(
+                    binary, fmt, dry_run=options["dry_run"], strict=options["strict"], chunk_size=options["chunk_size"],
+                )
+        except (OSError, item_import.ItemImportError) as e:
+            raise CommandError(str(e))
+
+        for error in result["errors"]:
+            messages = "; ".join(f"{field}: {' '.join(texts)}" for field, texts in error["errors"].items())
+            self.stderr.write(f"Row {error['row']}: {messages}")
+        if result["error_count"] > len(result["errors"]):
+            self.stderr.write(f"... and {result['error_count'] - len(result['errors'])} more errors")
+
+        summary = (
+            f"{result['rows']} rows: {result['created']} created, {result['updated']} updated, "
+            f"{result['unchanged']} unchanged, {result['error_count']} rejected"
+        )
+        if not result["applied"]:
+            self.stdout.write(f"{summary}. Nothing was written ({'dry run' if result['dry_run'] else 'strict mode'}).")
+        else:
+            self.stdout.write(self.style.SUCCESS(summary + "."))
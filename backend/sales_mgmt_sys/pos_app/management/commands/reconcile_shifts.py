@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from pos_app.services import shifts
+
+
+class Command(BaseCommand):
+    help = "Check shift running totals against a full recompute from their sales."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7, help="Check shifts opened in the last N days.")
+        parser.add_argument("--all", action="store_true", help="Check every shift, however old.")
+        parser.add_argument("--fix", action="store_true", help="Overwrite mismatched totals with the recomputed ones.")
+
+    def handle(self, *args, **options):
+        mismatches = shifts.reconcile(days=None if options["all"] else options["days"], fix=options["fix"])
+        for shift, stored, expected in mismatches:
+            self.stdout.write(
+                f"Shift {shift.shift_id} ({shift.staff.username}): stored {' / '.join(map(str, stored))}, "
+                f"recomputed {' / '.join(map(str, expected))} (sales / items / revenue)"
+            )
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("All shift totals match."))
+        elif options["fix"]:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(mismatches)} shifts."))
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(mismatches)} shifts out of sync; rerun with --fix to repair."))
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pos_app.services import backups, replica
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database to the read replica that serves reports, once or every --interval seconds."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0,
+                            help="Keep refreshing every this many seconds (0 copies once).")
+        parser.add_argument("--pages", type=int, default=backups.STEP_PAGES,
+                            help="Pages per backup step; -1 copies in one step.")
+        parser.add_argument("--path", help="Write the copy here instead of REPLICA_PATH.")
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                result = replica.refresh(options["path"], pages=options["pages"])
+            except replica.ReplicaError as e:
+                raise CommandError(str(e))
+            self.stdout.write(
+                f"Copied {result['pages']} pages ({result['bytes'] / 1024:.0f} KiB) to {result['path']} "
+                f"in {result['seconds']:.3f} s"
+            )
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
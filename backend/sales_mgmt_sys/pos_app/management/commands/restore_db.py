@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pos_app.services import backups
+
+
+class Command(BaseCommand):
+    help = "Replace the SQLite database with a backup taken by backup_db."
+
+    def add_arguments(self, parser):
+        parser.add_argument("backup", help="Backup file, its name in BACKUP_ROOT, or 'latest'.")
+        parser.add_argument("--no-input", action="store_true", help="Do not ask for confirmation.")
+        parser.add_argument("--no-safety-copy", action="store_true",
+                            help="Skip backing up the current database before overwriting it.")
+
+    def handle(self, *args, **options):
+        try:
+            path = backups.resolve(options["backup"])
+        except backups.BackupError as e:
+            raise CommandError(str(e))
+
+        if not options["no_input"]:
+            answer = input(f"Replace the current database with {path.name}? Sales since then are lost. [y/N] ")
+            if answer.strip().lower() not in ("y", "yes"):
+                raise CommandError("Restore cancelled.")
+
+        try:
+            result = backups.restore(path, safety_copy=not options["no_safety_copy"])
+        except backups.BackupError as e:
+            raise CommandError(str(e))
+
+        if result["safety_copy"]:
+            self.stdout.write(f"The previous database was saved to {result['safety_copy']}.")
+        if result["missing_migrations"]:
+            self.stdout.write(self.style.WARNING(
+                f"The backup predates {len(result['missing_migrations'])} migrations; run `manage.py migrate`."
+            ))
+        self.stdout.write(self.style.SUCCESS(f"Restored {result['restored']}."))
@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from pos_app.services import tasks
+
+
+class Command(BaseCommand):
+    help = "Run queued tasks (see pos_app.services.tasks) on a pool of threads or processes, and queue periodic ones (TASK_SCHEDULE)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=getattr(settings, "TASK_WORKERS", 2),
+                            help="Tasks run at the same time.")
+        parser.add_argument("--pool", choices=["thread", "process"], default=getattr(settings, "TASK_POOL", "thread"),
+                            help="Run tasks in threads, or in processes for CPU-bound jobs such as forecasts.")
+        parser.add_argument("--poll", type=float, default=1.0,
+                            help="Seconds to wait before looking for due tasks again when the queue is idle.")
+        parser.add_argument("--once", action="store_true",
+                            help="Exit once no task is due or running instead of polling.")
+        parser.add_argument("--no-schedule", action="store_true",
+                            help="Do not queue periodic jobs, e.g. when another worker does.")
+        parser.add_argument("--requeue-failed", action="store_true",
+                            help="Retry tasks that ran out of attempts before starting.")
+
+    def make_pool(self, kind, workers):
+        if kind == "process":
+            # Fresh interpreters rather than forks of a process holding database connections
+            return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"), initializer=django.setup)
+        return ThreadPoolExecutor(workers, thread_name_prefix="task")
+
+    def handle(self, *args, **options):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        workers = max(options["workers"], 1)
+        if options["requeue_failed"]:
+            self.stdout.write(f"Requeued {tasks.requeue_failed()} failed tasks")
+
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        pool = self.make_pool(options["pool"], workers)
+        self.stdout.write(f"Worker {worker_id} running {workers} {'processes' if options['pool'] == 'process' else 'threads'}")
+        running, beat_every, last_beat = {}, tasks.LEASE.total_seconds() / 3, time.monotonic()
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                if not options["no_schedule"]:
+                    tasks.schedule_periodic()
+                if running and time.monotonic() - last_beat > beat_every:
+                    tasks.heartbeat(worker_id, list(running.values()))
+                    last_beat = time.monotonic()
+
+                for task_id in tasks.claim(worker_id, workers - len(running)) if len(running) < workers else []:
+                    running[pool.submit(tasks.execute, task_id, worker_id)] = task_id
+                if not running:
+                    if options["once"]:
+                        break
+                    stop.wait(options["poll"])
+                    continue
+
+                done, _ = wait(running, timeout=options["poll"], return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_id = running.pop(future)
+                    try:
+                        outcome = future.result()
+                    except BrokenExecutor as e:
+                        # A pool process died; its tasks are taken over once their leases run out
+                        self.stderr.write(f"Worker pool broke: {e}; starting a new one")
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = self.make_pool(options["pool"], workers)
+                        running.clear()
+                        break
+                    except Exception as e:
+                        # Its outcome could not be recorded (e.g. the database stayed locked); it is retried once its lease runs out
+                        self.stderr.write(f"Task {task_id} was lost: {type(e).__name__}: {e}")
+                        continue
+                    self.stdout.write(f"Task {task_id} {outcome or 'was taken over by another worker'}")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stdout.write("Waiting for running tasks to finish")
+            pool.shutdown(wait=True)
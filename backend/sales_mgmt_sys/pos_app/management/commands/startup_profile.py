@@ -0,0 +1,87 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter so nothing imported by manage.py skews the numbers
+BOOT_SCRIPT = """
+import json, os, sys, time
+from wsgiref.util import setup_testing_defaults
+start = time.perf_counter()
+from sales_mgmt_sys.wsgi import application
+booted = time.perf_counter()
+environ = {"PATH_INFO": sys.argv[1], "HTTP_HOST": "localhost"}
+setup_testing_defaults(environ)
+status = []
+body = b"".join(application(environ, lambda s, h, exc_info=None: status.append(s)))
+done = time.perf_counter()
+print(json.dumps({"boot": booted - start, "first_response": done - booted, "status": status[0], "bytes": len(body)}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Boot the WSGI app in a fresh process and report import time per module and time to first response."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--settings-module", default=os.environ.get("DJANGO_SETTINGS_MODULE"),
+                            help="Settings profile to boot, e.g. sales_mgmt_sys.settings_api.")
+        parser.add_argument("--path", default="/", help="Path of the first request.")
+        parser.add_argument("--top", type=int, default=25, help="Number of modules to list.")
+        parser.add_argument("--by-package", action="store_true", help="Group import time by top-level package.")
+        parser.add_argument("--no-warmup", action="store_true", help="Disable the startup warm-up hook.")
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=options["settings_module"])
+        if options["no_warmup"]:
+            env["POS_WARMUP"] = "0"
+
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT, options["path"]],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            self.stderr.write(proc.stderr[-4000:])
+            return
+
+        timings = json.loads(proc.stdout.strip().splitlines()[-1])
+        modules = self.parse_importtime(proc.stderr)
+        self.report(modules, timings, options)
+
+    def parse_importtime(self, output):
+        """Return ``{module: (self_us, cumulative_us)}`` from ``-X importtime`` output."""
+        modules = {}
+        for line in output.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        return modules
+
+    def report(self, modules, timings, options):
+        if options["by_package"]:
+            totals = defaultdict(int)
+            for name, (self_us, _) in modules.items():
+                totals[name.split(".")[0]] += self_us
+            rows = sorted(totals.items(), key=lambda row: -row[1])[: options["top"]]
+            self.stdout.write(f"{'self ms':>10}  package")
+            for name, self_us in rows:
+                self.stdout.write(f"{self_us / 1000:>10.1f}  {name}")
+        else:
+            rows = sorted(modules.items(), key=lambda row: -row[1][1])[: options["top"]]
+            self.stdout.write(f"{'self ms':>10} {'cumul ms':>10}  module")
+            for name, (self_us, cumulative_us) in rows:
+                self.stdout.write(f"{self_us / 1000:>10.1f} {cumulative_us / 1000:>10.1f}  {name}")
+
+        total_imports = sum(self_us for self_us, _ in modules.values()) / 1000
+        self.stdout.write("")
+        self.stdout.write(f"Settings:            {options['settings_module']}")
+        self.stdout.write(f"Modules imported:    {len(modules)} ({total_imports:.1f} ms)")
+        self.stdout.write(f"Boot (import + setup): {timings['boot'] * 1000:.1f} ms")
+        self.stdout.write(f"First response:      {timings['first_response'] * 1000:.1f} ms ({timings['status']}, {timings['bytes']} bytes)")
+        self.stdout.write(self.style.SUCCESS(
+            f"Time to first response: {(timings['boot'] + timings['first_response']) * 1000:.1f} ms"
+        ))
@@ -0,0 +1,342 @@
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.db.models import F, Sum
+from django.test import Client
+
+from pos_app.models.item import Item
+from pos_app.models.sale import Sale
+from pos_app.models.shift import Shift
+from pos_app.services import backups, shifts
+
+User = get_user_model()
+
+ROUTES = ["checkout", "reduce", "edit"]
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE")
+
+
+class Terminal:
+    """One simulated till: its own client, database connection and tallies."""
+
+    def __init__(self, number, token, user_id, sale_id, item_ids, options):
+        self.client = Client(HTTP_AUTHORIZATION=f"Bearer {token}", raise_request_exception=False)
+        self.random = random.Random(options["seed"] * 1000 + number)
+        self.user_id = user_id
+        self.sale_id = sale_id
+        self.item_ids = item_ids
+        self.options = options
+        self.taken = defaultdict(int)        # item_id -> units this terminal took from stock
+        self.sale_lines = {}                 # item_id -> units currently on this terminal's sale
+        self.latency = defaultdict(list)     # route -> ms
+        self.outcomes = defaultdict(lambda: defaultdict(int))  # route -> ok/rejected/error -> count
+        self.write_ms = []
+        self.lock_errors = 0
+
+    def basket(self):
+        picks = self.random.sample(self.item_ids, self.random.randint(1, min(self.options["lines"], len(self.item_ids))))
+        return [{"item": item_id, "quantity": self.random.randint(1, 3)} for item_id in picks]
+
+    def time_writes(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as e:
+            if "locked" in str(e):
+                self.lock_errors += 1
+            raise
+        finally:
+            if sql.lstrip().upper().startswith(WRITE_PREFIXES):
+                self.write_ms.append((time.perf_counter() - start) * 1000)
+
+    def call(self, route, method, path, data):
+        start = time.perf_counter()
+        response = getattr(self.client, method)(path, data, content_type="application/json")
+        self.latency[route].append((time.perf_counter() - start) * 1000)
+        outcome = "ok" if response.status_code < 300 else "rejected" if response.status_code < 500 else "error"
+        self.outcomes[route][outcome] += 1
+        return response.status_code < 300
+
+    def run(self):
+        with connection.execute_wrapper(self.time_writes):
+            for _ in range(self.options["operations"]):
+                route = self.random.choice(self.options["routes"])
+                basket = self.basket()
+                if route == "checkout":
+                    # The till's flow: record the sale, then take its stock
+                    if self.call("checkout", "post", "/v1/sales/", {"staff": self.user_id, "sale_items": basket}):
+                        if self.call("update-sales", "post", "/v1/update-sales/", {"sale_items": basket}):
+                            self.take(basket)
+                elif route == "reduce":
+                    line = basket[0]
+                    if self.call("reduce", "put", f"/v1/items/{line['item']}/reduce-stock/", {"quantity": line["quantity"]}):
+                        self.take([line])
+                elif route == "edit":
+                    # An edit replaces the sale's lines, so only the difference leaves stock
+                    if self.call("edit", "put", f"/v1/sales/{self.sale_id}/edit/", {"sale_items": basket}):
+                        wanted = {line["item"]: line["quantity"] for line in basket}
+                        self.take([{"item": item_id, "quantity": wanted.get(item_id, 0) - self.sale_lines.get(item_id, 0)}
+                                   for item_id in wanted.keys() | self.sale_lines.keys()])
+                        self.sale_lines = wanted
+        connection.close()
+
+    def take(self, lines):
+        for line in lines:
+            self.taken[line["item"]] += line["quantity"]
+
+    def result(self):
+        return {
+            "taken": dict(self.taken),
+            "latency": {route: values for route, values in self.latency.items()},
+            "outcomes": {route: dict(counts) for route, counts in self.outcomes.items()},
+            "write_ms": self.write_ms,
+            "lock_errors": self.lock_errors,
+        }
+
+
+def _backup_main(target, options, done, queue):
+    """Take online backups one after another while the terminals run, as backup_db would from its own process."""
+    runs = []
+    while not done.is_set():
+        runs.append(backups.online_copy(backups.primary_path(), target, pages=options["backup_pages"]))
+        done.wait(options["backup_every"])
+    queue.put(runs)
+
+
+def run_terminals(first, count, setup, options):
+    terminals = [
+        Terminal(first + i, setup["token"], setup["user_id"], setup["sale_ids"][first + i], setup["item_ids"], options)
+        for i in range(count)
+    ]
+    threads = [threading.Thread(target=terminal.run) for terminal in terminals]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [terminal.result() for terminal in terminals]
+
+
+def _process_main(first, count, setup, options, queue):
+    connections.close_all()
+    queue.put(run_terminals(first, count, setup, options))
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer the stock and checkout routes from many simulated terminals sharing the same items, "
+        "then check that no stock was oversold and that sale totals match their lines."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1, help="Worker processes.")
+        parser.add_argument("--threads", type=int, default=8, help="Terminals (threads) per process.")
+        parser.add_argument("--operations", type=int, default=50, help="Requests per terminal.")
+        parser.add_argument("--items", type=int, default=5, help="Shared items the terminals compete for.")
+        parser.add_argument("--stock", type=int, default=200, help="Starting stock per item.")
+        parser.add_argument("--lines", type=int, default=3, help="Maximum lines per basket.")
+        parser.add_argument("--routes", default=",".join(ROUTES), help=f"Comma-separated subset of {', '.join(ROUTES)}.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--in-place", action="store_true",
+                            help="Use the configured database instead of a throwaway SQLite copy.")
+        parser.add_argument("--backup-every", type=float, default=None,
+                            help="Also run online backups with this pause (seconds) between them, to measure their cost.")
+        parser.add_argument("--backup-pages", type=int, default=backups.STEP_PAGES, help="Pages per backup step.")
+
+    def handle(self, *args, **options):
+        options["routes"] = [route.strip() for route in options["routes"].split(",") if route.strip()]
+        unknown = set(options["routes"]) - set(ROUTES)
+        if unknown:
+            raise CommandError(f"Unknown routes: {', '.join(sorted(unknown))}")
+
+        scratch = None
+        if not options["in_place"]:
+            if connection.vendor != "sqlite":
+                raise CommandError("Throwaway databases are only supported on SQLite; pass --in-place.")
+            scratch = tempfile.mkdtemp(prefix="stress-stock-")
+            connections.close_all()
+            connections.databases["default"]["NAME"] = os.path.join(scratch, "stress.sqlite3")
+            call_command("migrate", verbosity=0)
+
+        setup = backup_target = None
+        try:
+            setup = self.set_up(options)
+            if options["backup_every"] is not None:
+                backup_target = os.path.join(scratch or tempfile.gettempdir(), f"stress-backup-{os.getpid()}.sqlite3")
+                backup = self.start_backups(backup_target, options)
+            started = time.perf_counter()
+            results = self.hammer(setup, options)
+            elapsed = time.perf_counter() - started
+            backup_runs = self.stop_backups(backup) if backup_target else None
+            self.report(results, elapsed, options)
+            if backup_runs:
+                self.report_backups(backup_runs)
+            failures = self.verify(setup, results)
+        finally:
+            if scratch:
+                connections.close_all()
+                shutil.rmtree(scratch, ignore_errors=True)
+            elif setup:
+                self.tear_down(setup)
+            if backup_target and not scratch and os.path.exists(backup_target):
+                os.remove(backup_target)
+
+        if failures:
+            raise CommandError("Invariants violated:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS("All invariants hold."))
+
+    def set_up(self, options):
+        suffix = f"{os.getpid()}-{int(time.time())}"
+        user = User.objects.create_user(
+            f"stress-{suffix}", f"stress-{suffix}@example.com", role="Manager", first_name="Stress", last_name="Terminal",
+        )
+        shift = shifts.open_shift(user)
+        items = [
+            Item.objects.create(item_name=f"Stress item {suffix}-{i}", price=Decimal("1.25") * (i + 1), quantity=options["stock"])
+            for i in range(options["items"])
+        ]
+        terminals = options["processes"] * options["threads"]
+        # Each terminal edits its own sale so edits contend on stock, not on sale rows
+        sale_ids = [Sale.objects.create(staff=user, shift=shift).sale_id for _ in range(terminals)]
+        shifts.record(shift.shift_id, sales=terminals)
+        return {
+            "user_id": user.user_id,
+            "token": user.get_tokens()["access"],
+            "shift_id": shift.shift_id,
+            "item_ids": [item.item_id for item in items],
+            "sale_ids": sale_ids,
+            "initial": {item.item_id: item.quantity for item in items},
+        }
+
+    def tear_down(self, setup):
+        Item.objects.filter(item_id__in=setup["item_ids"]).delete()
+        User.objects.filter(user_id=setup["user_id"]).delete()
+
+    def hammer(self, setup, options):
+        threads = options["threads"]
+        if options["processes"] == 1:
+            return run_terminals(0, threads, setup, options)
+
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        connections.close_all()
+        workers = [
+            context.Process(target=_process_main, args=(p * threads, threads, setup, options, queue))
+            for p in range(options["processes"])
+        ]
+        for worker in workers:
+            worker.start()
+        results = [result for _ in workers for result in queue.get()]
+        for worker in workers:
+            worker.join()
+        return results
+
+    def verify(self, setup, results):
+        failures = []
+        taken = defaultdict(int)
+        for result in results:
+            for item_id, units in result["taken"].items():
+                taken[int(item_id)] += units
+
+        final = dict(Item.objects.filter(item_id__in=setup["item_ids"]).values_list("item_id", "quantity"))
+        for item_id, initial in setup["initial"].items():
+            if final[item_id] < 0:
+                failures.append(f"Item {item_id} went negative: {final[item_id]}")
+            if taken[item_id] > initial:
+                failures.append(f"Item {item_id} oversold: {taken[item_id]} units confirmed from {initial}")
+            if final[item_id] != initial - taken[item_id]:
+                failures.append(
+                    f"Item {item_id} lost updates: stock {final[item_id]}, expected {initial - taken[item_id]} "
+                    f"({taken[item_id]} units confirmed)"
+                )
+
+        mismatched = (
+            Sale.objects.filter(staff_id=setup["user_id"])
+            .annotate(lines_total=Sum("sale_items__subtotal"))
+            .filter(lines_total__isnull=False)
+            .exclude(total_amount=F("lines_total"))
+            .values_list("sale_id", flat=True)
+        )
+        for sale_id in mismatched:
+            failures.append(f"Sale {sale_id} total does not match its lines")
+
+        shift = Shift.objects.get(shift_id=setup["shift_id"])
+        stored, expected = (shift.sale_count, shift.item_count, shift.revenue), shifts.recompute([shift.shift_id])[shift.shift_id]
+        if stored != expected:
+            failures.append(f"Shift totals drifted: stored {stored}, recomputed {expected}")
+        return failures
+
+    def report(self, results, elapsed, options):
+        latency, outcomes = defaultdict(list), defaultdict(lambda: defaultdict(int))
+        write_ms, lock_errors = [], 0
+        for result in results:
+            for route, values in result["latency"].items():
+                latency[route].extend(values)
+            for route, counts in result["outcomes"].items():
+                for outcome, count in counts.items():
+                    outcomes[route][outcome] += count
+            write_ms.extend(result["write_ms"])
+            lock_errors += result["lock_errors"]
+
+        requests = sum(len(values) for values in latency.values())
+        self.stdout.write(
+            f"{options['processes']} process(es) x {options['threads']} terminals, "
+            f"{requests} requests in {elapsed:.2f} s ({requests / elapsed:.1f} req/s)"
+        )
+        self.stdout.write(f"{'route':<14} {'ok':>6} {'rejected':>9} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for route, values in sorted(latency.items()):
+            counts = outcomes[route]
+            self.stdout.write(
+                f"{route:<14} {counts.get('ok', 0):>6} {counts.get('rejected', 0):>9} {counts.get('error', 0):>7} "
+                f"{statistics.median(values):>8.1f} {_p95(values):>8.1f} {_p99(values):>8.1f}"
+            )
+        if write_ms:
+            self.stdout.write(
+                f"Write statements: {len(write_ms)}, {sum(write_ms):.0f} ms total including lock waits "
+                f"(p50 {statistics.median(write_ms):.2f} ms, p95 {_p95(write_ms):.2f} ms, max {max(write_ms):.0f} ms)"
+            )
+        self.stdout.write(f"Lock timeouts: {lock_errors}")
+
+
+    def start_backups(self, target, options):
+        context = multiprocessing.get_context("fork")
+        done, queue = context.Event(), context.Queue()
+        connections.close_all()
+        process = context.Process(target=_backup_main, args=(target, options, done, queue), daemon=True)
+        process.start()
+        return process, done, queue
+
+    def stop_backups(self, backup):
+        process, done, queue = backup
+        done.set()
+        runs = queue.get()
+        process.join()
+        return runs
+
+    def report_backups(self, runs):
+        if not runs:
+            return
+        seconds = [run["seconds"] * 1000 for run in runs]
+        self.stdout.write(
+            f"Backups: {len(runs)} of {runs[-1]['pages']} pages, p50 {statistics.median(seconds):.0f} ms, "
+            f"max {max(seconds):.0f} ms, {sum(run['restarts'] for run in runs)} restarts, "
+            f"{sum(run['single_step'] for run in runs)} finished in one step"
+        )
+
+
+def _p95(values):
+    return statistics.quantiles(values, n=20)[-1] if len(values) > 1 else values[0]
+
+
+def _p99(values):
+    return statistics.quantiles(values, n=100)[-1] if len(values) > 1 else values[0]
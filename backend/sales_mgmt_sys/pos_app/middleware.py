@@ -0,0 +1,66 @@
+import random
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.middleware.gzip import GZipMiddleware
+from django.utils.crypto import constant_time_compare
+
+from pos_app.profiling import Sampler
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Gzip responses once they reach ``API_COMPRESSION_MIN_BYTES``.
+
+    Negotiation (``Accept-Encoding``, ``Vary``, ETag weakening) is Django's;
+    small payloads are left alone because the gzip framing would outweigh the
+    saving on a terminal's round trip.
+    """
+    min_length = getattr(settings, "API_COMPRESSION_MIN_BYTES", 1024)
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < self.min_length:
+            return response
+        return super().process_response(request, response)
+
+
+class SamplingProfilerMiddleware:
+    """
+    Profile a sample of requests and aggregate their stacks per endpoint.
+
+    Requests are picked at ``PROFILER_SAMPLE_RATE``, overridden per URL name by
+    ``PROFILER_ROUTES``, or forced by sending ``X-Profile`` with the value of
+    ``PROFILER_HEADER_SECRET``. Stacks are collected by a separate sampling
+    thread (see ``pos_app.profiling``) and written as folded-stack files to
+    ``PROFILER_DIR``. Unless ``PROFILER_ENABLED`` is set the middleware removes
+    itself at startup.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILER_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.rate = getattr(settings, "PROFILER_SAMPLE_RATE", 0.01)
+        self.route_rates = getattr(settings, "PROFILER_ROUTES", {})
+        self.secret = getattr(settings, "PROFILER_HEADER_SECRET", "")
+        self.sampler = Sampler(
+            getattr(settings, "PROFILER_DIR", Path(settings.BASE_DIR) / "profiles"),
+            interval=getattr(settings, "PROFILER_INTERVAL", 0.005),
+            flush_interval=getattr(settings, "PROFILER_FLUSH_INTERVAL", 30),
+        )
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            if getattr(request, "_profiled", False):
+                self.sampler.unregister()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        forced = bool(self.secret) and constant_time_compare(request.headers.get("X-Profile", ""), self.secret)
+        if forced or random.random() < self.route_rates.get(match.url_name, self.rate):
+            request._profiled = True
+            self.sampler.register(f"{request.method} /{match.route}")
+        return None
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.19 on 2026-10-19 12:17
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pos_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sale',
+            name='sale_date',
+            field=models.DateField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
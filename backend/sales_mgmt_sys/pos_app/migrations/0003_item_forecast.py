@@ -0,0 +1,29 @@
+# Generated by Django 4.2.19 on 2026-10-19 12:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pos_app', '0002_sale_date_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemForecast',
+            fields=[
+                ('forecast_id', models.AutoField(primary_key=True, serialize=False)),
+                ('avg_daily_demand', models.FloatField(default=0)),
+                ('weekday_factors', models.JSONField(default=list)),
+                ('stock_on_hand', models.PositiveIntegerField(default=0)),
+                ('days_until_stockout', models.FloatField(blank=True, db_index=True, null=True)),
+                ('stockout_date', models.DateField(blank=True, null=True)),
+                ('reorder_quantity', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('item', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='forecast', to='pos_app.item')),
+            ],
+        ),
+    ]
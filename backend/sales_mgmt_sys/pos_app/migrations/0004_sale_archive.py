@@ -0,0 +1,58 @@
+# Generated by Django 4.2.19 on 2026-10-19 12:20
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pos_app', '0003_item_forecast'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaleArchive',
+            fields=[
+                ('archive_id', models.AutoField(primary_key=True, serialize=False)),
+                ('path', models.CharField(max_length=255, unique=True)),
+                ('start_date', models.DateField(db_index=True)),
+                ('end_date', models.DateField(db_index=True)),
+                ('sale_count', models.PositiveIntegerField(default=0)),
+                ('line_count', models.PositiveIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchiveStaffRollup',
+            fields=[
+                ('rollup_id', models.AutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField(db_index=True)),
+                ('sale_count', models.PositiveIntegerField(default=0)),
+                ('item_count', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('staff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('day', 'staff')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchiveItemRollup',
+            fields=[
+                ('rollup_id', models.AutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField(db_index=True)),
+                ('sale_count', models.PositiveIntegerField(default=0)),
+                ('quantity', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_rollups', to='pos_app.item')),
+            ],
+            options={
+                'unique_together': {('day', 'item')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+import django.core.validators
+
+
+def backfill_unit_price(apps, schema_editor):
+    SaleItem = apps.get_model("pos_app", "SaleItem")
+    lines = list(SaleItem.objects.filter(unit_price__isnull=True).select_related("item"))
+    for line in lines:
+        # Derive from the stored subtotal so history keeps the price actually charged
+        line.unit_price = (line.subtotal / line.quantity) if line.quantity else line.item.price
+    SaleItem.objects.bulk_update(lines, ["unit_price"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pos_app', '0004_sale_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='saleitem',
+            name='unit_price',
+            field=models.DecimalField(decimal_places=2, max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.RunPython(backfill_unit_price, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='saleitem',
+            name='unit_price',
+            field=models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.19 on 2026-10-19 12:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pos_app', '0005_sale_item_unit_price'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='sku',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='ItemBarcode',
+            fields=[
+                ('barcode_id', models.AutoField(primary_key=True, serialize=False)),
+                ('code', models.CharField(max_length=64, unique=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='barcodes', to='pos_app.item')),
+            ],
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.19 on 2026-10-19 12:50
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pos_app', '0008_sale_returns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockAdjustment',
+            fields=[
+                ('adjustment_id', models.AutoField(primary_key=True, serialize=False)),
+                ('reason', models.CharField(choices=[('count', 'Stock count'), ('delivery', 'Delivery'), ('damage', 'Damage / write-off'), ('correction', 'Correction')], max_length=20)),
+                ('note', models.CharField(blank=True, max_length=255)),
+                ('line_count', models.PositiveIntegerField(default=0)),
+                ('variance_units', models.IntegerField(default=0)),
+                ('variance_value', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('staff', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_adjustments', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StockAdjustmentLine',
+            fields=[
+                ('line_id', models.AutoField(primary_key=True, serialize=False)),
+                ('expected', models.IntegerField()),
+                ('counted', models.PositiveIntegerField(blank=True, null=True)),
+                ('delta', models.IntegerField()),
+                ('adjustment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='pos_app.stockadjustment')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_adjustments', to='pos_app.item')),
+            ],
+        ),
+    ]
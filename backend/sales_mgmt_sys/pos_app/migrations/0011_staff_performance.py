@@ -0,0 +1,43 @@
+# Generated by Django 4.2.19 on 2026-10-19 13:37
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pos_app', '0010_sale_void'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaffPerformanceDay',
+            fields=[
+                ('day', models.DateField(primary_key=True, serialize=False)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StaffDailyPerformance',
+            fields=[
+                ('performance_id', models.AutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField(db_index=True)),
+                ('sale_count', models.PositiveIntegerField(default=0)),
+                ('item_count', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('hourly_sales', models.JSONField(default=list)),
+                ('active_hours', models.PositiveSmallIntegerField(default=0)),
+                ('peak_hour', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('rating_total', models.FloatField(default=0)),
+                ('staff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_performance', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('day', 'staff')},
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.19 on 2026-10-19 13:53
+
+from decimal import Decimal
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pos_app', '0013_item_delta_sync'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PromotionItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)])),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='promotion_items', to='pos_app.item')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='saleitem',
+            name='discount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='saleitem',
+            name='tax',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10),
+        ),
+        migrations.CreateModel(
+            name='TaxRule',
+            fields=[
+                ('rule_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('rate', models.DecimalField(decimal_places=2, max_digits=5, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+                ('applies_to_all', models.BooleanField(default=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('items', models.ManyToManyField(blank=True, related_name='tax_rules', to='pos_app.item')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PromotionRule',
+            fields=[
+                ('rule_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('kind', models.CharField(choices=[('percent_off', 'Percent off'), ('amount_off', 'Amount off each unit'), ('fixed_price', 'Fixed unit price'), ('combo', 'Combo price')], max_length=20)),
+                ('value', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(0)])),
+                ('applies_to_all', models.BooleanField(default=False)),
+                ('starts_at', models.DateTimeField(blank=True, null=True)),
+                ('ends_at', models.DateTimeField(blank=True, null=True)),
+                ('weekdays', models.CharField(blank=True, default='', max_length=7)),
+                ('start_time', models.TimeField(blank=True, null=True)),
+                ('end_time', models.TimeField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('items', models.ManyToManyField(blank=True, related_name='promotions', through='pos_app.PromotionItem', to='pos_app.item')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='promotionitem',
+            name='promotion',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='promotion_items', to='pos_app.promotionrule'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='promotionitem',
+            unique_together={('promotion', 'item')},
+        ),
+    ]
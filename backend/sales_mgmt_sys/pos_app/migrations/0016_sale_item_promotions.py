@@ -0,0 +1,18 @@
+# Generated by Django 4.2.19 on 2026-10-19 14:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pos_app', '0015_tasks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='saleitem',
+            name='promotions',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -1,5 +1,19 @@
 from .user import User
 from .item import Item
+from .item_barcode import ItemBarcode
 from .sale import Sale
+from .shift import Shift
 from .sale_item import SaleItem
 from .rating import Rating
+from .sale_return import SaleReturn, SaleReturnLine
+from .return_rollup import ReturnRollup
+from .stock_adjustment import StockAdjustment, StockAdjustmentLine
+from .item_forecast import ItemForecast
+from .sale_archive import SaleArchive
+from .archive_rollup import ArchiveStaffRollup, ArchiveItemRollup
+from .staff_performance import StaffPerformanceDay, StaffDailyPerformance
+from .outbox_event import OutboxEvent
+from .item_tombstone import ItemTombstone
+from .pricing_rule import PromotionRule, PromotionItem, TaxRule
+from .task import Task
+from .cache_version import CacheVersion
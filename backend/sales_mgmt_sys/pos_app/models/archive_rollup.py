@@ -0,0 +1,35 @@
+from decimal import Decimal
+from django.db import models
+from .user import User
+from .item import Item
+
+class ArchiveStaffRollup(models.Model):
+    """Per staff, per day totals of sales that have been moved to the archive."""
+    rollup_id = models.AutoField(primary_key=True)
+    day = models.DateField(db_index=True)
+    staff = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_rollups")
+    sale_count = models.PositiveIntegerField(default=0)
+    item_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+
+    class Meta:
+        unique_together = ("day", "staff")
+
+    def __str__(self):
+        return f"{self.staff.username} on {self.day}: {self.sale_count} sales"
+
+
+class ArchiveItemRollup(models.Model):
+    """Per item, per day totals of sale lines that have been moved to the archive."""
+    rollup_id = models.AutoField(primary_key=True)
+    day = models.DateField(db_index=True)
+    item = models.ForeignKey(Item, on_delete=models.CASCADE, related_name="archived_rollups")
+    sale_count = models.PositiveIntegerField(default=0)
+    quantity = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+
+    class Meta:
+        unique_together = ("day", "item")
+
+    def __str__(self):
+        return f"{self.item.item_name} on {self.day}: {self.quantity} sold"
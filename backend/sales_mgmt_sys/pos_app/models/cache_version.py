@@ -0,0 +1,13 @@
+from django.db import models
+
+class CacheVersion(models.Model):
+    """
+    Version of data every process keeps in memory (the catalog, the pricing
+    rules). Writers bump it in their own transaction; processes compare it
+    with their copy and rebuild when it moved.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
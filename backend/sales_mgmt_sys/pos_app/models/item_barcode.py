@@ -0,0 +1,18 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils import timezone
+from .item import Item
+
+class ItemBarcode(models.Model):
+    """A scannable code (EAN, UPC, supplier code) for an item; an item may have several."""
+    barcode_id = models.AutoField(primary_key=True)
+    item = models.ForeignKey(Item, on_delete=models.CASCADE, related_name="barcodes")
+    code = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def clean(self):
+        if Item.objects.filter(sku=self.code).exclude(pk=self.item_id).exists():
+            raise ValidationError({"code": "This code is already the SKU of another item."})
+
+    def __str__(self):
+        return f"{self.code} ({self.item.item_name})"
@@ -0,0 +1,18 @@
+from django.db import models
+from django.utils import timezone
+from .item import Item
+
+class ItemForecast(models.Model):
+    """Precomputed demand forecast for an item, refreshed by ``compute_forecasts``."""
+    forecast_id = models.AutoField(primary_key=True)
+    item = models.OneToOneField(Item, on_delete=models.CASCADE, related_name="forecast")
+    avg_daily_demand = models.FloatField(default=0)
+    weekday_factors = models.JSONField(default=list)
+    stock_on_hand = models.PositiveIntegerField(default=0)
+    days_until_stockout = models.FloatField(blank=True, null=True, db_index=True)
+    stockout_date = models.DateField(blank=True, null=True)
+    reorder_quantity = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Forecast for {self.item.item_name}"
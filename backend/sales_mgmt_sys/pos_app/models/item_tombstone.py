@@ -0,0 +1,10 @@
+from django.db import models
+from django.utils import timezone
+
+class ItemTombstone(models.Model):
+    """Records a deleted item so terminals syncing deltas can drop it; pruned after CATALOG_TOMBSTONE_DAYS."""
+    item_id = models.IntegerField(primary_key=True)
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"Item {self.item_id} deleted {self.deleted_at}"
@@ -0,0 +1,35 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+class OutboxEvent(models.Model):
+    """A sale or stock event, written in the transaction that caused it and delivered later by dispatch_outbox."""
+    PENDING = "pending"
+    SENT = "sent"
+    DEAD = "dead"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (SENT, "Sent"),
+        (DEAD, "Dead"),
+    ]
+
+    event_id = models.BigAutoField(primary_key=True)
+    topic = models.CharField(max_length=50)
+    # Events with the same key (e.g. "sale:42") are delivered in the order they were written
+    key = models.CharField(max_length=100, db_index=True)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["event_id"], condition=models.Q(status="pending"), name="outbox_pending_idx"),
+            models.Index(fields=["status", "sent_at"], name="outbox_status_sent_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} {self.key} ({self.status})"
@@ -0,0 +1,71 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+from django.utils import timezone
+from .item import Item
+
+class PromotionRule(models.Model):
+    """
+    A discount on some items, optionally limited to a period, weekdays and a
+    time of day (a happy hour). Combos sell a set of items (with the units
+    needed of each) for ``value``; the other kinds apply per unit.
+    """
+    PERCENT_OFF = "percent_off"
+    AMOUNT_OFF = "amount_off"
+    FIXED_PRICE = "fixed_price"
+    COMBO = "combo"
+    KIND_CHOICES = [
+        (PERCENT_OFF, "Percent off"),
+        (AMOUNT_OFF, "Amount off each unit"),
+        (FIXED_PRICE, "Fixed unit price"),
+        (COMBO, "Combo price"),
+    ]
+
+    rule_id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=100)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # The percentage, the amount off, the unit price or the combo's price, depending on kind
+    value = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
+    items = models.ManyToManyField(Item, through="PromotionItem", related_name="promotions", blank=True)
+    # Every item qualifies (not for combos)
+    applies_to_all = models.BooleanField(default=False)
+    # Sales before starts_at (or before the rule was created, when blank) or after ends_at never qualify
+    starts_at = models.DateTimeField(blank=True, null=True)
+    ends_at = models.DateTimeField(blank=True, null=True)
+    # ISO weekdays the rule runs on, e.g. "12345" for Monday to Friday; blank for every day
+    weekdays = models.CharField(max_length=7, blank=True, default="")
+    # Daily window in local time; an end before the start runs past midnight
+    start_time = models.TimeField(blank=True, null=True)
+    end_time = models.TimeField(blank=True, null=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.get_kind_display()} {self.value})"
+
+
+class PromotionItem(models.Model):
+    """An item a promotion covers; for combos, ``quantity`` units of it make up one combo."""
+    promotion = models.ForeignKey(PromotionRule, on_delete=models.CASCADE, related_name="promotion_items")
+    item = models.ForeignKey(Item, on_delete=models.CASCADE, related_name="promotion_items")
+    quantity = models.PositiveIntegerField(default=1, validators=[MinValueValidator(1)])
+
+    class Meta:
+        unique_together = ("promotion", "item")
+
+    def __str__(self):
+        return f"{self.quantity} x {self.item.item_name} in {self.promotion.name}"
+
+
+class TaxRule(models.Model):
+    """A tax included in the shelf price of its items (or every item); the rates of all matching rules add up."""
+    rule_id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=100)
+    rate = models.DecimalField(max_digits=5, decimal_places=2, validators=[MinValueValidator(0), MaxValueValidator(100)])
+    items = models.ManyToManyField(Item, related_name="tax_rules", blank=True)
+    applies_to_all = models.BooleanField(default=False)
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.rate}%)"
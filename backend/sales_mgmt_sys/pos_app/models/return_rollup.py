@@ -0,0 +1,13 @@
+from decimal import Decimal
+from django.db import models
+
+class ReturnRollup(models.Model):
+    """Per day totals of processed returns, kept current as each return commits."""
+    rollup_id = models.AutoField(primary_key=True)
+    day = models.DateField(unique=True)
+    return_count = models.PositiveIntegerField(default=0)
+    item_count = models.PositiveIntegerField(default=0)
+    refund_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+
+    def __str__(self):
+        return f"Returns on {self.day}: {self.return_count}"
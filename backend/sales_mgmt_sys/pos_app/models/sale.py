@@ -7,16 +7,49 @@ from .user import User
 class Sale(models.Model):
     sale_id = models.AutoField(primary_key=True)
     staff = models.ForeignKey(User, on_delete=models.CASCADE, related_name="sales")
-    sale_date = models.DateField(default=timezone.now)
+    shift = models.ForeignKey("Shift", on_delete=models.SET_NULL, blank=True, null=True, related_name="sales")
+    sale_date = models.DateField(default=timezone.now, db_index=True)
     total_amount = models.DecimalField(
         max_digits=10,
         decimal_places=2,
         default=Decimal("0.00"),
         validators=[MinValueValidator(Decimal("0.00"))]
     )
+    # Voided sales stay for the audit trail; every report filters on this flag
+    is_void = models.BooleanField(default=False, db_index=True)
+    voided_at = models.DateTimeField(blank=True, null=True)
+    voided_by = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True, related_name="voided_sales")
+    void_reason = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Date-range reports only ever read live sales
+            models.Index(fields=["sale_date"], condition=models.Q(is_void=False), name="sale_live_date_idx"),
+        ]
+
+    # Fields whose stored values cached reports are bucketed by (see pos_app.signals)
+    TRACKED_FIELDS = ("sale_date", "staff_id")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        sale = super().from_db(db, field_names, values)
+        sale.remember_stored()
+        return sale
+
+    def remember_stored(self):
+        """Note the day and staff member as stored, so a save that moves the sale also refreshes the reports it leaves."""
+        self._stored = {name: self.__dict__[name] for name in self.TRACKED_FIELDS if name in self.__dict__}
+
+    def stored(self, name):
+        """``name`` as last loaded or saved (the current value for fields never loaded)."""
+        return getattr(self, "_stored", {}).get(name, getattr(self, name))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.remember_stored()
+
     def update_total(self):
         """Recalculate total amount based on sale items."""
         total = sum(item.subtotal for item in self.sale_items.all())
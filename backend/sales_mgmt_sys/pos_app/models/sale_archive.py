@@ -0,0 +1,17 @@
+from decimal import Decimal
+from django.db import models
+from django.utils import timezone
+
+class SaleArchive(models.Model):
+    """Manifest entry for one compressed file of archived sales."""
+    archive_id = models.AutoField(primary_key=True)
+    path = models.CharField(max_length=255, unique=True)
+    start_date = models.DateField(db_index=True)
+    end_date = models.DateField(db_index=True)
+    sale_count = models.PositiveIntegerField(default=0)
+    line_count = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Archive {self.start_date} - {self.end_date} ({self.sale_count} sales)"
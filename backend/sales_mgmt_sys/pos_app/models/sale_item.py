@@ -1,3 +1,4 @@
+from decimal import Decimal
 from django.db import models
 from .sale import Sale
 from .item import Item
@@ -8,10 +9,24 @@ class SaleItem(models.Model):
     sale = models.ForeignKey(Sale, on_delete=models.CASCADE, related_name="sale_items")
     item = models.ForeignKey(Item, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+    # Price per unit captured at sale time, so later price changes never rewrite history
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
+    # Promotion discount on the line, and the tax included in what is left
+    discount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
+    tax = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
+    # Ids of the promotion rules that priced the line, so an edit can tell which lines gain or lose a combo
+    promotions = models.JSONField(default=list, blank=True)
+    # What the customer pays for the line: quantity x unit_price - discount
     subtotal = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    returned_quantity = models.PositiveIntegerField(default=0)
 
     def save(self, *args, **kwargs):
-        self.subtotal = self.quantity * self.item.price
+        if self.unit_price is None:
+            from pos_app.services.pricelist import get_price_list
+
+            entry = get_price_list().get(self.item_id)
+            self.unit_price = entry.price if entry else self.item.price
+        self.subtotal = self.quantity * self.unit_price - self.discount
         super().save(*args, **kwargs)
         self.sale.update_total() 
 
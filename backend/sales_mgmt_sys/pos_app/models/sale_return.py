@@ -0,0 +1,34 @@
+from decimal import Decimal
+from django.db import models
+from django.utils import timezone
+from .user import User
+from .item import Item
+from .sale import Sale
+from .sale_item import SaleItem
+
+class SaleReturn(models.Model):
+    """A refund of some or all of a sale's lines."""
+    return_id = models.AutoField(primary_key=True)
+    sale = models.ForeignKey(Sale, on_delete=models.CASCADE, related_name="returns")
+    staff = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True, related_name="processed_returns")
+    return_date = models.DateField(default=timezone.localdate, db_index=True)
+    reason = models.CharField(max_length=255, blank=True)
+    refund_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Return {self.return_id} of Sale {self.sale_id}"
+
+
+class SaleReturnLine(models.Model):
+    """Units of one sale line given back in a return, refunded at the price they were sold at."""
+    return_line_id = models.AutoField(primary_key=True)
+    sale_return = models.ForeignKey(SaleReturn, on_delete=models.CASCADE, related_name="lines")
+    sale_item = models.ForeignKey(SaleItem, on_delete=models.CASCADE, related_name="return_lines")
+    item = models.ForeignKey(Item, on_delete=models.CASCADE, related_name="return_lines")
+    quantity = models.PositiveIntegerField()
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+    refund_amount = models.DecimalField(max_digits=10, decimal_places=2)
+
+    def __str__(self):
+        return f"{self.quantity} x {self.item.item_name} returned"
@@ -0,0 +1,29 @@
+from decimal import Decimal
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from .user import User
+
+class Shift(models.Model):
+    """A staff member's till session, carrying running totals kept current as sales commit."""
+    shift_id = models.AutoField(primary_key=True)
+    staff = models.ForeignKey(User, on_delete=models.CASCADE, related_name="shifts")
+    opened_at = models.DateTimeField(default=timezone.now, db_index=True)
+    closed_at = models.DateTimeField(blank=True, null=True)
+    opened_by = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True, related_name="+")
+    closed_by = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True, related_name="+")
+    sale_count = models.IntegerField(default=0)
+    item_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["staff"], condition=Q(closed_at__isnull=True), name="one_open_shift_per_staff"),
+        ]
+
+    @property
+    def is_open(self):
+        return self.closed_at is None
+
+    def __str__(self):
+        return f"Shift {self.shift_id} for {self.staff.username}"
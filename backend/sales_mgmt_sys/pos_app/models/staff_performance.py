@@ -0,0 +1,35 @@
+from decimal import Decimal
+from django.db import models
+from django.utils import timezone
+from .user import User
+
+class StaffPerformanceDay(models.Model):
+    """Marks a day whose staff performance rows are up to date; deleted when that day's sales or ratings change."""
+    day = models.DateField(primary_key=True)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Staff performance for {self.day}"
+
+
+class StaffDailyPerformance(models.Model):
+    """Per staff, per day sales activity and ratings, materialized for the performance dashboard."""
+    performance_id = models.AutoField(primary_key=True)
+    day = models.DateField(db_index=True)
+    staff = models.ForeignKey(User, on_delete=models.CASCADE, related_name="daily_performance")
+    sale_count = models.PositiveIntegerField(default=0)
+    item_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    # Sales per hour of day (24 entries) and the hours with at least one sale; live sales only,
+    # since archive rollups keep no times
+    hourly_sales = models.JSONField(default=list)
+    active_hours = models.PositiveSmallIntegerField(default=0)
+    peak_hour = models.PositiveSmallIntegerField(blank=True, null=True)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_total = models.FloatField(default=0)
+
+    class Meta:
+        unique_together = ("day", "staff")
+
+    def __str__(self):
+        return f"{self.staff.username} on {self.day}: {self.sale_count} sales"
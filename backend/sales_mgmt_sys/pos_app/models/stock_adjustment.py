@@ -0,0 +1,50 @@
+from decimal import Decimal
+from django.db import models
+from django.utils import timezone
+from .user import User
+from .item import Item
+
+class StockAdjustment(models.Model):
+    """A batch of stock changes made together: a stock-take, a delivery, write-offs or corrections."""
+    REASON_CHOICES = [
+        ("count", "Stock count"),
+        ("delivery", "Delivery"),
+        ("damage", "Damage / write-off"),
+        ("correction", "Correction"),
+    ]
+
+    adjustment_id = models.AutoField(primary_key=True)
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    note = models.CharField(max_length=255, blank=True)
+    staff = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True, related_name="stock_adjustments")
+    line_count = models.PositiveIntegerField(default=0)
+    # Counted minus expected over the counted lines, in units and at current prices
+    variance_units = models.IntegerField(default=0)
+    variance_value = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"Stock adjustment {self.adjustment_id} ({self.reason})"
+
+
+class StockAdjustmentLine(models.Model):
+    """
+    One item's change in an adjustment.
+
+    ``expected`` is the stock on record when the adjustment was applied.
+    ``counted`` is only set for absolute counts; ``delta`` is the change
+    actually applied either way.
+    """
+    line_id = models.AutoField(primary_key=True)
+    adjustment = models.ForeignKey(StockAdjustment, on_delete=models.CASCADE, related_name="lines")
+    item = models.ForeignKey(Item, on_delete=models.CASCADE, related_name="stock_adjustments")
+    expected = models.IntegerField()
+    counted = models.PositiveIntegerField(blank=True, null=True)
+    delta = models.IntegerField()
+
+    @property
+    def variance(self):
+        return None if self.counted is None else self.counted - self.expected
+
+    def __str__(self):
+        return f"{self.item.item_name}: {self.delta:+d}"
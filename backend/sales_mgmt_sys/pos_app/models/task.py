@@ -0,0 +1,49 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+class Task(models.Model):
+    """A deferred job queued by the API or the schedule and run later by the run_worker command."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    task_id = models.BigAutoField(primary_key=True)
+    # A job name from pos_app.services.tasks.JOBS, called with args as keyword arguments
+    job = models.CharField(max_length=50)
+    args = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    # At most one queued task per key; enqueueing another while one waits is a no-op
+    dedupe_key = models.CharField(max_length=100, blank=True, null=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    # The worker running the task and how long it may go without a heartbeat before others take it over
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_until = models.DateTimeField(blank=True, null=True)
+    result = models.JSONField(blank=True, null=True, encoder=DjangoJSONEncoder)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["dedupe_key"], condition=models.Q(status="queued"), name="task_queued_dedupe_key"),
+        ]
+        indexes = [
+            models.Index(fields=["run_at"], condition=models.Q(status="queued"), name="task_queued_run_at_idx"),
+            models.Index(fields=["locked_until"], condition=models.Q(status="running"), name="task_running_lease_idx"),
+            models.Index(fields=["status", "finished_at"], name="task_status_finished_idx"),
+            models.Index(fields=["dedupe_key", "finished_at"], name="task_key_finished_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.job} #{self.task_id} ({self.status})"
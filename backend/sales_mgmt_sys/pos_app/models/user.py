@@ -2,7 +2,6 @@ from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, Permis
 from django.db import models
 from django.utils import timezone
 from decimal import Decimal
-from rest_framework_simplejwt.tokens import RefreshToken
 
 class UserManager(BaseUserManager):
     def create_user(self, username, email, password=None, **extra_fields):
@@ -62,6 +61,9 @@ class User(AbstractBaseUser, PermissionsMixin):
         return self.username
 
     def get_tokens(self):
+        # Imported lazily: simplejwt's token module is costly and models load on every cold start
+        from rest_framework_simplejwt.tokens import RefreshToken
+
         refresh = RefreshToken.for_user(self)
         return {"refresh": str(refresh), "access": str(refresh.access_token)}
 
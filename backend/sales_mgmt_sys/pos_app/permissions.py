@@ -15,3 +15,7 @@ class IsManager(BasePermission):
 class IsWaiter(BasePermission):
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.role == "Waiter"
+
+class IsSupervisor(BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.role == "Supervisor"
@@ -0,0 +1,118 @@
+import atexit
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MAX_DEPTH = 128
+
+
+def fold(frame):
+    """Render a frame's stack root-first as ``module:function;...``, the folded format flamegraph tools read."""
+    names = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def endpoint_filename(endpoint):
+    return re.sub(r"[^A-Za-z0-9]+", "_", endpoint).strip("_") or "root"
+
+
+class Sampler:
+    """
+    Statistical profiler for the threads currently serving sampled requests.
+
+    One daemon thread wakes every ``interval`` seconds, grabs the stacks of
+    the registered threads with ``sys._current_frames()`` and counts them per
+    endpoint. Nothing runs inside the profiled request itself, and the thread
+    sleeps on an event while no request is being profiled. Counts are written
+    to ``<directory>/<endpoint>.<pid>.folded`` every ``flush_interval`` seconds
+    and at exit.
+    """
+
+    def __init__(self, directory, interval=0.005, flush_interval=30):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.flush_interval = flush_interval
+        self.active = {}                       # thread id -> endpoint
+        self.stacks = defaultdict(Counter)     # endpoint -> folded stack -> samples
+        self.dirty = set()
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+        self.last_flush = time.monotonic()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="profiler", daemon=True)
+                self.thread.start()
+                atexit.register(self.flush)
+
+    def register(self, endpoint):
+        self.start()
+        with self.lock:
+            self.active[threading.get_ident()] = endpoint
+        self.wake.set()
+
+    def unregister(self):
+        with self.lock:
+            self.active.pop(threading.get_ident(), None)
+            if not self.active:
+                self.wake.clear()
+
+    def run(self):
+        while True:
+            if not self.wake.wait(timeout=self.flush_interval):
+                self.flush_if_due()
+                continue
+            time.sleep(self.interval)
+            self.sample()
+            self.flush_if_due()
+
+    def sample(self):
+        with self.lock:
+            active = dict(self.active)
+        if not active:
+            return
+        frames = sys._current_frames()
+        samples = [(endpoint, fold(frames[ident])) for ident, endpoint in active.items() if ident in frames]
+        with self.lock:
+            for endpoint, stack in samples:
+                self.stacks[endpoint][stack] += 1
+                self.dirty.add(endpoint)
+
+    def flush_if_due(self):
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Rewrite the folded file of every endpoint sampled since the last flush."""
+        self.last_flush = time.monotonic()
+        with self.lock:
+            pending = {endpoint: dict(self.stacks[endpoint]) for endpoint in self.dirty}
+            self.dirty.clear()
+        if not pending:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for endpoint, stacks in pending.items():
+                path = self.directory / f"{endpoint_filename(endpoint)}.{os.getpid()}.folded"
+                partial = path.with_suffix(".partial")
+                partial.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.items()))
+                os.replace(partial, path)
+        except OSError:
+            logger.exception("Could not write profiles to %s", self.directory)
+
+    def reset(self):
+        with self.lock:
+            self.stacks.clear()
+            self.dirty.clear()
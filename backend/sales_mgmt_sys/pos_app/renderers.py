@@ -0,0 +1,50 @@
+import re
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Floats orjson writes unlike json.dumps: exponents without sign or padding (1e16, 1e-7) and
+# decimals under 1e-4 (0.00001). Strings can match too; that only costs a render with the stdlib.
+FLOAT_MISMATCH = re.compile(rb"\de-?\d|0\.0000\d")
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in ``JSONRenderer`` that encodes with orjson when it is installed.
+
+    Anything orjson does not handle natively (Decimal, datetime, lazy strings,
+    querysets...) is passed to DRF's own encoder, and U+2028/U+2029 are escaped
+    the same way. Output holding a float orjson formats differently (see
+    FLOAT_MISMATCH) is rendered again by the stock implementation, so the
+    bytes match it, with one exception: NaN and infinities render as ``null``
+    where the stock renderer raises ValueError. Indented output (browsable
+    API, ``; indent=`` media types) and ``JSON_ENCODER = "stdlib"`` fall back
+    to the stock implementation.
+    """
+    encoder = getattr(settings, "JSON_ENCODER", "auto")
+
+    def use_orjson(self):
+        return orjson is not None and self.encoder != "stdlib" and self.compact and not self.ensure_ascii
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.use_orjson():
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS,
+        )
+        if FLOAT_MISMATCH.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
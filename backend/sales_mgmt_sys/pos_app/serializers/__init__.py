@@ -4,6 +4,8 @@ from .item_serializer import ItemSerializer
 from .sale_serializer import SaleSerializer, SaleUpdateSerializer
 from .sale_item_serializer import SaleItemSerializer
 from .rating_serializer import RatingSerializer
+from .return_serializer import PurchaseReturnSerializer
+from .stock_adjustment_serializer import StockAdjustmentSerializer
 
 __all__ = [
     "UserSerializer",
@@ -15,4 +17,5 @@ __all__ = [
     "SaleItemSerializer",
     "RatingSerializer",
     "PurchaseReturnSerializer",
+    "StockAdjustmentSerializer",
 ]
\ No newline at end of file
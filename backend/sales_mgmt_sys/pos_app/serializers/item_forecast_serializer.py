@@ -0,0 +1,15 @@
+# item_forecast_serializer.py
+from rest_framework import serializers
+from pos_app.models.item_forecast import ItemForecast
+
+class ItemForecastSerializer(serializers.ModelSerializer):
+    """Serializer for precomputed restock forecasts"""
+    item_name = serializers.ReadOnlyField(source="item.item_name")
+    quantity = serializers.ReadOnlyField(source="item.quantity")
+
+    class Meta:
+        model = ItemForecast
+        fields = [
+            "item", "item_name", "quantity", "stock_on_hand", "avg_daily_demand", "weekday_factors",
+            "days_until_stockout", "stockout_date", "reorder_quantity", "computed_at",
+        ]
@@ -1,9 +1,33 @@
 # item_serializer.py
 from rest_framework import serializers
 from pos_app.models.item import Item
+from pos_app.models.item_barcode import ItemBarcode
+from pos_app.services.pricelist import get_price_list
 
 class ItemSerializer(serializers.ModelSerializer):
-    """Serializer for fetching items"""
+    """Serializer for fetching items; ``fields=[...]`` limits the output to those fields"""
+    barcodes = serializers.SerializerMethodField()
+
     class Meta:
         model = Item
-        fields = ["item_id", "item_name", "price", "quantity", "is_active", "created_at", "updated_at"]
\ No newline at end of file
+        fields = ["item_id", "item_name", "sku", "barcodes", "price", "quantity", "is_active", "created_at", "updated_at"]
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def get_barcodes(self, obj):
+        # Read from the price-list snapshot, fetched once per response rather than once per item
+        root = self.root
+        if not hasattr(root, "_price_list"):
+            root._price_list = get_price_list()
+        return root._price_list.barcodes.get(obj.item_id, [])
+
+    def validate_sku(self, value):
+        """Blank SKUs are stored as NULL so many items can go without one; a SKU may not shadow a barcode."""
+        value = (value or "").strip() or None
+        if value and ItemBarcode.objects.filter(code=value).exclude(item_id=getattr(self.instance, "pk", None)).exists():
+            raise serializers.ValidationError("This code is already a barcode of another item.")
+        return value
@@ -0,0 +1,48 @@
+# return_serializer.py
+from rest_framework import serializers
+from pos_app.models.sale_return import SaleReturn, SaleReturnLine
+from pos_app.services import returns
+
+class ReturnLineSerializer(serializers.ModelSerializer):
+    """Serializer for the lines of a return"""
+    item_name = serializers.ReadOnlyField(source="item.item_name")
+
+    class Meta:
+        model = SaleReturnLine
+        fields = ["sale_item", "item", "item_name", "quantity", "unit_price", "refund_amount"]
+        read_only_fields = fields
+
+
+class ReturnRequestLineSerializer(serializers.Serializer):
+    """A sale line and how many of its units are coming back"""
+    sale_item = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class PurchaseReturnSerializer(serializers.ModelSerializer):
+    """Serializer for returning some (``items``) or all (no ``items``) of a sale"""
+    lines = ReturnLineSerializer(many=True, read_only=True)
+    items = ReturnRequestLineSerializer(many=True, write_only=True, required=False, allow_empty=False)
+
+    class Meta:
+        model = SaleReturn
+        fields = ["return_id", "sale", "staff", "return_date", "reason", "refund_amount", "lines", "items"]
+        read_only_fields = ["return_id", "sale", "staff", "return_date", "refund_amount"]
+
+    def validate_items(self, value):
+        quantities = {}
+        for line in value:
+            quantities[line["sale_item"]] = quantities.get(line["sale_item"], 0) + line["quantity"]
+        return quantities
+
+    def create(self, validated_data):
+        request = self.context.get("request")
+        try:
+            return returns.process_return(
+                self.context["sale"],
+                validated_data.get("items"),
+                staff=request.user if request else None,
+                reason=validated_data.get("reason", ""),
+            )
+        except returns.ReturnError as e:
+            raise serializers.ValidationError({"error": str(e)})
@@ -9,4 +9,4 @@ class SaleItemSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = SaleItem
-        fields = ["sale_item_id", "sale", "item", "item_name", "price", "quantity", "subtotal"]
\ No newline at end of file
+        fields = ["sale_item_id", "sale", "item", "item_name", "price", "unit_price", "quantity", "discount", "tax", "subtotal"]
\ No newline at end of file
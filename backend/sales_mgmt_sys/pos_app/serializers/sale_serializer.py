@@ -1,16 +1,202 @@
+from collections import namedtuple
 from decimal import Decimal
+from django.db import router, transaction
+from django.db.models import F
+from django.db.models.deletion import Collector
+from django.utils import timezone
 from rest_framework import serializers
 from pos_app.models.sale import Sale
 from pos_app.models.sale_item import SaleItem
 from pos_app.models.item import Item  
+from pos_app.services import outbox, pricing, shifts, stock
+from pos_app.services.pricelist import get_price_list
+
+
+class PriceListItemField(serializers.Field):
+    """Item reference validated against the in-memory price list instead of one query per line"""
+    default_error_messages = {
+        "does_not_exist": 'Invalid pk "{pk_value}" - object does not exist.',
+        "inactive": 'Item "{item_name}" is not available.',
+        "incorrect_type": "Incorrect type. Expected pk value, received {data_type}.",
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            item_id = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+        entry = get_price_list().get(item_id)
+        if entry is None:
+            self.fail("does_not_exist", pk_value=data)
+        if not entry.is_active:
+            self.fail("inactive", item_name=entry.item_name)
+        return item_id
+
+    def to_representation(self, value):
+        return value
 
 
 # Serializer for individual sale items
 class SaleItemSerializer(serializers.ModelSerializer):
+    item = PriceListItemField(source="item_id")
+
     class Meta:
         model = SaleItem
-        fields = ['item', 'quantity', 'subtotal']  
-        read_only_fields = ['subtotal']   
+        fields = ['sale_item_id', 'item', 'quantity', 'unit_price', 'discount', 'tax', 'subtotal', 'returned_quantity']  
+        read_only_fields = ['sale_item_id', 'unit_price', 'discount', 'tax', 'subtotal', 'returned_quantity']   
+
+
+def build_sale_items(sale, sale_items_data, price_list=None):
+    """
+    Price each line from a single price-list snapshot and the promotion and
+    tax rules in force when the sale was made; returns unsaved SaleItems and their total.
+    """
+    price_list = price_list or get_price_list()
+    basket = pricing.quote(
+        [(data["item_id"], data["quantity"], price_list.get(data["item_id"]).price) for data in sale_items_data],
+        at=sale.created_at,
+    )
+    lines = [
+        SaleItem(
+            sale=sale,
+            item_id=line.item_id,
+            quantity=line.quantity,
+            unit_price=line.unit_price,
+            discount=line.discount,
+            tax=line.tax,
+            subtotal=line.subtotal,
+            promotions=list(line.promotions),
+        )
+        for line in basket.lines
+    ]
+    return lines, basket.total
+
+
+def apply_stock(deltas):
+    """Apply ``{item_id: delta}`` in one conditional UPDATE, failing validation if any item would go negative."""
+    try:
+        stock.apply_deltas(deltas)
+    except stock.InsufficientStock as e:
+        item_id = min(e.items)
+        raise serializers.ValidationError(
+            {"error": f"Not enough stock for {Item.objects.get(item_id=item_id).item_name}. Only {e.items[item_id]} available."}
+        )
+
+
+def sale_created(sale, lines, took_stock):
+    """Record the checkout for downstream consumers, in the checkout's own transaction."""
+    deltas = stock.combine((line.item_id, -line.quantity) for line in lines) if took_stock else {}
+    outbox.emit([outbox.sale_event(
+        "sale.created", sale,
+        lines=[{"item_id": line.item_id, "quantity": line.quantity, "unit_price": line.unit_price,
+                "discount": line.discount, "tax": line.tax, "subtotal": line.subtotal}
+               for line in lines],
+        stock=outbox.stock_payload(deltas),
+    )])
+
+
+def take_stock(sale_items_data):
+    """Decrement stock for every line in one conditional UPDATE, failing validation if any line is short."""
+    apply_stock(stock.combine((data["item_id"], -data["quantity"]) for data in sale_items_data))
+
+
+SaleEdit = namedtuple("SaleEdit", ["new", "changed", "removed", "stock", "items", "revenue"])
+
+
+def _combos(table, item_id, rule_ids):
+    """The combos among ``rule_ids`` that ``item_id`` can take part in."""
+    return {combo.rule_id for combo in table.combos.get(item_id, ())}.intersection(rule_ids)
+
+
+def _rescale(line, quantity):
+    """Give ``line`` a new quantity at the discount and tax per unit it was sold with."""
+    ratio = Decimal(quantity) / line.quantity
+    line.discount = (line.discount * ratio).quantize(pricing.CENT, pricing.ROUND_HALF_UP)
+    line.tax = (line.tax * ratio).quantize(pricing.CENT, pricing.ROUND_HALF_UP)
+    line.quantity = quantity
+    line.subtotal = line.unit_price * quantity - line.discount
+
+
+def diff_sale_items(sale, sale_items_data, price_list=None):
+    """
+    Compare the submitted lines with the sale's current ones, one line per item.
+
+    Returns a SaleEdit: unsaved lines to insert, existing lines carrying their
+    new quantity, discount, tax and subtotal, lines to delete, the net stock
+    change per item and the change in units and revenue. Kept lines keep the
+    price they were sold at; only new items are priced from the current price
+    list.
+
+    Lines keep the discount and tax they were sold with unless the edit
+    touches them: a line is repriced with the rules in force now, as of the
+    time of the sale, only when it is new, its quantity changes or it gains
+    or loses a combo. Lines with returned units are never repriced; a new
+    quantity keeps the discount and tax per unit they were sold with.
+    """
+    price_list = price_list or get_price_list()
+    table = pricing.get_table()
+    wanted = stock.combine((data["item_id"], data["quantity"]) for data in sale_items_data)
+    current = {}
+    for line in sale.sale_items.order_by("sale_item_id"):
+        current.setdefault(line.item_id, []).append(line)
+
+    basket = pricing.quote(
+        [(item_id, quantity, current[item_id][0].unit_price if item_id in current else price_list.get(item_id).price)
+         for item_id, quantity in wanted.items()],
+        at=sale.created_at,
+        table=table,
+    )
+    priced = {line.item_id: line for line in basket.lines}
+
+    new, changed, removed, deltas = [], [], [], {}
+    revenue = Decimal("0.00")
+    for item_id, lines in current.items():
+        quantity = wanted.get(item_id, 0)
+        old = sum(line.quantity for line in lines)
+        kept, extra = lines[0], lines[1:]
+        price = priced.get(item_id)
+        if quantity == old and not extra and (
+            kept.returned_quantity or _combos(table, item_id, kept.promotions) == _combos(table, item_id, price.promotions)
+        ):
+            continue
+        if any(line.returned_quantity for line in extra) or quantity < kept.returned_quantity:
+            raise serializers.ValidationError(
+                {"error": f"Units of {price_list.get(item_id).item_name} have been returned; "
+                          f"the sale can no longer have fewer than {sum(line.returned_quantity for line in lines)}."}
+            )
+        deltas[item_id] = old - quantity
+        revenue -= sum((line.subtotal for line in lines), Decimal("0.00"))
+        # Checkout may have recorded one item on several lines; an edit folds them into the first
+        removed += extra if quantity else lines
+        if quantity:
+            if kept.returned_quantity:
+                # Refunds were worked out from this line's price; repricing it would change what they should have been
+                _rescale(kept, quantity)
+            else:
+                kept.quantity = quantity
+                kept.discount, kept.tax, kept.subtotal = price.discount, price.tax, price.subtotal
+                kept.promotions = list(price.promotions)
+            changed.append(kept)
+            revenue += kept.subtotal
+
+    for item_id, quantity in wanted.items():
+        if item_id not in current:
+            price = priced[item_id]
+            new.append(SaleItem(sale=sale, item_id=item_id, quantity=quantity, unit_price=price.unit_price,
+                                discount=price.discount, tax=price.tax, subtotal=price.subtotal,
+                                promotions=list(price.promotions)))
+            deltas[item_id] = -quantity
+            revenue += new[-1].subtotal
+    return SaleEdit(
+        new, changed, removed,
+        stock={item_id: delta for item_id, delta in deltas.items() if delta},
+        items=-sum(deltas.values()),
+        revenue=revenue,
+    )
+
 
 class SaleSerializer(serializers.ModelSerializer):
     sale_items = SaleItemSerializer(many=True)  
@@ -19,44 +205,60 @@ class SaleSerializer(serializers.ModelSerializer):
         model = Sale
         fields = ['staff', 'sale_items']
 
+    @transaction.atomic
     def create(self, validated_data):
         sale_items_data = validated_data.pop('sale_items')  
+        validated_data["shift_id"] = shifts.open_shift_id(validated_data["staff"].pk)
         sale = Sale.objects.create(**validated_data)  
 
-        for item_data in sale_items_data:
-            SaleItem.objects.create(sale=sale, **item_data)  
-        
-        sale.update_total()  
+        lines, total = build_sale_items(sale, sale_items_data)
+        SaleItem.objects.bulk_create(lines)
+
+        sale.total_amount = total
+        sale.save(update_fields=["total_amount", "updated_at"])
+        shifts.record(sale.shift_id, sales=1, items=sum(line.quantity for line in lines), revenue=total)
+        # Stock is taken separately through update-sales
+        sale_created(sale, lines, took_stock=False)
         return sale
 class SaleUpdateSerializer(serializers.ModelSerializer):
+    """Replaces a sale's lines with ``sale_items``, touching only the lines and stock that actually change"""
     sale_items = SaleItemSerializer(many=True)  
 
     class Meta:
         model = Sale
         fields = ["sale_id", "total_amount", "sale_items"]
-        read_only_fields = ["staff", "sale_date"]
+        read_only_fields = ["sale_id", "total_amount"]
 
+    @transaction.atomic
     def update(self, instance, validated_data):
-        sale_items_data = validated_data.pop("sale_items", [])
+        if "sale_items" not in validated_data:
+            return instance
 
-        for sale_item_data in sale_items_data:
-            item = sale_item_data["item"]
-            quantity = sale_item_data["quantity"]
+        # Write to the sale first: a concurrent edit of the same sale waits here and then diffs against our lines
+        Sale.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+        edit = diff_sale_items(instance, validated_data["sale_items"])
+        if not (edit.new or edit.changed or edit.removed):
+            return instance
 
-            if item.quantity < quantity:
-                raise serializers.ValidationError(
-                    {"error": f"Not enough stock for {item.item_name}. Only {item.quantity} available."}
-                )
+        apply_stock(edit.stock)
+        if edit.new:
+            SaleItem.objects.bulk_create(edit.new)
+        if edit.changed:
+            SaleItem.objects.bulk_update(edit.changed, ["quantity", "discount", "tax", "subtotal", "promotions"])
+        if edit.removed:
+            # Collected from the loaded lines, whose sale is already attached, so the delete signals need no lookups
+            collector = Collector(using=router.db_for_write(SaleItem))
+            collector.collect(edit.removed)
+            collector.delete()
 
-            item.quantity -= quantity
-            item.save()
+        instance.total_amount = F("total_amount") + edit.revenue
+        instance.save(update_fields=["total_amount", "updated_at"])
+        instance.refresh_from_db(fields=["total_amount", "updated_at"])
+        shifts.record(instance.shift_id, items=edit.items, revenue=edit.revenue)
+        outbox.emit([outbox.sale_event("sale.edited", instance, revenue=edit.revenue, stock=outbox.stock_payload(edit.stock))])
+        return instance
 
-            sale_item, created = SaleItem.objects.update_or_create(
-                sale=instance, item=item, defaults={"quantity": quantity, "price": sale_item_data["price"]}
-            )
 
-        instance.update_total()
-        return instance
 class SaleCreateSerializer(serializers.ModelSerializer):
     sale_items = SaleItemSerializer(many=True, write_only=True)
 
@@ -71,6 +273,7 @@ class SaleCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Total amount must be at least 0.01.")
         return value
 
+    @transaction.atomic
     def create(self, validated_data):
         sale_items_data = validated_data.pop("sale_items")
 
@@ -78,22 +281,16 @@ class SaleCreateSerializer(serializers.ModelSerializer):
         if request and request.user.is_authenticated:
             validated_data["staff"] = request.user
 
+        validated_data["shift_id"] = shifts.open_shift_id(validated_data["staff"].pk)
         sale = Sale.objects.create(**validated_data)
+        take_stock(sale_items_data)
 
-        for sale_item_data in sale_items_data:
-            item = sale_item_data["item"]
-            quantity = sale_item_data["quantity"]
-
-            if item.quantity < quantity:
-                raise serializers.ValidationError(
-                    {"error": f"Not enough stock for {item.item_name}. Only {item.quantity} available."}
-                )
-                
-            item.quantity -= quantity
-            item.save()
-
-            SaleItem.objects.create(sale=sale, **sale_item_data)
+        lines, total = build_sale_items(sale, sale_items_data)
+        SaleItem.objects.bulk_create(lines)
 
-        sale.update_total()
+        sale.total_amount = total
+        sale.save(update_fields=["total_amount", "updated_at"])
+        shifts.record(sale.shift_id, sales=1, items=sum(line.quantity for line in lines), revenue=total)
+        sale_created(sale, lines, took_stock=True)
 
         return sale
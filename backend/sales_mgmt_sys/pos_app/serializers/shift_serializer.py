@@ -0,0 +1,16 @@
+# shift_serializer.py
+from rest_framework import serializers
+from pos_app.models.shift import Shift
+
+class ShiftSerializer(serializers.ModelSerializer):
+    """Serializer for shifts and their running totals"""
+    staff_username = serializers.ReadOnlyField(source="staff.username")
+    is_open = serializers.ReadOnlyField()
+
+    class Meta:
+        model = Shift
+        fields = [
+            "shift_id", "staff", "staff_username", "opened_at", "closed_at", "is_open",
+            "opened_by", "closed_by", "sale_count", "item_count", "revenue",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,65 @@
+# stock_adjustment_serializer.py
+from rest_framework import serializers
+from pos_app.models.stock_adjustment import StockAdjustment, StockAdjustmentLine
+from pos_app.services import adjustments
+
+MAX_LINES = 1000
+
+class StockAdjustmentLineSerializer(serializers.ModelSerializer):
+    """Serializer for the lines of a stock adjustment"""
+    item_name = serializers.ReadOnlyField(source="item.item_name")
+    variance = serializers.ReadOnlyField()
+
+    class Meta:
+        model = StockAdjustmentLine
+        fields = ["item", "item_name", "expected", "counted", "delta", "variance"]
+        read_only_fields = fields
+
+
+class AdjustmentRequestLineSerializer(serializers.Serializer):
+    """An item and either its counted stock or the units to add (negative to remove)"""
+    item = serializers.IntegerField()
+    counted = serializers.IntegerField(min_value=0, required=False)
+    delta = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        if ("counted" in attrs) == ("delta" in attrs):
+            raise serializers.ValidationError("Give either counted or delta.")
+        return attrs
+
+
+class StockAdjustmentSerializer(serializers.ModelSerializer):
+    """Serializer for applying many counts and deltas (``items``) in one adjustment"""
+    lines = StockAdjustmentLineSerializer(many=True, read_only=True)
+    items = AdjustmentRequestLineSerializer(many=True, write_only=True)
+
+    class Meta:
+        model = StockAdjustment
+        fields = ["adjustment_id", "reason", "note", "staff", "line_count", "variance_units", "variance_value",
+                  "created_at", "lines", "items"]
+        read_only_fields = ["adjustment_id", "staff", "line_count", "variance_units", "variance_value", "created_at"]
+
+    def validate_items(self, value):
+        if not value:
+            raise serializers.ValidationError("At least one line is required.")
+        if len(value) > MAX_LINES:
+            raise serializers.ValidationError(f"At most {MAX_LINES} lines per adjustment.")
+        if len({line["item"] for line in value}) != len(value):
+            raise serializers.ValidationError("Each item can only appear once.")
+        return value
+
+    def create(self, validated_data):
+        request = self.context.get("request")
+        lines = validated_data["items"]
+        try:
+            adjustment = adjustments.apply_adjustment(
+                {line["item"]: line["counted"] for line in lines if "counted" in line},
+                {line["item"]: line["delta"] for line in lines if "delta" in line},
+                validated_data["reason"],
+                staff=request.user if request else None,
+                note=validated_data.get("note", ""),
+            )
+        except adjustments.AdjustmentError as e:
+            raise serializers.ValidationError({"error": str(e)})
+        # Read back with the item names the response shows, in two queries rather than one per line
+        return StockAdjustment.objects.prefetch_related("lines__item").get(pk=adjustment.pk)
@@ -0,0 +1,75 @@
+# task_serializer.py
+import math
+
+from rest_framework import serializers
+from pos_app.models.task import Task
+
+# Longest a task queued through the API may wait before it runs
+MAX_DELAY = 7 * 24 * 60 * 60
+
+class TaskSerializer(serializers.ModelSerializer):
+    """Serializer for background tasks"""
+
+    class Meta:
+        model = Task
+        fields = [
+            "task_id", "job", "args", "dedupe_key", "status", "run_at", "attempts", "max_attempts",
+            "result", "last_error", "created_at", "started_at", "finished_at",
+        ]
+
+
+class JobArgsSerializer(serializers.Serializer):
+    """Arguments of a job queued through the API; keys the job does not take are rejected"""
+
+    def validate(self, attrs):
+        unknown = sorted(set(self.initial_data) - set(self.fields))
+        if unknown:
+            raise serializers.ValidationError({name: ["Unknown argument."] for name in unknown})
+        return attrs
+
+
+class StaffPerformanceArgsSerializer(JobArgsSerializer):
+    days = serializers.IntegerField(min_value=1, max_value=366, required=False)
+
+
+class ForecastArgsSerializer(JobArgsSerializer):
+    # forecasting.MIN_LOOKBACK_DAYS; not imported so web processes do not load NumPy
+    lookback = serializers.IntegerField(min_value=7, max_value=366, required=False)
+    horizon = serializers.IntegerField(min_value=1, max_value=366, required=False)
+
+
+class PurgeTasksArgsSerializer(JobArgsSerializer):
+    days = serializers.IntegerField(min_value=1, max_value=3650, required=False)
+
+
+# Jobs managers may queue through POST v1/tasks/, with the serializer for their arguments.
+# Archiving, backups and replica refreshes touch the database files and stay with the schedule.
+API_JOBS = {
+    "staff_performance": StaffPerformanceArgsSerializer,
+    "forecasts": ForecastArgsSerializer,
+    "dispatch_outbox": JobArgsSerializer,
+    "purge_tasks": PurgeTasksArgsSerializer,
+}
+
+
+class TaskRequestSerializer(serializers.Serializer):
+    """A request to queue one of API_JOBS, ``delay`` seconds from now"""
+    job = serializers.CharField()
+    args = serializers.DictField(required=False, default=dict)
+    delay = serializers.FloatField(required=False, default=0, min_value=0, max_value=MAX_DELAY)
+
+    def validate_job(self, value):
+        if value not in API_JOBS:
+            raise serializers.ValidationError(f"Must be one of {', '.join(sorted(API_JOBS))}.")
+        return value
+
+    def validate_delay(self, value):
+        if not math.isfinite(value):
+            raise serializers.ValidationError("Must be a finite number of seconds.")
+        return value
+
+    def validate(self, attrs):
+        args = API_JOBS[attrs["job"]](data=attrs["args"])
+        if not args.is_valid():
+            raise serializers.ValidationError({"args": args.errors})
+        return {**attrs, "args": dict(args.validated_data)}
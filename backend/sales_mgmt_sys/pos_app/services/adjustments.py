@@ -0,0 +1,82 @@
+# adjustments.py
+from decimal import Decimal
+
+from django.db import transaction
+
+from pos_app.models.item import Item
+from pos_app.models.stock_adjustment import StockAdjustment, StockAdjustmentLine
+from pos_app.services import outbox, stock
+
+# Attempts at setting counts on items that tills keep selling from
+MAX_ATTEMPTS = 3
+
+
+class AdjustmentError(Exception):
+    pass
+
+
+def _apply_counts(counts, expected):
+    """Overwrite stock with ``counts``, re-reading ``expected`` for items a sale changed in the meantime."""
+    pending = dict(counts)
+    for _ in range(MAX_ATTEMPTS):
+        stale = stock.set_counts({item_id: (expected[item_id], counted) for item_id, counted in pending.items()})
+        if not stale:
+            return
+        expected.update(Item.objects.filter(item_id__in=stale).values_list("item_id", "quantity"))
+        pending = {item_id: counts[item_id] for item_id in stale}
+    raise AdjustmentError(f"Stock of items {sorted(pending)} kept changing; count them again.")
+
+
+@transaction.atomic
+def apply_adjustment(counts, deltas, reason, staff=None, note=""):
+    """
+    Apply absolute ``counts`` and relative ``deltas`` (both ``{item_id: units}``) as one adjustment.
+
+    Counts are written only over the stock they were compared against, so the
+    recorded variance is exact; deltas go through the same conditional update
+    as sales and fail rather than take an item below zero. The whole batch
+    costs a fixed handful of queries whatever its size.
+    """
+    if counts.keys() & deltas.keys():
+        raise AdjustmentError("Each item can only appear once in an adjustment.")
+    item_ids = list(counts.keys() | deltas.keys())
+    if not item_ids:
+        raise AdjustmentError("An adjustment needs at least one line.")
+
+    rows = {item_id: (quantity, price) for item_id, quantity, price in
+            Item.objects.filter(item_id__in=item_ids).values_list("item_id", "quantity", "price")}
+    missing = sorted(set(item_ids) - rows.keys())
+    if missing:
+        raise AdjustmentError(f"Unknown items: {missing}")
+    expected = {item_id: quantity for item_id, (quantity, _) in rows.items()}
+
+    _apply_counts(counts, expected)
+    try:
+        stock.apply_deltas({item_id: delta for item_id, delta in deltas.items() if delta})
+    except stock.InsufficientStock as e:
+        raise AdjustmentError(
+            "Not enough stock to remove from items " + ", ".join(f"{item_id} (has {units})" for item_id, units in sorted(e.items.items()))
+        )
+
+    lines = [StockAdjustmentLine(item_id=item_id, expected=expected[item_id], counted=counted, delta=counted - expected[item_id])
+             for item_id, counted in counts.items()]
+    lines += [StockAdjustmentLine(item_id=item_id, expected=expected[item_id], delta=delta) for item_id, delta in deltas.items()]
+
+    adjustment = StockAdjustment.objects.create(
+        reason=reason,
+        note=note,
+        staff=staff,
+        line_count=len(lines),
+        variance_units=sum(line.delta for line in lines if line.counted is not None),
+        variance_value=sum((rows[line.item_id][1] * line.delta for line in lines if line.counted is not None), Decimal("0.00")),
+    )
+    for line in lines:
+        line.adjustment = adjustment
+    StockAdjustmentLine.objects.bulk_create(lines)
+    outbox.emit([outbox.new_event("stock.adjusted", f"adjustment:{adjustment.pk}", {
+        "adjustment_id": adjustment.pk,
+        "reason": reason,
+        "staff_id": staff.pk if staff else None,
+        "stock": outbox.stock_payload({line.item_id: line.delta for line in lines if line.delta}),
+    })])
+    return adjustment
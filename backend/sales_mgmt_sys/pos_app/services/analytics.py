@@ -0,0 +1,278 @@
+# analytics.py
+from decimal import Decimal
+
+import numpy as np
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractHour, ExtractIsoWeekDay
+
+from pos_app import db_router
+from pos_app.models.archive_rollup import ArchiveItemRollup, ArchiveStaffRollup
+from pos_app.models.item import Item
+from pos_app.models.sale import Sale
+from pos_app.models.sale_item import SaleItem
+from pos_app.models.staff_performance import StaffDailyPerformance
+from pos_app.models.user import User
+from pos_app.services import staff_performance as performance
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def _to_cents(values):
+    """Convert a list of Decimals into an int64 array of cents."""
+    return np.rint(np.asarray(values, dtype=np.float64) * 100).astype(np.int64)
+
+
+def _money(cents):
+    return Decimal(int(cents)) / 100
+
+
+def _sales_in_range(start, end):
+    return Sale.objects.filter(sale_date__range=(start, end), is_void=False)
+
+
+def _lines_in_range(start, end):
+    return SaleItem.objects.filter(sale__sale_date__range=(start, end), sale__is_void=False)
+
+
+def hourly_heatmap(start, end):
+    """Sale counts and revenue bucketed by ISO weekday x hour of day."""
+    rows = list(
+        _sales_in_range(start, end).values_list(
+            ExtractIsoWeekDay("created_at"), ExtractHour("created_at"), "total_amount"
+        )
+    )
+    counts = np.zeros(7 * 24, dtype=np.int64)
+    revenue = np.zeros(7 * 24, dtype=np.int64)
+
+    if rows:
+        weekday, hour, amount = zip(*rows)
+        bucket = (np.asarray(weekday, dtype=np.int64) - 1) * 24 + np.asarray(hour, dtype=np.int64)
+        counts = np.bincount(bucket, minlength=7 * 24)
+        revenue = np.bincount(bucket, weights=_to_cents(amount), minlength=7 * 24).astype(np.int64)
+
+    counts = counts.reshape(7, 24)
+    revenue = revenue.reshape(7, 24)
+    busiest = np.unravel_index(np.argmax(counts), counts.shape) if counts.any() else None
+
+    return {
+        "weekdays": WEEKDAYS,
+        "hours": list(range(24)),
+        "counts": counts.tolist(),
+        "revenue": [[_money(cents) for cents in row] for row in revenue],
+        "busiest": {"weekday": WEEKDAYS[busiest[0]], "hour": int(busiest[1])} if busiest else None,
+    }
+
+
+def top_items(start, end, limit=10):
+    """Items ranked by quantity sold, with revenue and number of baskets (archived sales included)."""
+    rows = list(_lines_in_range(start, end).values_list("item_id", "sale_id", "quantity", "subtotal"))
+    rollups = list(
+        ArchiveItemRollup.objects.filter(day__range=(start, end)).values_list("item_id", "quantity", "revenue", "sale_count")
+    )
+    if not rows and not rollups:
+        return []
+
+    # Live lines count one basket per sale they appear in; archived rollups carry their own basket count
+    seen = set()
+    live = []
+    for item_id, sale_id, quantity, subtotal in rows:
+        live.append((item_id, quantity, subtotal, 0 if (item_id, sale_id) in seen else 1))
+        seen.add((item_id, sale_id))
+    rows = live + rollups
+    item_ids, quantities, subtotals, sale_counts = zip(*rows)
+    unique_ids, index = np.unique(np.asarray(item_ids, dtype=np.int64), return_inverse=True)
+    quantity = np.bincount(index, weights=np.asarray(quantities, dtype=np.int64)).astype(np.int64)
+    revenue = np.bincount(index, weights=_to_cents(subtotals)).astype(np.int64)
+    baskets = np.bincount(index, weights=np.asarray(sale_counts, dtype=np.int64)).astype(np.int64)
+
+    # Stable sort on quantity, ties broken by revenue
+    order = np.lexsort((-revenue, -quantity))[:limit]
+    names = dict(Item.objects.filter(item_id__in=unique_ids[order].tolist()).values_list("item_id", "item_name"))
+
+    return [
+        {
+            "item_id": int(unique_ids[i]),
+            "item_name": names.get(int(unique_ids[i])),
+            "quantity": int(quantity[i]),
+            "revenue": _money(revenue[i]),
+            "baskets": int(baskets[i]),
+        }
+        for i in order
+    ]
+
+
+def basket_affinity(start, end, limit=20, max_items=50):
+    """
+    Pairs of items most often bought together.
+
+    Only the ``max_items`` most frequently purchased items are considered so
+    the co-occurrence matrix stays small regardless of catalog size.
+    """
+    rows = list(_lines_in_range(start, end).values_list("sale_id", "item_id").distinct())
+    if not rows:
+        return {"baskets": 0, "pairs": []}
+
+    pairs = np.asarray(rows, dtype=np.int64)
+    sale_ids, sale_index = np.unique(pairs[:, 0], return_inverse=True)
+    item_ids, item_index = np.unique(pairs[:, 1], return_inverse=True)
+    n_baskets = len(sale_ids)
+
+    frequency = np.bincount(item_index, minlength=len(item_ids))
+    keep = np.argsort(-frequency, kind="stable")[:max_items]
+    remap = np.full(len(item_ids), -1, dtype=np.int64)
+    remap[keep] = np.arange(len(keep))
+
+    mask = remap[item_index] >= 0
+    basket = np.zeros((n_baskets, len(keep)), dtype=np.int32)
+    basket[sale_index[mask], remap[item_index[mask]]] = 1
+
+    # co[i, j] = number of baskets containing both i and j
+    co = basket.T @ basket
+    support = np.diag(co)
+    upper_i, upper_j = np.triu_indices(len(keep), k=1)
+    together = co[upper_i, upper_j]
+    found = together > 0
+    upper_i, upper_j, together = upper_i[found], upper_j[found], together[found]
+
+    order = np.argsort(-together, kind="stable")[:limit]
+    kept_ids = item_ids[keep]
+    names = dict(Item.objects.filter(item_id__in=kept_ids.tolist()).values_list("item_id", "item_name"))
+
+    result = []
+    for k in order:
+        i, j, both = upper_i[k], upper_j[k], int(together[k])
+        lift = both * n_baskets / (support[i] * support[j])
+        result.append({
+            "items": [
+                {"item_id": int(kept_ids[i]), "item_name": names.get(int(kept_ids[i]))},
+                {"item_id": int(kept_ids[j]), "item_name": names.get(int(kept_ids[j]))},
+            ],
+            "baskets": both,
+            "support": round(both / n_baskets, 4),
+            "confidence": round(both / max(support[i], support[j]), 4),
+            "lift": round(float(lift), 4),
+        })
+
+    return {"baskets": n_baskets, "pairs": result}
+
+
+
+def sales_summary(start, end):
+    """Sale count, units sold and revenue over the range, per day and per staff member (archived sales included)."""
+    items = {
+        (day, staff_id): n
+        for day, staff_id, n in _lines_in_range(start, end).values("sale__sale_date", "sale__staff_id")
+        .annotate(n=Sum("quantity")).values_list("sale__sale_date", "sale__staff_id", "n")
+    }
+    rows = [
+        (day, staff_id, sales, items.get((day, staff_id), 0), revenue)
+        for day, staff_id, sales, revenue in _sales_in_range(start, end).values("sale_date", "staff_id")
+        .annotate(n=Count("sale_id"), revenue=Sum("total_amount")).values_list("sale_date", "staff_id", "n", "revenue")
+    ]
+    rows += ArchiveStaffRollup.objects.filter(day__range=(start, end)).values_list(
+        "day", "staff_id", "sale_count", "item_count", "revenue"
+    )
+
+    by_day, by_staff = {}, {}
+    for day, staff_id, sales, units, revenue in rows:
+        for totals, key in ((by_day, day), (by_staff, staff_id)):
+            row = totals.setdefault(key, [0, 0, Decimal("0.00")])
+            row[0] += sales
+            row[1] += units
+            row[2] += revenue or 0
+
+    def entry(sales, units, revenue):
+        return {
+            "sale_count": sales,
+            "item_count": units,
+            "revenue": revenue,
+            "average_sale": (revenue / sales).quantize(Decimal("0.01")) if sales else Decimal("0.00"),
+        }
+
+    names = dict(User.objects.filter(user_id__in=list(by_staff)).values_list("user_id", "username"))
+    sale_count = sum(row[0] for row in by_day.values())
+    return {
+        **entry(sale_count, sum(row[1] for row in by_day.values()), sum((row[2] for row in by_day.values()), Decimal("0.00"))),
+        "days": [{"day": day, **entry(*by_day[day])} for day in sorted(by_day)],
+        "staff": sorted(
+            ({"staff_id": staff_id, "username": names.get(staff_id), **entry(*totals)} for staff_id, totals in by_staff.items()),
+            key=lambda row: row["revenue"], reverse=True,
+        ),
+    }
+
+
+def _pearson(x, y):
+    """Pearson correlation of two samples, or None when it is undefined."""
+    if len(x) < 3:
+        return None
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    if not x.std() or not y.std():
+        return None
+    return round(float(np.corrcoef(x, y)[0, 1]), 4)
+
+
+def staff_performance(start, end):
+    """
+    Sales per active hour, average basket, items per sale and ratings per
+    staff member, plus how each day's rating correlates with that day's metrics.
+
+    Reads the per-day rows materialized by ``staff_performance.ensure``, so
+    only days not computed yet touch the sales tables.
+    """
+    # The materialized rows are written on the primary; reading them there is cheap
+    with db_router.use_primary():
+        performance.ensure(start, end)
+        days = list(
+            StaffDailyPerformance.objects.filter(day__range=(start, end)).values_list(
+                "staff_id", "sale_count", "item_count", "revenue", "hourly_sales", "active_hours", "rating_count", "rating_total"
+            )
+        )
+        names = dict(User.objects.filter(user_id__in={row[0] for row in days}).values_list("user_id", "username"))
+
+    by_staff = {}
+    samples = {"sales_per_hour": [], "average_basket": [], "items_per_sale": []}
+    ratings = []
+    for staff_id, sales, units, revenue, hourly, active_hours, rating_count, rating_total in days:
+        totals = by_staff.setdefault(staff_id, {
+            "sales": 0, "units": 0, "revenue": Decimal("0.00"), "hourly": np.zeros(24, dtype=np.int64),
+            "active_hours": 0, "rating_count": 0, "rating_total": 0.0,
+        })
+        totals["sales"] += sales
+        totals["units"] += units
+        totals["revenue"] += revenue
+        totals["hourly"] += np.asarray(hourly or [0] * 24, dtype=np.int64)
+        totals["active_hours"] += active_hours
+        totals["rating_count"] += rating_count
+        totals["rating_total"] += rating_total
+        if sales and rating_count and active_hours:
+            samples["sales_per_hour"].append(sum(hourly) / active_hours)
+            samples["average_basket"].append(float(revenue) / sales)
+            samples["items_per_sale"].append(units / sales)
+            ratings.append(rating_total / rating_count)
+
+    staff = []
+    for staff_id, totals in by_staff.items():
+        sales, hourly = totals["sales"], totals["hourly"]
+        staff.append({
+            "staff_id": staff_id,
+            "username": names.get(staff_id),
+            "sale_count": sales,
+            "item_count": totals["units"],
+            "revenue": totals["revenue"],
+            "average_basket": (totals["revenue"] / sales).quantize(Decimal("0.01")) if sales else Decimal("0.00"),
+            "items_per_sale": round(totals["units"] / sales, 2) if sales else 0,
+            # Archived sales keep no times, so the hourly rate covers live sales only
+            "sales_per_hour": round(int(hourly.sum()) / totals["active_hours"], 2) if totals["active_hours"] else 0,
+            "active_hours": totals["active_hours"],
+            "peak_hour": int(np.argmax(hourly)) if hourly.any() else None,
+            "rating_count": totals["rating_count"],
+            "average_rating": round(totals["rating_total"] / totals["rating_count"], 2) if totals["rating_count"] else None,
+        })
+
+    return {
+        "staff": sorted(staff, key=lambda row: row["revenue"], reverse=True),
+        "rating_correlation": {
+            "samples": len(ratings),
+            **{metric: _pearson(values, ratings) for metric, values in samples.items()},
+        },
+    }
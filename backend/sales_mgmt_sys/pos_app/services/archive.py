@@ -0,0 +1,209 @@
+# archive.py
+import gzip
+import json
+import os
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from pos_app.models.archive_rollup import ArchiveItemRollup, ArchiveStaffRollup
+from pos_app.models.sale import Sale
+from pos_app.models.sale_archive import SaleArchive
+from pos_app.models.sale_item import SaleItem
+from pos_app.services import staff_performance
+
+ARCHIVE_ROOT = Path(getattr(settings, "ARCHIVE_ROOT", Path(settings.BASE_DIR) / "archive"))
+HORIZON_DAYS = getattr(settings, "ARCHIVE_HORIZON_DAYS", 365)
+CHUNK_SIZE = getattr(settings, "ARCHIVE_CHUNK_SIZE", 1000)
+
+SALE_FIELDS = ["sale_id", "staff_id", "shift_id", "sale_date", "total_amount", "is_void", "created_at", "updated_at"]
+LINE_FIELDS = ["sale_item_id", "sale_id", "item_id", "quantity", "unit_price", "discount", "tax", "subtotal"]
+
+
+def _encode(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    return value.isoformat()
+
+
+def _load_chunk(cutoff, chunk_size):
+    sales = list(
+        Sale.objects.filter(sale_date__lt=cutoff).order_by("sale_id").values(*SALE_FIELDS)[:chunk_size]
+    )
+    if not sales:
+        return [], {}
+
+    lines = defaultdict(list)
+    for line in SaleItem.objects.filter(sale_id__in=[s["sale_id"] for s in sales]).values(*LINE_FIELDS):
+        lines[line["sale_id"]].append(line)
+    return sales, lines
+
+
+def _write_file(sales, lines):
+    """Write sales and their lines as gzipped NDJSON; the file only becomes visible once complete."""
+    ARCHIVE_ROOT.mkdir(parents=True, exist_ok=True)
+    first, last = sales[0]["sale_id"], sales[-1]["sale_id"]
+    path = ARCHIVE_ROOT / f"sales-{first:08d}-{last:08d}.ndjson.gz"
+    partial = path.with_suffix(".partial")
+
+    with gzip.open(partial, "wt", encoding="utf-8") as handle:
+        for sale in sales:
+            record = dict(sale, lines=[{k: v for k, v in line.items() if k != "sale_id"}
+                                       for line in lines.get(sale["sale_id"], [])])
+            handle.write(json.dumps(record, default=_encode, separators=(",", ":")) + "\n")
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(partial, path)
+    return path
+
+
+def _add_rollups(sales, lines):
+    """Fold the chunk into the per-day rollups so reports keep counting archived sales."""
+    staff_totals = defaultdict(lambda: [0, 0, Decimal("0.00")])
+    item_totals = defaultdict(lambda: [0, 0, Decimal("0.00")])
+    # An item can sit on several lines of one sale; it still counts as one basket
+    item_sales = set()
+    for sale in sales:
+        # Voided sales are archived for the audit trail but never counted
+        if sale["is_void"]:
+            continue
+        staff = staff_totals[(sale["sale_date"], sale["staff_id"])]
+        staff[0] += 1
+        staff[2] += sale["total_amount"]
+        for line in lines.get(sale["sale_id"], []):
+            staff[1] += line["quantity"]
+            item = item_totals[(sale["sale_date"], line["item_id"])]
+            if (sale["sale_id"], line["item_id"]) not in item_sales:
+                item_sales.add((sale["sale_id"], line["item_id"]))
+                item[0] += 1
+            item[1] += line["quantity"]
+            item[2] += line["subtotal"]
+
+    days = {day for day, _ in staff_totals}
+    for model, key_field, totals, fields in (
+        (ArchiveStaffRollup, "staff_id", staff_totals, ("sale_count", "item_count", "revenue")),
+        (ArchiveItemRollup, "item_id", item_totals, ("sale_count", "quantity", "revenue")),
+    ):
+        existing = {(r.day, getattr(r, key_field)): r for r in model.objects.filter(day__in=days)}
+        created, updated = [], []
+        for (day, key), values in totals.items():
+            row = existing.get((day, key))
+            if row is None:
+                created.append(model(day=day, **{key_field: key}, **dict(zip(fields, values))))
+            else:
+                for field, value in zip(fields, values):
+                    setattr(row, field, getattr(row, field) + value)
+                updated.append(row)
+        model.objects.bulk_create(created, batch_size=500)
+        model.objects.bulk_update(updated, fields, batch_size=500)
+
+
+def archive_sales(horizon_days=HORIZON_DAYS, chunk_size=CHUNK_SIZE, dry_run=False):
+    """
+    Move sales older than ``horizon_days`` out of the hot tables.
+
+    Each chunk is written to its own compressed file before its rows are
+    deleted, and the manifest entry, rollups and deletes share one transaction,
+    so a crash leaves either the hot rows or a complete archive, never neither.
+    """
+    cutoff = timezone.localdate() - timedelta(days=horizon_days)
+    if dry_run:
+        return {"sales": Sale.objects.filter(sale_date__lt=cutoff).count(), "files": 0}
+
+    archived, files = 0, 0
+    while True:
+        with transaction.atomic():
+            sales, lines = _load_chunk(cutoff, chunk_size)
+            if not sales:
+                break
+
+            path = _write_file(sales, lines)
+            try:
+                sale_ids = [s["sale_id"] for s in sales]
+                dates = [s["sale_date"] for s in sales]
+                SaleArchive.objects.create(
+                    path=path.name,
+                    start_date=min(dates),
+                    end_date=max(dates),
+                    sale_count=len(sales),
+                    line_count=sum(len(v) for v in lines.values()),
+                    total_amount=sum((s["total_amount"] for s in sales), Decimal("0.00")),
+                )
+                # Keep the hours of these days: rollups only carry daily totals
+                staff_performance.ensure(min(dates), max(dates))
+                _add_rollups(sales, lines)
+                Sale.objects.filter(sale_id__in=sale_ids).delete()
+            except Exception:
+                path.unlink(missing_ok=True)
+                raise
+
+        archived += len(sales)
+        files += 1
+
+    return {"sales": archived, "files": files}
+
+
+def iter_archived_sales(start=None, end=None, staff_id=None, include_void=False):
+    """Stream archived sales (with their lines) overlapping ``start``..``end``, oldest file first."""
+    manifests = SaleArchive.objects.order_by("archive_id")
+    if start:
+        manifests = manifests.filter(end_date__gte=start)
+    if end:
+        manifests = manifests.filter(start_date__lte=end)
+
+    for manifest in manifests:
+        with gzip.open(ARCHIVE_ROOT / manifest.path, "rt", encoding="utf-8") as handle:
+            for raw in handle:
+                sale = json.loads(raw)
+                sale_date = parse_date(sale["sale_date"])
+                if (start and sale_date < start) or (end and sale_date > end):
+                    continue
+                if staff_id is not None and sale["staff_id"] != staff_id:
+                    continue
+                if sale.get("is_void") and not include_void:
+                    continue
+                sale["sale_date"] = sale_date
+                sale["total_amount"] = Decimal(sale["total_amount"])
+                sale["created_at"] = parse_datetime(sale["created_at"])
+                sale["updated_at"] = parse_datetime(sale["updated_at"])
+                for line in sale["lines"]:
+                    line["subtotal"] = Decimal(line["subtotal"])
+                    # Older files predate unit prices, discounts and tax
+                    for field in ("unit_price", "discount", "tax"):
+                        if field in line:
+                            line[field] = Decimal(line[field])
+                sale["archived"] = True
+                yield sale
+
+
+def iter_sales(start=None, end=None, staff_id=None, chunk_size=CHUNK_SIZE, include_void=False):
+    """Stream hot and archived sales in the same shape, so callers need not know where a sale lives."""
+    hot = Sale.objects.order_by("sale_id")
+    if not include_void:
+        hot = hot.filter(is_void=False)
+    if start:
+        hot = hot.filter(sale_date__gte=start)
+    if end:
+        hot = hot.filter(sale_date__lte=end)
+    if staff_id is not None:
+        hot = hot.filter(staff_id=staff_id)
+
+    yield from iter_archived_sales(start, end, staff_id, include_void)
+
+    last_id = 0
+    while True:
+        sales = list(hot.filter(sale_id__gt=last_id).values(*SALE_FIELDS)[:chunk_size])
+        if not sales:
+            return
+        lines = defaultdict(list)
+        for line in SaleItem.objects.filter(sale_id__in=[s["sale_id"] for s in sales]).values(*LINE_FIELDS):
+            lines[line.pop("sale_id")].append(line)
+        for sale in sales:
+            yield dict(sale, lines=lines.get(sale["sale_id"], []), archived=False)
+        last_id = sales[-1]["sale_id"]
@@ -0,0 +1,235 @@
+# backups.py
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from pos_app.services import pricelist, pricing, query_cache
+
+BACKUP_ROOT = Path(getattr(settings, "BACKUP_ROOT", Path(settings.BASE_DIR) / "backups"))
+STEP_PAGES = getattr(settings, "BACKUP_STEP_PAGES", 16384)
+STEP_SLEEP = getattr(settings, "BACKUP_STEP_SLEEP", 0.05)
+MAX_RESTARTS = getattr(settings, "BACKUP_MAX_RESTARTS", 2)
+# Wait after finding the database locked; retrying sooner only steals the lock from checkouts
+BUSY_SLEEP = 0.25
+KEEP = getattr(settings, "BACKUP_KEEP", 24)
+KEEP_DAILY = getattr(settings, "BACKUP_KEEP_DAILY", 14)
+
+PREFIX = "db-"
+SUFFIX = ".sqlite3"
+STAMP = "%Y%m%dT%H%M%SZ"
+
+
+class BackupError(Exception):
+    pass
+
+
+class _Restarted(Exception):
+    pass
+
+
+def primary_path():
+    primary = connections[DEFAULT_DB_ALIAS].settings_dict
+    if primary["ENGINE"] != "django.db.backends.sqlite3":
+        raise BackupError("Online backups are only supported for SQLite; use the database's own tooling.")
+    return str(primary["NAME"])
+
+
+def _check(path):
+    """Raise unless ``path`` is a readable, intact database with Django's schema table."""
+    try:
+        copy = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            result = copy.execute("PRAGMA quick_check").fetchone()[0]
+            migrated = copy.execute("SELECT 1 FROM sqlite_master WHERE name = 'django_migrations'").fetchone()
+        finally:
+            copy.close()
+    except sqlite3.DatabaseError as e:
+        raise BackupError(f"{path} is not a usable database: {e}")
+    if result != "ok":
+        raise BackupError(f"{path} failed its integrity check: {result}")
+    if not migrated:
+        raise BackupError(f"{path} is not a database of this application.")
+
+
+def online_copy(source, target, pages=STEP_PAGES, sleep=STEP_SLEEP, max_restarts=MAX_RESTARTS):
+    """
+    Copy the SQLite database at ``source`` to ``target`` while others keep writing.
+
+    Pages are copied ``pages`` at a time with a ``sleep`` between steps, and
+    the read lock on the source is only held during a step, so a checkout
+    waits at most one step. A commit from another connection makes SQLite
+    start the copy over; each time that happens the step grows fourfold, and
+    after ``max_restarts`` the copy is finished in a single step, trading a
+    few longer stalls for a bounded run time on a busy till.
+    The copy is written next to ``target`` and renamed over it once complete.
+    """
+    target = str(target)
+    partial = f"{target}.partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+
+    stats = {"steps": 0, "restarts": 0, "single_step": False}
+    remaining = [None]
+
+    def progress(status, left, total):
+        stats["steps"] += 1
+        # A step that went through without lowering the count started over (SQLite resets it to the total)
+        if status == sqlite3.SQLITE_OK and remaining[0] is not None and left >= remaining[0]:
+            raise _Restarted
+        if status == sqlite3.SQLITE_OK:
+            remaining[0] = left
+        # The source is unlocked between steps; sqlite3 itself only sleeps after a busy step
+        if left and sleep:
+            time.sleep(sleep)
+
+    started = time.perf_counter()
+    source_db = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    copy = sqlite3.connect(partial)
+    try:
+        step = pages
+        while True:
+            remaining[0] = None
+            try:
+                source_db.backup(copy, pages=step, progress=progress, sleep=BUSY_SLEEP)
+                break
+            except _Restarted:
+                stats["restarts"] += 1
+                if stats["restarts"] >= max_restarts:
+                    stats["single_step"] = True
+                    source_db.backup(copy, pages=-1, sleep=BUSY_SLEEP)
+                    break
+                step *= 4
+        # A copy of a WAL database is WAL too; make it a self-contained file that opens read-only
+        copy.execute("PRAGMA journal_mode=DELETE")
+        stats["pages"] = copy.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        copy.close()
+        source_db.close()
+    os.replace(partial, target)
+    stats.update(path=target, bytes=os.path.getsize(target), seconds=round(time.perf_counter() - started, 3))
+    return stats
+
+
+def backup_name(moment):
+    return f"{PREFIX}{moment.astimezone(dt_timezone.utc).strftime(STAMP)}{SUFFIX}"
+
+
+def backup_time(path):
+    try:
+        return datetime.strptime(Path(path).name[len(PREFIX):-len(SUFFIX)], STAMP).replace(tzinfo=dt_timezone.utc)
+    except ValueError:
+        return None
+
+
+def list_backups(root=BACKUP_ROOT):
+    """Backups in ``root``, newest first."""
+    if not root.exists():
+        return []
+    found = [path for path in root.glob(f"{PREFIX}*{SUFFIX}") if backup_time(path)]
+    return sorted(found, key=backup_time, reverse=True)
+
+
+def rotate(root=BACKUP_ROOT, keep=KEEP, keep_daily=KEEP_DAILY):
+    """
+    Delete old backups, keeping the newest ``keep`` and the newest one of each
+    of the last ``keep_daily`` days that have a backup. Returns the deleted paths.
+    """
+    backups = list_backups(root)
+    kept = set(backups[:keep])
+    days = {}
+    for path in backups:
+        days.setdefault(backup_time(path).date(), path)
+    kept.update(list(days.values())[:keep_daily])
+
+    deleted = [path for path in backups if path not in kept]
+    for path in deleted:
+        path.unlink()
+    return deleted
+
+
+def create_backup(root=BACKUP_ROOT, pages=STEP_PAGES, sleep=STEP_SLEEP, keep=KEEP, keep_daily=KEEP_DAILY):
+    """Take a verified online snapshot of the primary into ``root`` and rotate older ones."""
+    root.mkdir(parents=True, exist_ok=True)
+    moment = datetime.now(dt_timezone.utc)
+    path = root / backup_name(moment)
+    while path.exists():
+        # Two backups in the same second: the stamp has one-second resolution
+        time.sleep(1)
+        moment = datetime.now(dt_timezone.utc)
+        path = root / backup_name(moment)
+
+    stats = online_copy(primary_path(), path, pages=pages, sleep=sleep)
+    try:
+        _check(path)
+    except BackupError:
+        path.unlink()
+        raise
+    stats["rotated"] = [str(deleted) for deleted in rotate(root, keep, keep_daily)]
+    return stats
+
+
+def resolve(name, root=BACKUP_ROOT):
+    """A backup given by path, by file name in ``root`` or as ``latest``."""
+    if name == "latest":
+        backups = list_backups(root)
+        if not backups:
+            raise BackupError(f"No backups in {root}.")
+        return backups[0]
+    path = Path(name)
+    if not path.exists() and (root / name).exists():
+        path = root / name
+    if not path.exists():
+        raise BackupError(f"No backup named {name}.")
+    return path
+
+
+def _migrations(path):
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return set(db.execute("SELECT app, name FROM django_migrations").fetchall())
+    finally:
+        db.close()
+
+
+def restore(path, root=BACKUP_ROOT, safety_copy=True):
+    """
+    Replace the primary's contents with the backup at ``path``.
+
+    The backup is checked first, and unless ``safety_copy`` is off the
+    current database is backed up so the restore itself can be undone. The
+    pages are written through the backup API into the live file under one
+    exclusive lock, so other connections see the old database or the
+    restored one, never a mix. Cached reports and price lists are dropped.
+    """
+    path = Path(path)
+    _check(path)
+    primary = primary_path()
+    missing = sorted(_migrations(primary) - _migrations(path))
+
+    result = {"restored": str(path), "safety_copy": None, "missing_migrations": [f"{app}.{name}" for app, name in missing]}
+    if safety_copy:
+        root.mkdir(parents=True, exist_ok=True)
+        safety = root / f"pre-restore-{backup_name(datetime.now(dt_timezone.utc))}"
+        online_copy(primary, safety)
+        result["safety_copy"] = str(safety)
+
+    connection = connections[DEFAULT_DB_ALIAS]
+    connection.close()
+    connection.ensure_connection()
+    source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        source.backup(connection.connection, pages=-1)
+    finally:
+        source.close()
+        connection.close()
+
+    caches[query_cache.CACHE_ALIAS].clear()
+    pricelist.bump_version()
+    pricing.bump_version()
+    return result
@@ -0,0 +1,41 @@
+# catalog.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from pos_app.models.item import Item
+from pos_app.models.item_tombstone import ItemTombstone
+
+# Changes stamped up to this long before a cursor are sent again: a write stamps
+# updated_at before it commits, so it can become visible after a sync that read past it.
+# Long writes (the item import) stamp their rows again just before committing.
+OVERLAP = timedelta(seconds=getattr(settings, "CATALOG_SYNC_OVERLAP", 5))
+TOMBSTONE_DAYS = getattr(settings, "CATALOG_TOMBSTONE_DAYS", 90)
+
+
+def record_deletion(item_id):
+    """Leave a tombstone for ``item_id`` and prune the ones no delta can reach any more."""
+    now = timezone.now()
+    ItemTombstone.objects.update_or_create(item_id=item_id, defaults={"deleted_at": now})
+    ItemTombstone.objects.filter(deleted_at__lt=now - timedelta(days=TOMBSTONE_DAYS)).delete()
+
+
+def changes(since, items=None):
+    """
+    Active items changed after the cursor ``since`` (from ``items``, default
+    all of them) and the ids of items deleted or deactivated after it, with
+    the cursor to send next time. An id deleted and then reused by a new item
+    only appears among the items.
+
+    Returns None when ``since`` is older than the tombstones reach, in which
+    case the terminal has to download the whole catalog again.
+    """
+    cursor = timezone.now()
+    if since < cursor - timedelta(days=TOMBSTONE_DAYS):
+        return None
+    start = since - OVERLAP
+    changed = list((Item.objects.all() if items is None else items).filter(updated_at__gt=start, is_active=True))
+    removed = set(ItemTombstone.objects.filter(deleted_at__gt=start).values_list("item_id", flat=True))
+    removed.update(Item.objects.filter(updated_at__gt=start, is_active=False).values_list("item_id", flat=True))
+    return changed, sorted(removed - {item.item_id for item in changed}), cursor
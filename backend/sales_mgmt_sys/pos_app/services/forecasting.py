@@ -0,0 +1,144 @@
+# forecasting.py
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from pos_app.models.item import Item
+from pos_app.models.item_forecast import ItemForecast
+from pos_app.models.sale_item import SaleItem
+
+LOOKBACK_DAYS = getattr(settings, "FORECAST_LOOKBACK_DAYS", 56)
+AVERAGE_WINDOW_DAYS = getattr(settings, "FORECAST_AVERAGE_WINDOW_DAYS", 14)
+HORIZON_DAYS = getattr(settings, "FORECAST_HORIZON_DAYS", 60)
+LEAD_TIME_DAYS = getattr(settings, "FORECAST_LEAD_TIME_DAYS", 3)
+COVER_DAYS = getattr(settings, "FORECAST_COVER_DAYS", 14)
+
+# Shortest history that still covers every weekday
+MIN_LOOKBACK_DAYS = 7
+
+# Weight (in weeks of average demand) pulling sparse weekday factors towards 1
+SEASONALITY_SMOOTHING = 1.0
+
+
+def demand_matrix(item_ids, start, days):
+    """Units sold per item per day as an ``(items, days)`` array starting at ``start``."""
+    end = start + timedelta(days=days - 1)
+    rows = list(
+        SaleItem.objects.filter(sale__sale_date__range=(start, end), sale__is_void=False, item__is_active=True)
+        .values_list("item_id", "sale__sale_date", "quantity")
+    )
+    demand = np.zeros((len(item_ids), days), dtype=np.float64)
+    if not rows:
+        return demand
+
+    sold_ids, sold_dates, quantities = zip(*rows)
+    position = {item_id: i for i, item_id in enumerate(item_ids)}
+    row_index = np.fromiter((position.get(i, -1) for i in sold_ids), dtype=np.int64, count=len(rows))
+    day_index = (np.asarray(sold_dates, dtype="datetime64[D]") - np.datetime64(start, "D")).astype(np.int64)
+    known = row_index >= 0
+    np.add.at(demand, (row_index[known], day_index[known]), np.asarray(quantities, dtype=np.float64)[known])
+    return demand
+
+
+def weekday_factors(demand, start):
+    """Per-item multiplicative day-of-week factors (ISO Monday first), shrunk towards 1."""
+    weekdays = (np.arange(demand.shape[1]) + start.weekday()) % 7
+    counts = np.bincount(weekdays, minlength=7).astype(np.float64)
+
+    totals = np.zeros((demand.shape[0], 7), dtype=np.float64)
+    for day in range(7):
+        totals[:, day] = demand[:, weekdays == day].sum(axis=1)
+
+    overall = demand.mean(axis=1, keepdims=True)
+    weekday_mean = np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+    factors = np.divide(
+        counts * weekday_mean + SEASONALITY_SMOOTHING * overall,
+        (counts + SEASONALITY_SMOOTHING) * overall,
+        out=np.ones_like(totals),
+        where=overall > 0,
+    )
+    return factors
+
+
+def project(level, factors, stock, today, horizon):
+    """
+    Project daily demand over ``horizon`` days and work out when stock runs out.
+
+    Returns ``(days_until_stockout, demand_over_cover)`` where the first is
+    ``nan`` for items that last beyond the horizon.
+    """
+    weekdays = (np.arange(horizon) + today.weekday()) % 7
+    daily = level[:, None] * factors[:, weekdays]
+    cumulative = np.cumsum(daily, axis=1)
+
+    runs_out = cumulative >= stock[:, None]
+    hit = runs_out.any(axis=1) & (level > 0)
+    first = np.argmax(runs_out, axis=1)
+
+    rows = np.arange(len(level))
+    before = np.where(first > 0, cumulative[rows, first - 1], 0.0)
+    on_day = daily[rows, first]
+    fraction = np.divide(stock - before, on_day, out=np.zeros_like(on_day), where=on_day > 0)
+    days = np.where(hit, first + fraction, np.nan)
+    days = np.where(stock <= 0, 0.0, days)
+
+    cover = min(LEAD_TIME_DAYS + COVER_DAYS, horizon)
+    return days, cumulative[:, cover - 1]
+
+
+def compute_forecasts(today=None, lookback=LOOKBACK_DAYS, horizon=HORIZON_DAYS):
+    """Recompute and store forecasts for every active item in one batch pass."""
+    if lookback < MIN_LOOKBACK_DAYS:
+        raise ValueError(f"lookback must be at least {MIN_LOOKBACK_DAYS} days")
+    if horizon < 1:
+        raise ValueError("horizon must be at least 1 day")
+    today = today or timezone.localdate()
+    start = today - timedelta(days=lookback)
+
+    items = list(Item.objects.filter(is_active=True).values_list("item_id", "quantity"))
+    if not items:
+        ItemForecast.objects.all().delete()
+        return 0
+
+    item_ids = [item_id for item_id, _ in items]
+    stock = np.asarray([quantity for _, quantity in items], dtype=np.float64)
+
+    demand = demand_matrix(item_ids, start, lookback)
+    window = min(AVERAGE_WINDOW_DAYS, lookback)
+    level = demand[:, -window:].mean(axis=1)
+    factors = weekday_factors(demand, start)
+    days, cover_demand = project(level, factors, stock, today, horizon)
+    reorder = np.maximum(np.ceil(cover_demand - stock), 0).astype(np.int64)
+
+    now = timezone.now()
+    forecasts = []
+    for i, item_id in enumerate(item_ids):
+        stockout = None if np.isnan(days[i]) else float(round(days[i], 2))
+        forecasts.append(ItemForecast(
+            item_id=item_id,
+            avg_daily_demand=round(float(level[i]), 3),
+            weekday_factors=[round(float(f), 3) for f in factors[i]],
+            stock_on_hand=int(stock[i]),
+            days_until_stockout=stockout,
+            stockout_date=today + timedelta(days=int(stockout)) if stockout is not None else None,
+            reorder_quantity=int(reorder[i]),
+            computed_at=now,
+        ))
+
+    with transaction.atomic():
+        ItemForecast.objects.exclude(item__is_active=True).delete()
+        ItemForecast.objects.bulk_create(
+            forecasts,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["item"],
+            update_fields=[
+                "avg_daily_demand", "weekday_factors", "stock_on_hand", "days_until_stockout",
+                "stockout_date", "reorder_quantity", "computed_at",
+            ],
+        )
+
+    return len(forecasts)
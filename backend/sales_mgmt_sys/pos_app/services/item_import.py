@@ -0,0 +1,252 @@
+# item_import.py
+import csv
+import io
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from pos_app.models.item import Item
+from pos_app.models.item_barcode import ItemBarcode
+from pos_app.services import outbox, pricelist, query_cache
+
+CHUNK_SIZE = getattr(settings, "ITEM_IMPORT_CHUNK_SIZE", 500)
+MAX_ERRORS = 1000
+FIELDS = ("item_name", "sku", "price", "quantity", "is_active")
+FORMATS = ("csv", "ndjson")
+BOOLEANS = {"true": True, "yes": True, "y": True, "1": True, "false": False, "no": False, "n": False, "0": False}
+
+
+class ItemImportError(Exception):
+    pass
+
+
+def detect_format(filename, content_type=""):
+    name = (filename or "").lower()
+    if name.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type or "jsonl" in content_type:
+        return "ndjson"
+    raise ItemImportError("Upload a .csv or .ndjson file.")
+
+
+def read_csv(binary):
+    """Yield ``(line_number, row)`` from a CSV file with a header row, one line at a time."""
+    reader = csv.DictReader(io.TextIOWrapper(binary, encoding="utf-8-sig", newline=""))
+    header = [column.strip() for column in reader.fieldnames or []]
+    if "item_name" not in header and "sku" not in header:
+        raise ItemImportError("The header must have an item_name or sku column.")
+    reader.fieldnames = header
+    for row in reader:
+        # Empty cells leave the stored value unchanged
+        yield reader.line_num, {column: value for column, value in row.items() if column in FIELDS and value not in (None, "")}
+
+
+def read_ndjson(binary):
+    """Yield ``(line_number, row)`` from newline-delimited JSON objects; unparseable lines yield ``None``."""
+    for number, line in enumerate(io.TextIOWrapper(binary, encoding="utf-8"), 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        if not isinstance(row, dict):
+            yield number, None
+            continue
+        yield number, {column: value for column, value in row.items() if column in FIELDS and value is not None}
+
+
+def clean(row):
+    """Validate a row with the model's own field rules; returns ``(values, errors)``."""
+    values, errors = {}, {}
+    for column, value in row.items():
+        if isinstance(value, str):
+            value = value.strip()
+            if column == "is_active":
+                value = BOOLEANS.get(value.lower(), value)
+        elif isinstance(value, float):
+            # JSON numbers: go through their repr so 1.1 stays 1.1 rather than the binary float
+            value = str(value)
+        try:
+            values[column] = Item._meta.get_field(column).clean(value, None)
+        except ValidationError as e:
+            errors[column] = e.messages
+    if values.get("sku") == "":
+        values["sku"] = None
+    if not row.get("item_name") and not row.get("sku"):
+        errors.setdefault("item_name", ["Each row needs an item_name or a sku."])
+    return values, errors
+
+
+class Importer:
+    """
+    Upsert items from parsed rows in chunks of ``chunk_size``.
+
+    Rows are matched on SKU when they have one and on item name otherwise.
+    Each chunk costs two lookups, one ``bulk_create``, one ``bulk_update``
+    per set of columns the rows change and one insert of ``stock.changed``
+    events no matter how many rows it holds.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.seen = {}                 # ("sku" | "item_name", value) -> row that claimed it
+        self.rows = self.created = self.updated = self.unchanged = 0
+        self.touched = []              # ids of the items created or updated, stamped by ``stamp``
+        self.errors = []
+        self.error_count = 0
+
+    def error(self, number, messages):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({"row": number, "errors": messages})
+
+    def run(self, rows):
+        chunk = []
+        for number, row in rows:
+            self.rows += 1
+            if row is None:
+                self.error(number, {"row": ["Not a JSON object."]})
+                continue
+            values, errors = clean(row)
+            if errors:
+                self.error(number, errors)
+                continue
+            chunk.append((number, values))
+            if len(chunk) >= self.chunk_size:
+                self.apply(chunk)
+                chunk = []
+        if chunk:
+            self.apply(chunk)
+
+    def duplicate(self, values):
+        """Reject a row that names the same SKU or item name as an earlier row of this import."""
+        for column in ("sku", "item_name"):
+            if values.get(column) and (column, values[column]) in self.seen:
+                return {column: [f"Already used by row {self.seen[column, values[column]]} of this import."]}
+        return None
+
+    def apply(self, chunk):
+        skus = {values["sku"] for _, values in chunk if values.get("sku")}
+        names = {values["item_name"] for _, values in chunk if values.get("item_name")}
+        existing = list(Item.objects.filter(Q(sku__in=skus) | Q(item_name__in=names)))
+        by_sku = {item.sku: item for item in existing if item.sku}
+        by_name = {item.item_name: item for item in existing}
+        barcodes = dict(ItemBarcode.objects.filter(code__in=skus).values_list("code", "item_id"))
+
+        now = timezone.now()
+        to_create, to_update, changed, deltas = [], {}, defaultdict(set), {}
+        for number, values in chunk:
+            sku, name = values.get("sku"), values.get("item_name")
+            item = by_sku.get(sku) if sku else None
+            if item is None and name:
+                item = by_name.get(name)
+                if item is not None and sku and item.sku:
+                    self.error(number, {"item_name": [f"Already used by the item with SKU {item.sku}."]})
+                    continue
+
+            errors = self.duplicate(values)
+            if errors is None and name and by_name.get(name, item) is not item:
+                errors = {"item_name": ["An item with this name already exists."]}
+            if errors is None and sku and barcodes.get(sku, getattr(item, "pk", None)) != getattr(item, "pk", None):
+                errors = {"sku": ["This code is already a barcode of another item."]}
+            if errors is None and item is None and ("item_name" not in values or "price" not in values):
+                errors = {"price": ["New items need an item_name and a price."]}
+            if errors:
+                self.error(number, errors)
+                continue
+            for column in ("sku", "item_name"):
+                if values.get(column):
+                    self.seen[column, values[column]] = number
+
+            if item is None:
+                values.setdefault("quantity", 0)
+                to_create.append(Item(**values, created_at=now))
+                continue
+
+            fields = {column for column, value in values.items() if getattr(item, column) != value}
+            if not fields:
+                self.unchanged += 1
+                continue
+            if "quantity" in fields:
+                deltas[item.pk] = values["quantity"] - item.quantity
+            for column in fields:
+                setattr(item, column, values[column])
+            to_update[item.pk] = item
+            changed[item.pk] |= fields
+
+        if to_create:
+            Item.objects.bulk_create(to_create, batch_size=self.chunk_size)
+        # Each row writes only the columns its entry changed: a price-only row must not write back
+        # the quantity read at the start of the chunk over a sale committed since
+        groups = defaultdict(list)
+        for pk, item in to_update.items():
+            groups[tuple(sorted(changed[pk]))].append(item)
+        for fields, items in groups.items():
+            Item.objects.bulk_update(items, list(fields), batch_size=self.chunk_size)
+        self.touched.extend(item.pk for item in to_create)
+        self.touched.extend(to_update)
+        # Stock set by the import is published like any other stock movement, in the import's transaction
+        deltas.update((item.pk, item.quantity) for item in to_create)
+        outbox.emit(outbox.stock_events(deltas))
+        self.created += len(to_create)
+        self.updated += len(to_update)
+
+    def stamp(self):
+        """
+        Set ``updated_at`` of every item written to now, just before the import
+        commits. Stamped chunk by chunk, the rows of a long import would carry
+        times a delta sync may already have read past when they become visible.
+        """
+        now = timezone.now()
+        for start in range(0, len(self.touched), self.chunk_size):
+            Item.objects.filter(pk__in=self.touched[start:start + self.chunk_size]).update(updated_at=now)
+
+    def result(self, dry_run=False, applied=True):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "error_count": self.error_count,
+            "errors": self.errors,
+            "dry_run": dry_run,
+            "applied": applied,
+        }
+
+
+def import_items(binary, fmt, dry_run=False, strict=False, chunk_size=CHUNK_SIZE):
+    """
+    Stream ``binary`` (CSV or NDJSON) into the catalog in one transaction.
+
+    Valid rows are applied and the rest reported per row; with ``strict``
+    any error rolls the whole import back, and ``dry_run`` always does.
+    Catalog caches are invalidated once per import, not once per row.
+    """
+    if fmt not in FORMATS:
+        raise ItemImportError(f"Unknown format {fmt!r}; use {' or '.join(FORMATS)}.")
+    rows = read_csv(binary) if fmt == "csv" else read_ndjson(binary)
+    importer = Importer(chunk_size)
+    with transaction.atomic():
+        try:
+            importer.run(rows)
+        except UnicodeDecodeError:
+            raise ItemImportError("The file is not UTF-8 encoded.")
+        except csv.Error as e:
+            raise ItemImportError(f"Malformed CSV: {e}")
+
+        applied = not dry_run and not (strict and importer.error_count)
+        if not applied:
+            transaction.set_rollback(True)
+        elif importer.created or importer.updated:
+            importer.stamp()
+            # Bulk writes send no signals; one bump makes every process rebuild its price list and search index
+            pricelist.bump_version()
+            transaction.on_commit(lambda: query_cache.bump(["items"]))
+    return importer.result(dry_run=dry_run, applied=applied)
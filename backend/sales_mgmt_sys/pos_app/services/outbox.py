@@ -0,0 +1,178 @@
+# outbox.py
+import json
+import os
+import urllib.error
+import urllib.request
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from pos_app.models.outbox_event import OutboxEvent
+from pos_app.models.sale import Sale
+
+BATCH_SIZE = getattr(settings, "OUTBOX_BATCH_SIZE", 200)
+MAX_ATTEMPTS = getattr(settings, "OUTBOX_MAX_ATTEMPTS", 10)
+# Retry after 2, 4, 8 ... seconds, at most RETRY_MAX apart
+RETRY_BASE = getattr(settings, "OUTBOX_RETRY_BASE", 2)
+RETRY_MAX = getattr(settings, "OUTBOX_RETRY_MAX", 15 * 60)
+RETAIN_DAYS = getattr(settings, "OUTBOX_RETAIN_DAYS", 7)
+SINKS = getattr(settings, "OUTBOX_SINKS", [
+    {"class": "pos_app.services.outbox.FileSink", "path": Path(settings.BASE_DIR) / "outbox" / "events.jsonl"},
+])
+
+
+class SinkError(Exception):
+    pass
+
+
+def emit(events):
+    """
+    Record ``events`` for the dispatcher in one INSERT. Call it inside the
+    transaction that makes the change, so the events exist exactly when the
+    change does.
+    """
+    OutboxEvent.objects.bulk_create(events, batch_size=500)
+
+
+def new_event(topic, key, payload):
+    return OutboxEvent(topic=topic, key=key, payload=payload)
+
+
+def sale_event(topic, sale, **payload):
+    """An event for ``sale`` (a Sale or a dict of its fields), keyed so each sale's events stay in order."""
+    fields = sale if isinstance(sale, dict) else {
+        "sale_id": sale.sale_id, "staff_id": sale.staff_id, "shift_id": sale.shift_id,
+        # A sale created in this request still holds its default, a datetime
+        "sale_date": Sale._meta.get_field("sale_date").to_python(sale.sale_date),
+        "total_amount": sale.total_amount,
+    }
+    return new_event(topic, f"sale:{fields['sale_id']}", {**fields, **payload})
+
+
+def stock_events(deltas):
+    """
+    Stock moved outside a sale record, e.g. a till decrementing stock on its
+    own or an item edited by hand: one event per item, keyed by the item so
+    a stuck event only holds back later changes of that item.
+    """
+    return [
+        new_event("stock.changed", f"stock:{item_id}", {"stock": stock_payload({item_id: delta})})
+        for item_id, delta in deltas.items() if delta
+    ]
+
+
+def stock_payload(deltas):
+    """``{item_id: delta}`` as a JSON object (whose keys are strings)."""
+    return {str(item_id): delta for item_id, delta in deltas.items()}
+
+
+def message(event):
+    return {
+        "event_id": event.event_id,
+        "topic": event.topic,
+        "key": event.key,
+        "created_at": event.created_at,
+        "payload": event.payload,
+    }
+
+
+class FileSink:
+    """Appends each batch to ``path`` as JSON lines and syncs the file before reporting success."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def send(self, events):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write("".join(json.dumps(message(event), cls=DjangoJSONEncoder) + "\n" for event in events))
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+class WebhookSink:
+    """POSTs each batch as ``{"events": [...]}`` to ``url``; any answer but 2xx fails the batch."""
+
+    def __init__(self, url, timeout=5, headers=None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def send(self, events):
+        body = json.dumps({"events": [message(event) for event in events]}, cls=DjangoJSONEncoder).encode()
+        request = urllib.request.Request(self.url, data=body, headers=self.headers, method="POST")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except (urllib.error.URLError, OSError) as e:
+            raise SinkError(f"{self.url}: {e}")
+
+
+def load_sinks(config=SINKS):
+    return [import_string(options["class"])(**{k: v for k, v in options.items() if k != "class"}) for options in config]
+
+
+def _backoff(attempts):
+    return timedelta(seconds=min(RETRY_BASE ** attempts, RETRY_MAX))
+
+
+def dispatch(sinks, batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS):
+    """
+    Deliver one batch of pending events to every sink, oldest first.
+
+    Delivery is at least once: a batch is only marked sent after every sink
+    took it, so a failure resends it to sinks that already had it and
+    consumers should skip event ids they have seen. A failed batch is retried
+    with exponential backoff and parked as dead after ``max_attempts``.
+    While an event of a key waits for a retry or is dead, later events of
+    that key are held back, so each sale's (or item's) events arrive in order.
+    Returns counts of the events sent, failed and held back.
+    """
+    now = timezone.now()
+    pending = OutboxEvent.objects.filter(status=OutboxEvent.PENDING)
+    # Keys with a dead event or one waiting out its backoff are skipped in the query, so a
+    # stuck key never fills the batch; the events of every other key keep flowing
+    blocked = Q(key__in=OutboxEvent.objects.filter(status=OutboxEvent.DEAD).values("key")) | Q(
+        key__in=pending.filter(next_attempt_at__gt=now).values("key")
+    )
+    batch = list(pending.exclude(blocked).order_by("event_id")[:batch_size])
+    held = pending.filter(blocked).count()
+    if not batch:
+        return {"sent": 0, "failed": 0, "held": held}
+
+    try:
+        for sink in sinks:
+            sink.send(batch)
+    except Exception as e:
+        for event in batch:
+            event.attempts += 1
+            event.last_error = f"{type(e).__name__}: {e}"[:1000]
+            if event.attempts >= max_attempts:
+                event.status = OutboxEvent.DEAD
+            else:
+                event.next_attempt_at = now + _backoff(event.attempts)
+        OutboxEvent.objects.bulk_update(batch, ["attempts", "last_error", "status", "next_attempt_at"], batch_size=500)
+        return {"sent": 0, "failed": len(batch), "held": held}
+
+    OutboxEvent.objects.filter(event_id__in=[event.event_id for event in batch]).update(
+        status=OutboxEvent.SENT, sent_at=timezone.now(), last_error="",
+    )
+    return {"sent": len(batch), "failed": 0, "held": held}
+
+
+def requeue_dead():
+    """Give dead events a fresh set of attempts, e.g. once a broken sink is fixed."""
+    return OutboxEvent.objects.filter(status=OutboxEvent.DEAD).update(
+        status=OutboxEvent.PENDING, attempts=0, next_attempt_at=None,
+    )
+
+
+def purge(days=RETAIN_DAYS):
+    """Delete events sent more than ``days`` ago."""
+    cutoff = timezone.now() - timedelta(days=days)
+    return OutboxEvent.objects.filter(status=OutboxEvent.SENT, sent_at__lt=cutoff).delete()[0]
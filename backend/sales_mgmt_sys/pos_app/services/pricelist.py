@@ -0,0 +1,77 @@
+# pricelist.py
+import threading
+from collections import namedtuple
+
+from pos_app.models.item import Item
+from pos_app.models.item_barcode import ItemBarcode
+from pos_app.services import versions
+
+VERSION_NAME = "catalog"
+
+PriceEntry = namedtuple("PriceEntry", ["price", "is_active", "item_name"])
+
+
+class PriceList:
+    """Immutable snapshot of every item's price, active flag and scan codes, tagged with the catalog version."""
+    __slots__ = ("version", "entries", "codes", "barcodes")
+
+    def __init__(self, version, entries, codes=None, barcodes=None):
+        self.version = version
+        self.entries = entries
+        self.codes = codes or {}
+        self.barcodes = barcodes or {}
+
+    def get(self, item_id):
+        return self.entries.get(item_id)
+
+    def lookup(self, code):
+        """Return the item_id a SKU or barcode belongs to, or None."""
+        return self.codes.get(code)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def current_version(max_age=versions.CHECK_INTERVAL):
+    return versions.current(VERSION_NAME, max_age)
+
+
+def bump_version():
+    """
+    Mark the catalog as changed, inside the transaction that changes it; every
+    process rebuilds its snapshot once it sees the new version (within
+    CACHE_VERSION_CHECK_INTERVAL of the commit).
+    """
+    return versions.bump(VERSION_NAME)
+
+
+def build(version):
+    rows = Item.objects.values_list("item_id", "price", "is_active", "item_name", "sku")
+    entries, codes = {}, {}
+    for item_id, price, active, name, sku in rows:
+        entries[item_id] = PriceEntry(price, active, name)
+        if sku:
+            codes[sku] = item_id
+    barcodes = {}
+    for code, item_id in ItemBarcode.objects.order_by("barcode_id").values_list("code", "item_id"):
+        codes[code] = item_id
+        barcodes.setdefault(item_id, []).append(code)
+    return PriceList(version, entries, codes, barcodes)
+
+
+def get_price_list():
+    """Return the current snapshot, rebuilding it with a single query when the catalog version moved."""
+    global _snapshot
+    version = current_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _lock:
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = build(version)
+        return _snapshot
@@ -0,0 +1,275 @@
+# pricing.py
+import threading
+from collections import defaultdict, namedtuple
+from decimal import ROUND_HALF_UP, Decimal
+from itertools import chain
+
+from django.utils import timezone
+
+from pos_app.models.pricing_rule import PromotionItem, PromotionRule, TaxRule
+from pos_app.services import versions
+
+VERSION_NAME = "pricing"
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+HUNDRED = Decimal(100)
+DAY_MINUTES = 24 * 60
+
+Window = namedtuple("Window", ["starts_at", "ends_at", "weekdays", "start_minute", "end_minute"])
+Promotion = namedtuple("Promotion", ["rule_id", "kind", "value", "window"])
+Combo = namedtuple("Combo", ["rule_id", "price", "needs", "window"])
+PricedLine = namedtuple("PricedLine", ["item_id", "quantity", "unit_price", "discount", "tax", "subtotal", "promotions"])
+Quote = namedtuple("Quote", ["lines", "total", "discount", "tax"])
+
+
+class PricingTable:
+    """
+    Promotion and tax rules compiled into lookups keyed by item, tagged with
+    the rules version. Never mutated: a rule change builds a new table.
+    """
+    __slots__ = ("version", "promotions", "general", "combos", "tax_rates", "default_tax_rate", "names")
+
+    def __init__(self, version, promotions=None, general=(), combos=None, tax_rates=None, default_tax_rate=ZERO, names=None):
+        self.version = version
+        # item_id -> promotions on that item; general ones cover every item
+        self.promotions = promotions or {}
+        self.general = general
+        # item_id -> combos the item is part of
+        self.combos = combos or {}
+        # item_id -> total tax rate in percent, for items with rates of their own
+        self.tax_rates = tax_rates or {}
+        self.default_tax_rate = default_tax_rate
+        self.names = names or {}
+
+
+_table = None
+_lock = threading.Lock()
+
+
+def current_version():
+    return versions.current(VERSION_NAME)
+
+
+def bump_version():
+    """
+    Mark the rules as changed, inside the transaction that changes them; every
+    process rebuilds its table once it sees the new version.
+    """
+    return versions.bump(VERSION_NAME)
+
+
+def _minute(value):
+    return value.hour * 60 + value.minute if value is not None else None
+
+
+def _window(rule):
+    start_minute, end_minute = _minute(rule["start_time"]), _minute(rule["end_time"])
+    if start_minute is not None and end_minute is None:
+        end_minute = DAY_MINUTES
+    elif end_minute is not None and start_minute is None:
+        start_minute = 0
+    return Window(
+        rule["starts_at"] or rule["created_at"],
+        rule["ends_at"],
+        frozenset(int(day) for day in rule["weekdays"] if day in "1234567") or None,
+        start_minute,
+        end_minute,
+    )
+
+
+def compile_rules(version, promotions, promotion_items, taxes, tax_items):
+    """
+    Build a PricingTable from rule rows: promotion dicts (PromotionRule
+    fields), ``(promotion_id, item_id, quantity)``, ``(rule_id, rate,
+    applies_to_all)`` and ``(tax_rule_id, item_id)`` tuples.
+    """
+    members = defaultdict(list)
+    for promotion_id, item_id, quantity in promotion_items:
+        members[promotion_id].append((item_id, quantity))
+
+    by_item, general, combos, names = defaultdict(list), [], defaultdict(list), {}
+    for rule in promotions:
+        names[rule["rule_id"]] = rule["name"]
+        window = _window(rule)
+        if rule["kind"] == PromotionRule.COMBO:
+            needs = tuple(sorted(members.get(rule["rule_id"], ())))
+            if not needs:
+                continue
+            combo = Combo(rule["rule_id"], rule["value"], needs, window)
+            for item_id, _ in needs:
+                combos[item_id].append(combo)
+            continue
+        promotion = Promotion(rule["rule_id"], rule["kind"], rule["value"], window)
+        if rule["applies_to_all"]:
+            general.append(promotion)
+        for item_id, _ in members.get(rule["rule_id"], ()):
+            by_item[item_id].append(promotion)
+
+    default_rate, rates = ZERO, defaultdict(lambda: ZERO)
+    general_taxes = set()
+    for rule_id, rate, applies_to_all in taxes:
+        if applies_to_all:
+            default_rate += rate
+            general_taxes.add(rule_id)
+    rate_of = {rule_id: rate for rule_id, rate, _ in taxes}
+    for rule_id, item_id in tax_items:
+        # A rule that covers every item already counts in the default rate
+        if rule_id in rate_of and rule_id not in general_taxes:
+            rates[item_id] += rate_of[rule_id]
+
+    return PricingTable(
+        version,
+        promotions={item_id: tuple(rules) for item_id, rules in by_item.items()},
+        general=tuple(general),
+        combos={item_id: tuple(rules) for item_id, rules in combos.items()},
+        tax_rates={item_id: rate + default_rate for item_id, rate in rates.items()},
+        default_tax_rate=default_rate,
+        names=names,
+    )
+
+
+def build(version):
+    promotions = PromotionRule.objects.filter(is_active=True).values(
+        "rule_id", "name", "kind", "value", "applies_to_all", "starts_at", "ends_at", "weekdays", "start_time", "end_time", "created_at",
+    )
+    promotion_items = PromotionItem.objects.filter(promotion__is_active=True).values_list("promotion_id", "item_id", "quantity")
+    taxes = TaxRule.objects.filter(is_active=True).values_list("rule_id", "rate", "applies_to_all")
+    tax_items = TaxRule.items.through.objects.filter(taxrule__is_active=True).values_list("taxrule_id", "item_id")
+    return compile_rules(version, list(promotions), promotion_items, list(taxes), tax_items)
+
+
+def get_table():
+    """Return the current rules table, rebuilding it with four queries when the rules version moved."""
+    global _table
+    version = current_version()
+    table = _table
+    if table is not None and table.version == version:
+        return table
+
+    with _lock:
+        if _table is None or _table.version != version:
+            # Built aside and swapped in with one assignment: a basket sees the old rules or the new, never a mix
+            _table = build(version)
+        return _table
+
+
+def _in_window(window, at, weekday, minute):
+    if at < window.starts_at or (window.ends_at is not None and at >= window.ends_at):
+        return False
+    if window.weekdays is not None and weekday not in window.weekdays:
+        return False
+    if window.start_minute is None:
+        return True
+    if window.start_minute <= window.end_minute:
+        return window.start_minute <= minute < window.end_minute
+    return minute >= window.start_minute or minute < window.end_minute
+
+
+def _apply_combos(combos, units, prices, is_active):
+    """
+    Fit the active combos into the basket, best saving first. Returns the
+    units each item gives to combos, the discount that earns it and the
+    combos it took part in.
+    """
+    candidates = []
+    for combo in combos.values():
+        if not is_active(combo) or any(units[item_id] < quantity for item_id, quantity in combo.needs):
+            continue
+        full = sum(prices[item_id] * quantity for item_id, quantity in combo.needs)
+        if full > combo.price:
+            candidates.append((full - combo.price, combo.rule_id, combo, full))
+    candidates.sort(key=lambda candidate: (-candidate[0], candidate[1]))
+
+    left = dict(units)
+    taken, discount, applied = defaultdict(int), defaultdict(lambda: ZERO), defaultdict(list)
+    for saving, rule_id, combo, full in candidates:
+        times = min(left[item_id] // quantity for item_id, quantity in combo.needs)
+        if not times:
+            continue
+        # Spread the saving over the combo's items by their value; the last takes the rounding
+        total, spread = saving * times, ZERO
+        for n, (item_id, quantity) in enumerate(combo.needs):
+            share = total - spread if n == len(combo.needs) - 1 else (total * prices[item_id] * quantity / full).quantize(CENT)
+            spread += share
+            left[item_id] -= quantity * times
+            taken[item_id] += quantity * times
+            discount[item_id] += share
+            applied[item_id].append(rule_id)
+    return taken, discount, applied
+
+
+def _best_promotion(promotions, unit_price, quantity, is_active):
+    best, best_rule = ZERO, None
+    for promotion in promotions:
+        if not is_active(promotion):
+            continue
+        if promotion.kind == PromotionRule.PERCENT_OFF:
+            off = (unit_price * quantity * min(promotion.value, HUNDRED) / HUNDRED).quantize(CENT, ROUND_HALF_UP)
+        elif promotion.kind == PromotionRule.AMOUNT_OFF:
+            off = min(promotion.value, unit_price) * quantity
+        else:
+            off = max(unit_price - promotion.value, ZERO) * quantity
+        if off > best:
+            best, best_rule = off, promotion.rule_id
+    return best, best_rule
+
+
+def quote(lines, at=None, table=None):
+    """
+    Price ``(item_id, quantity, unit_price)`` lines as sold at ``at`` (default now).
+
+    Combos are fitted first, best saving first; units they do not use get
+    the single best per-unit promotion running at that time. Tax is the
+    share of what is left that the item's rates account for, since shelf
+    prices include tax. The basket is walked once to total units per item
+    and once to price the lines, using only the compiled table.
+    """
+    table = table or get_table()
+    at = at or timezone.now()
+    local = timezone.localtime(at)
+    weekday, minute = local.isoweekday(), local.hour * 60 + local.minute
+    active = {}
+
+    def is_active(rule):
+        result = active.get(rule.rule_id)
+        if result is None:
+            result = active[rule.rule_id] = _in_window(rule.window, at, weekday, minute)
+        return result
+
+    units, prices, combos = defaultdict(int), {}, {}
+    for item_id, quantity, unit_price in lines:
+        units[item_id] += quantity
+        prices.setdefault(item_id, unit_price)
+        for combo in table.combos.get(item_id, ()):
+            combos[combo.rule_id] = combo
+    taken, combo_discount, applied = _apply_combos(combos, units, prices, is_active) if combos else ({}, {}, {})
+
+    priced = []
+    total = discount_total = tax_total = ZERO
+    for item_id, quantity, unit_price in lines:
+        discount, rules = ZERO, []
+        in_combos = min(quantity, taken.get(item_id, 0))
+        if in_combos:
+            # Lines of the same item share its combo discount by units, in order
+            left = taken[item_id]
+            discount = combo_discount[item_id] if in_combos == left else (combo_discount[item_id] * in_combos / left).quantize(CENT)
+            taken[item_id] -= in_combos
+            combo_discount[item_id] -= discount
+            rules += applied[item_id]
+        if quantity > in_combos:
+            off, rule_id = _best_promotion(
+                chain(table.promotions.get(item_id, ()), table.general), unit_price, quantity - in_combos, is_active,
+            )
+            if rule_id is not None:
+                discount += off
+                rules.append(rule_id)
+
+        subtotal = unit_price * quantity - discount
+        rate = table.tax_rates.get(item_id, table.default_tax_rate)
+        tax = (subtotal * rate / (HUNDRED + rate)).quantize(CENT, ROUND_HALF_UP) if rate else ZERO
+        priced.append(PricedLine(item_id, quantity, unit_price, discount, tax, subtotal, tuple(rules)))
+        total += subtotal
+        discount_total += discount
+        tax_total += tax
+    return Quote(priced, total, discount_total, tax_total)
@@ -0,0 +1,94 @@
+# query_cache.py
+# Kept free of heavy imports: signal handlers load this at startup.
+import hashlib
+import time
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from pos_app import db_router
+
+CACHE_ALIAS = getattr(settings, "QUERY_CACHE_ALIAS", "default")
+CACHE_TIMEOUT = getattr(settings, "QUERY_CACHE_TIMEOUT", 60 * 60)
+CACHE_PREFIX = "query"
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _tag_key(tag):
+    return f"{CACHE_PREFIX}:tag:{tag}"
+
+
+def month_tag(day):
+    """The bucket a sale on ``day`` falls into: writes only invalidate reports covering that month."""
+    # Unsaved instances may still hold the ``timezone.now`` default
+    if isinstance(day, datetime):
+        day = day.date()
+    return f"sales:{day:%Y-%m}"
+
+
+def month_tags(start, end):
+    """Month buckets overlapping ``start``..``end``."""
+    tags, year, month = [], start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        tags.append(month_tag(date(year, month, 1)))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return tags
+
+
+def staff_tag(staff_id):
+    return f"staff:{staff_id}"
+
+
+def tag_versions(tags):
+    """
+    Current version of each tag.
+
+    Versions are timestamps rather than counters so a tag evicted from the
+    cache comes back with a value no earlier entry was stored under.
+    """
+    cache = _cache()
+    keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many(list(keys))
+    for key in keys.keys() - found.keys():
+        found[key] = cache.get_or_set(key, time.time_ns, None)
+    return [found[key] for key in sorted(keys)]
+
+
+def cached(name, tags, compute, timeout=CACHE_TIMEOUT, **params):
+    """
+    Return ``compute(**params)``, cached until any of ``tags`` is invalidated.
+
+    The tag versions are part of the key, so invalidating a tag just moves
+    readers on to a new key and stale entries expire on their own. Versions
+    are read before computing: a result computed while a write commits is
+    stored under the old versions, where no later read will find it.
+    Results read from the replica are also keyed by its snapshot, since a
+    copy taken before a write would otherwise be cached under the new versions.
+    """
+    tags = sorted(set(tags))
+    signature = repr((sorted(params.items()), tags, tag_versions(tags), db_router.snapshot()))
+    key = f"{CACHE_PREFIX}:{name}:{hashlib.sha1(signature.encode()).hexdigest()}"
+
+    cache = _cache()
+    result = cache.get(key)
+    if result is None:
+        result = compute(**params)
+        cache.set(key, result, timeout)
+    return result
+
+
+def bump(tags):
+    version = time.time_ns()
+    _cache().set_many({_tag_key(tag): version for tag in set(tags)}, None)
+
+
+def invalidate(tags):
+    """Invalidate ``tags`` once the current transaction commits, so no reader caches uncommitted rows."""
+    tags = {tag for tag in tags if tag}
+    if tags:
+        transaction.on_commit(lambda: bump(tags))
@@ -0,0 +1,302 @@
+# receipts.py
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.html import escape
+
+from pos_app.models.sale import Sale
+
+logger = logging.getLogger(__name__)
+
+SHOP_NAME = getattr(settings, "RECEIPT_SHOP_NAME", "Kali Coffee")
+WORKERS = getattr(settings, "RECEIPT_WORKERS", 2)
+QUEUE_SIZE = getattr(settings, "RECEIPT_QUEUE_SIZE", 64)
+CACHE_TIMEOUT = getattr(settings, "RECEIPT_CACHE_TIMEOUT", 24 * 60 * 60)
+RENDER_TIMEOUT = getattr(settings, "RECEIPT_RENDER_TIMEOUT", 10)
+RENDER_WORKERS = getattr(settings, "RECEIPT_RENDER_WORKERS", 2)
+
+FORMATS = {
+    "text": "text/plain; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+    "pdf": "application/pdf",
+}
+WIDTH = 40
+
+# Background work (prerenders, emails) and renders a request waits on get pools of their own,
+# so a backlog of background work never holds up a receipt being printed
+_executors = {}
+_executor_lock = threading.Lock()
+# Bounds the number of queued background renders; extra work is dropped, not queued
+_slots = threading.BoundedSemaphore(QUEUE_SIZE)
+
+
+class RenderTimeout(Exception):
+    pass
+
+
+def _get_executor(name="background"):
+    executor = _executors.get(name)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                workers = WORKERS if name == "background" else RENDER_WORKERS
+                executor = _executors[name] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"receipt-{name}")
+    return executor
+
+
+def _map(func, items):
+    """Render ``items`` in parallel for a waiting request, giving up after RENDER_TIMEOUT."""
+    try:
+        return list(_get_executor("interactive").map(func, items, timeout=RENDER_TIMEOUT))
+    except TimeoutError:
+        raise RenderTimeout(f"Rendering {len(items)} receipts took longer than {RENDER_TIMEOUT} s")
+
+
+def _run_in_worker(func, *args):
+    """Wrap ``func`` so worker threads never leak database connections."""
+    def task():
+        close_old_connections()
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+    return task
+
+
+def cache_key(sale_id, updated_at, fmt):
+    return f"receipt:{sale_id}:{updated_at.timestamp()}:{fmt}"
+
+
+def load_receipts(sale_ids):
+    """Fetch everything needed to render receipts for ``sale_ids`` in two queries."""
+    sales = (
+        Sale.objects.filter(sale_id__in=sale_ids)
+        .select_related("staff")
+        .prefetch_related("sale_items__item")
+        .order_by("sale_id")
+    )
+    receipts = []
+    for sale in sales:
+        lines = []
+        for line in sale.sale_items.all():
+            lines.append({
+                "item_name": line.item.item_name,
+                "quantity": line.quantity,
+                "unit_price": line.unit_price,
+                "discount": line.discount,
+                "tax": line.tax,
+                "subtotal": line.subtotal,
+            })
+        receipts.append({
+            "sale_id": sale.sale_id,
+            "sale_date": sale.sale_date,
+            "created_at": timezone.localtime(sale.created_at),
+            "updated_at": sale.updated_at,
+            "staff": f"{sale.staff.first_name} {sale.staff.last_name}".strip(),
+            "staff_username": sale.staff.username,
+            "lines": lines,
+            "total_amount": sale.total_amount,
+            "tax": sum((line["tax"] for line in lines), Decimal("0.00")),
+        })
+    return receipts
+
+
+def _text_lines(receipt):
+    rule = "-" * WIDTH
+    out = [
+        SHOP_NAME.center(WIDTH),
+        f"Receipt #{receipt['sale_id']}",
+        f"{receipt['created_at']:%Y-%m-%d %H:%M}".ljust(WIDTH - 20) + f"Staff: {receipt['staff_username']}"[:20].rjust(20),
+        rule,
+    ]
+    for line in receipt["lines"]:
+        amount = f"{line['quantity']} x {line['unit_price']}  {line['subtotal']:>8}"
+        name = line["item_name"][: WIDTH - len(amount) - 1]
+        out.append(name.ljust(WIDTH - len(amount)) + amount)
+        if line["discount"]:
+            out.append("  Discount".ljust(WIDTH - 12) + f"{-line['discount']:>12}")
+    out += [rule, "TOTAL".ljust(WIDTH - 12) + f"{receipt['total_amount']:>12}"]
+    if receipt["tax"]:
+        out.append("Incl. tax".ljust(WIDTH - 12) + f"{receipt['tax']:>12}")
+    out += ["", "Thank you!".center(WIDTH)]
+    return out
+
+
+def render_text(receipt):
+    return "\n".join(_text_lines(receipt)) + "\n"
+
+
+def _html_section(receipt):
+    rows = "".join(
+        f"<tr><td>{escape(line['item_name'])}</td><td>{line['quantity']}</td>"
+        f"<td>{line['unit_price']}</td><td>{line['subtotal']}</td></tr>"
+        + (f"<tr><td colspan=\"3\">Discount</td><td>{-line['discount']}</td></tr>" if line["discount"] else "")
+        for line in receipt["lines"]
+    )
+    return (
+        f"<section class=\"receipt\"><h1>{escape(SHOP_NAME)}</h1>"
+        f"<p>Receipt #{receipt['sale_id']}<br>{receipt['created_at']:%Y-%m-%d %H:%M}<br>"
+        f"Served by {escape(receipt['staff'] or receipt['staff_username'])}</p>"
+        f"<table><thead><tr><th>Item</th><th>Qty</th><th>Price</th><th>Subtotal</th></tr></thead>"
+        f"<tbody>{rows}</tbody>"
+        f"<tfoot><tr><th colspan=\"3\">Total</th><th>{receipt['total_amount']}</th></tr>"
+        + (f"<tr><td colspan=\"3\">Incl. tax</td><td>{receipt['tax']}</td></tr>" if receipt["tax"] else "")
+        + "</tfoot></table>"
+        f"</section>"
+    )
+
+
+def _html_page(title, sections):
+    return (
+        f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{escape(title)}</title>"
+        f"<style>.receipt {{ page-break-after: always; }}</style></head>"
+        f"<body>{''.join(sections)}</body></html>"
+    )
+
+
+def render_html(receipt):
+    return _html_page(f"Receipt #{receipt['sale_id']}", [_html_section(receipt)])
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1", "replace")
+
+
+def build_pdf(pages):
+    """Build a minimal PDF with one receipt-width page per list of text lines."""
+    page_count = len(pages)
+    # 1: catalog, 2: page tree, 3: font, then a page and a content stream per page
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(page_count))
+        + b"] /Count %d >>" % page_count,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>",
+    ]
+    for i, lines in enumerate(pages):
+        height = 40 + 11 * len(lines)
+        stream = b"BT /F1 9 Tf 11 TL 12 %d Td " % (height - 24)
+        stream += b"".join(b"(" + _pdf_escape(line) + b") ' " for line in lines) + b"ET"
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 226 %d] " % height
+            + b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def render_pdf(receipt):
+    return build_pdf([_text_lines(receipt)])
+
+
+RENDERERS = {"text": render_text, "html": render_html, "pdf": render_pdf}
+
+
+def _render_and_cache(receipt, fmt):
+    rendered = RENDERERS[fmt](receipt)
+    cache.set(cache_key(receipt["sale_id"], receipt["updated_at"], fmt), rendered, CACHE_TIMEOUT)
+    return rendered
+
+
+def get_receipt(sale, fmt):
+    """Return the rendered receipt for ``sale``, rendering it in the request on a cache miss."""
+    rendered = cache.get(cache_key(sale.sale_id, sale.updated_at, fmt))
+    if rendered is not None:
+        return rendered
+
+    return _render_and_cache(load_receipts([sale.sale_id])[0], fmt)
+
+
+def render_batch(sale_ids, fmt):
+    """
+    Render many receipts at once: one load, one cache lookup, misses rendered
+    in parallel. Raises RenderTimeout when that takes over RENDER_TIMEOUT.
+    """
+    receipts = load_receipts(sale_ids)
+    keys = {cache_key(r["sale_id"], r["updated_at"], fmt): r for r in receipts}
+    cached = cache.get_many(list(keys))
+
+    missing = [key for key in keys if key not in cached]
+    rendered = _map(RENDERERS[fmt], [keys[key] for key in missing])
+    fresh = dict(zip(missing, rendered))
+    cache.set_many(fresh, CACHE_TIMEOUT)
+    cached.update(fresh)
+
+    return [(receipt, cached[key]) for key, receipt in keys.items()]
+
+
+def reprint_day(day, fmt):
+    """Render every receipt for ``day`` as a single printable document."""
+    sale_ids = list(Sale.objects.filter(sale_date=day, is_void=False).values_list("sale_id", flat=True))
+    if fmt == "text":
+        return "\f".join(rendered for _, rendered in render_batch(sale_ids, fmt))
+
+    receipts = load_receipts(sale_ids)
+    if fmt == "html":
+        return _html_page(f"Receipts {day}", _map(_html_section, receipts))
+    return build_pdf([_text_lines(receipt) for receipt in receipts])
+
+
+def _submit_background(func, *args):
+    """Queue ``func`` on the pool without ever blocking the caller."""
+    if not _slots.acquire(blocking=False):
+        logger.warning("Receipt queue full, skipping %s%r", func.__name__, args)
+        return False
+
+    future = _get_executor().submit(_run_in_worker(func, *args))
+    future.add_done_callback(lambda f: _slots.release())
+    future.add_done_callback(_log_failure)
+    return True
+
+
+def _log_failure(future):
+    if future.exception() is not None:
+        logger.error("Background receipt task failed: %s", future.exception())
+
+
+def _prerender(sale_id):
+    for receipt in load_receipts([sale_id]):
+        for fmt in ("text", "html"):
+            _render_and_cache(receipt, fmt)
+
+
+def prerender(sale_id):
+    """Warm the receipt cache for a freshly committed sale in the background."""
+    if getattr(settings, "RECEIPT_PRERENDER", True):
+        _submit_background(_prerender, sale_id)
+
+
+def _email(sale_id, recipient):
+    receipts = load_receipts([sale_id])
+    if not receipts:
+        return
+    receipt = receipts[0]
+    message = EmailMultiAlternatives(
+        subject=f"{SHOP_NAME} receipt #{sale_id}",
+        body=render_text(receipt),
+        to=[recipient],
+    )
+    message.attach_alternative(render_html(receipt), "text/html")
+    message.send()
+
+
+def email_receipt(sale_id, recipient):
+    """Send a receipt by email from the worker pool. Returns False if the queue is full."""
+    return _submit_background(_email, sale_id, recipient)
@@ -0,0 +1,25 @@
+# replica.py
+from pos_app.db_router import replica_path
+from pos_app.services import backups
+
+
+class ReplicaError(Exception):
+    pass
+
+
+def refresh(target=None, pages=backups.STEP_PAGES, sleep=backups.STEP_SLEEP):
+    """
+    Copy the primary SQLite database to ``target`` with SQLite's online backup API.
+
+    The copy is written next to the target and moved over it in one rename,
+    so readers see either the old snapshot or the new one and connections
+    already open keep the file they started with. Writers are only held up
+    for one step of ``pages`` at a time (see ``backups.online_copy``).
+    """
+    target = target or replica_path()
+    if not target:
+        raise ReplicaError("REPLICA_PATH is not set.")
+    try:
+        return backups.online_copy(backups.primary_path(), target, pages=pages, sleep=sleep)
+    except backups.BackupError as e:
+        raise ReplicaError(str(e))
@@ -0,0 +1,129 @@
+# returns.py
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Q, Value, When
+
+from pos_app.models.return_rollup import ReturnRollup
+from pos_app.models.sale_item import SaleItem
+from pos_app.models.sale_return import SaleReturn, SaleReturnLine
+from pos_app.services import outbox, stock
+
+
+class ReturnError(Exception):
+    pass
+
+
+def _claim(quantities):
+    """
+    Mark ``{sale_item_id: quantity}`` as returned in one conditional UPDATE.
+
+    A line only matches while it still has that many unreturned units, so two
+    cashiers refunding the same line at once cannot both succeed.
+    """
+    condition = Q()
+    for sale_item_id, quantity in quantities.items():
+        condition |= Q(sale_item_id=sale_item_id, returned_quantity__lte=F("quantity") - quantity)
+    claimed = SaleItem.objects.filter(condition).update(
+        returned_quantity=F("returned_quantity")
+        + Case(*[When(sale_item_id=sale_item_id, then=Value(q)) for sale_item_id, q in quantities.items()])
+    )
+    if claimed != len(quantities):
+        raise ReturnError("Some of these units have already been returned.")
+
+
+def _add_to_rollup(day, items, refund):
+    totals = dict(return_count=F("return_count") + 1, item_count=F("item_count") + items, refund_amount=F("refund_amount") + refund)
+    if ReturnRollup.objects.filter(day=day).update(**totals):
+        return
+    try:
+        with transaction.atomic():
+            ReturnRollup.objects.create(day=day, return_count=1, item_count=items, refund_amount=refund)
+    except IntegrityError:
+        # Another return created today's row first
+        ReturnRollup.objects.filter(day=day).update(**totals)
+
+
+def _refund(line, quantity):
+    """
+    What ``quantity`` more units of ``line`` paid, discounts included. Taken as
+    the difference of two rounded shares, so refunding a line piecemeal adds
+    up to exactly its subtotal.
+    """
+    def paid(units):
+        return (line.subtotal * units / line.quantity).quantize(Decimal("0.01"), ROUND_HALF_UP)
+
+    return paid(line.returned_quantity + quantity) - paid(line.returned_quantity)
+
+
+@transaction.atomic
+def process_return(sale, quantities, staff=None, reason=""):
+    """
+    Return ``{sale_item_id: quantity}`` units of ``sale`` (everything left when None).
+
+    Lines are refunded at what they were sold for after discounts, their
+    stock goes back in one batched update and the day's returns rollup is
+    bumped, all in the same transaction as the return record.
+    """
+    lines = {line.sale_item_id: line for line in sale.sale_items.all()}
+    if quantities is not None and not quantities:
+        # An empty selection is a client mistake, never a request to refund everything
+        raise ReturnError("Choose at least one line to return.")
+    if quantities is None:
+        quantities = {line_id: line.quantity - line.returned_quantity for line_id, line in lines.items()
+                      if line.quantity > line.returned_quantity}
+        if not quantities:
+            raise ReturnError("Everything on this sale has already been returned.")
+
+    for sale_item_id, quantity in quantities.items():
+        line = lines.get(sale_item_id)
+        if line is None:
+            raise ReturnError(f"Line {sale_item_id} is not part of sale {sale.sale_id}.")
+        if quantity > line.quantity - line.returned_quantity:
+            raise ReturnError(
+                f"Only {line.quantity - line.returned_quantity} of line {sale_item_id} can still be returned."
+            )
+
+    _claim(quantities)
+
+    sale_return = SaleReturn.objects.create(sale=sale, staff=staff, reason=reason)
+    return_lines = []
+    for sale_item_id, quantity in quantities.items():
+        line = lines[sale_item_id]
+        return_lines.append(SaleReturnLine(
+            sale_return=sale_return,
+            sale_item_id=sale_item_id,
+            item_id=line.item_id,
+            quantity=quantity,
+            unit_price=line.unit_price,
+            refund_amount=_refund(line, quantity),
+        ))
+    SaleReturnLine.objects.bulk_create(return_lines)
+
+    sale_return.refund_amount = sum((line.refund_amount for line in return_lines), Decimal("0.00"))
+    sale_return.save(update_fields=["refund_amount"])
+
+    restock = stock.combine((line.item_id, line.quantity) for line in return_lines)
+    stock.apply_deltas(restock)
+    _add_to_rollup(sale_return.return_date, sum(quantities.values()), sale_return.refund_amount)
+    outbox.emit([outbox.sale_event(
+        "sale.returned", sale, return_id=sale_return.return_id, refund_amount=sale_return.refund_amount,
+        stock=outbox.stock_payload(restock),
+    )])
+    return sale_return
+
+
+def report(start=None, end=None):
+    """Returns per day and overall, read from the daily rollup rather than the return records."""
+    days = ReturnRollup.objects.order_by("day")
+    if start:
+        days = days.filter(day__gte=start)
+    if end:
+        days = days.filter(day__lte=end)
+    rows = list(days.values("day", "return_count", "item_count", "refund_amount"))
+    return {
+        "days": [dict(row, refund_amount=str(row["refund_amount"])) for row in rows],
+        "return_count": sum(row["return_count"] for row in rows),
+        "item_count": sum(row["item_count"] for row in rows),
+        "refund_amount": str(sum((row["refund_amount"] for row in rows), Decimal("0.00"))),
+    }
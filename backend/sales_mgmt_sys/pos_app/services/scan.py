@@ -0,0 +1,47 @@
+# scan.py
+from pos_app.models.item import Item
+from pos_app.models.item_barcode import ItemBarcode
+from pos_app.services.pricelist import get_price_list
+
+
+def _lookup_db(codes):
+    """Resolve codes the snapshot does not know yet, e.g. a barcode added moments ago elsewhere."""
+    found = dict(Item.objects.filter(sku__in=codes).values_list("sku", "item_id"))
+    found.update(ItemBarcode.objects.filter(code__in=codes).values_list("code", "item_id"))
+    return found
+
+
+def resolve(codes):
+    """
+    Map each scanned code to ``{item_id, item_name, price, quantity, is_active}``, or None if unknown.
+
+    Codes are resolved through the in-memory price list and only the misses
+    go to the database. Stock changes with every sale, so it is always read
+    fresh, in one query for the whole batch.
+    """
+    price_list = get_price_list()
+    item_ids = {}
+    for code in codes:
+        item_id = price_list.lookup(code)
+        if item_id is not None:
+            item_ids[code] = item_id
+
+    missing = [code for code in codes if code not in item_ids]
+    if missing:
+        item_ids.update(_lookup_db(missing))
+
+    rows = Item.objects.filter(item_id__in=set(item_ids.values())).values_list(
+        "item_id", "item_name", "price", "quantity", "is_active"
+    )
+    items = {}
+    for item_id, name, price, quantity, active in rows:
+        entry = price_list.get(item_id)
+        # Quote the snapshot price, which is what a sale will be charged at
+        items[item_id] = {
+            "item_id": item_id,
+            "item_name": name,
+            "price": entry.price if entry else price,
+            "quantity": quantity,
+            "is_active": active,
+        }
+    return {code: items.get(item_ids.get(code)) for code in codes}
@@ -0,0 +1,241 @@
+# search.py
+import threading
+import unicodedata
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from pos_app.models.item import Item
+from pos_app.services import pricelist
+
+# Minimum trigram similarity (Dice coefficient) for a fuzzy match
+FUZZY_THRESHOLD = 0.3
+
+# Rank tiers, best first; the similarity score breaks ties inside a tier
+EXACT, NAME_PREFIX, WORD_PREFIX, FUZZY = 3, 2, 1, 0
+
+# Incremental changes absorbed before the index repacks its arrays
+MAX_CHANGES = 1024
+
+
+def normalize(text):
+    """Lowercase, strip accents and collapse whitespace so "Café  Latte" matches "cafe latte"."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.lower().split())
+
+
+def trigrams(text):
+    """Padded trigrams of every word, so short words and word starts still produce grams."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SearchIndex:
+    """
+    In-memory prefix and trigram index over active item names.
+
+    Every indexed name owns a slot. Prefixes are answered by bisecting sorted
+    name and word lists, typos by counting shared trigrams over the posting
+    arrays with one ``bincount``, so a query costs a handful of vector
+    operations whatever the catalog size. Changes to single items append a
+    new slot and retire the old one instead of rebuilding.
+    """
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.lock = threading.Lock()
+        rows = list(rows)
+
+        self.slot_of = {}                # item_id -> slot
+        self.entries = []                # slot -> (item_id, item_name, normalized)
+        self.size = 0
+        self.changes = 0
+        capacity = max(len(rows) * 2, 64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.gram_count = np.zeros(capacity, dtype=np.float64)
+
+        postings, names, words = {}, [], []
+        for item_id, name in rows:
+            slot, normalized, grams = self._new_slot(item_id, name)
+            for gram in grams:
+                postings.setdefault(gram, []).append(slot)
+            names.append((normalized, slot))
+            words.extend((word, slot) for word in set(normalized.split()))
+
+        self.postings = {gram: np.asarray(slots, dtype=np.int64) for gram, slots in postings.items()}
+        self.pending = {}                # trigram -> slots added since the arrays were built
+        names.sort()
+        words.sort()
+        self.name_keys = [key for key, _ in names]
+        self.name_slots = np.asarray([slot for _, slot in names], dtype=np.int64)
+        self.word_keys = [key for key, _ in words]
+        self.word_slots = np.asarray([slot for _, slot in words], dtype=np.int64)
+
+    @classmethod
+    def build(cls, version):
+        return cls(version, Item.objects.filter(is_active=True).values_list("item_id", "item_name"))
+
+    def _new_slot(self, item_id, name):
+        normalized = normalize(name)
+        grams = trigrams(normalized)
+        slot = self.size
+        if slot == len(self.alive):
+            self.alive = np.concatenate([self.alive, np.zeros_like(self.alive)])
+            self.gram_count = np.concatenate([self.gram_count, np.zeros_like(self.gram_count)])
+        self.alive[slot] = True
+        self.gram_count[slot] = len(grams)
+        self.entries.append((item_id, name, normalized))
+        self.slot_of[item_id] = slot
+        self.size += 1
+        return slot, normalized, grams
+
+    @staticmethod
+    def _insert(keys, slots, key, slot):
+        position = bisect_right(keys, key)
+        keys.insert(position, key)
+        return np.insert(slots, position, slot)
+
+    @staticmethod
+    def _delete(keys, slots, key, slot):
+        position = bisect_left(keys, key)
+        while position < len(keys) and keys[position] == key:
+            if slots[position] == slot:
+                del keys[position]
+                return np.delete(slots, position)
+            position += 1
+        return slots
+
+    def _remove(self, item_id):
+        slot = self.slot_of.pop(item_id, None)
+        if slot is None:
+            return
+        _, _, normalized = self.entries[slot]
+        self.alive[slot] = False
+        # Trigram postings keep the dead slot; the alive mask filters it out
+        self.name_slots = self._delete(self.name_keys, self.name_slots, normalized, slot)
+        for word in set(normalized.split()):
+            self.word_slots = self._delete(self.word_keys, self.word_slots, word, slot)
+
+    def upsert(self, item_id, name, is_active):
+        """Apply one item's change: index it if active, drop it otherwise."""
+        with self.lock:
+            self._remove(item_id)
+            if is_active:
+                slot, normalized, grams = self._new_slot(item_id, name)
+                for gram in grams:
+                    self.pending.setdefault(gram, []).append(slot)
+                self.name_slots = self._insert(self.name_keys, self.name_slots, normalized, slot)
+                for word in set(normalized.split()):
+                    self.word_slots = self._insert(self.word_keys, self.word_slots, word, slot)
+            self._changed()
+
+    def remove(self, item_id):
+        with self.lock:
+            self._remove(item_id)
+            self._changed()
+
+    def _changed(self):
+        self.changes += 1
+        if self.changes > MAX_CHANGES:
+            self._compact()
+
+    def _compact(self):
+        fresh = SearchIndex(self.version, [(item_id, name) for item_id, name, _ in self.live_entries()])
+        lock = self.lock
+        self.__dict__.update(fresh.__dict__)
+        self.lock = lock
+
+    def live_entries(self):
+        return (self.entries[slot] for slot in sorted(self.slot_of.values()))
+
+    def _prefix_range(self, keys, slots, prefix):
+        return slots[bisect_left(keys, prefix):bisect_left(keys, prefix + "\uffff")]
+
+    def search(self, query, limit=20):
+        """Return up to ``limit`` ``(item_id, item_name, score)`` tuples, best match first."""
+        query = normalize(query)
+        if not query:
+            return []
+
+        with self.lock:
+            size = self.size
+            query_grams = trigrams(query)
+            hits = [self.postings[g] for g in query_grams if g in self.postings]
+            hits += [np.asarray(self.pending[g], dtype=np.int64) for g in query_grams if g in self.pending]
+            if hits:
+                shared = np.bincount(np.concatenate(hits), minlength=size)
+            else:
+                shared = np.zeros(size, dtype=np.int64)
+            similarity = 2 * shared / (len(query_grams) + self.gram_count[:size])
+
+            tier = np.full(size, FUZZY, dtype=np.float64)
+            # Every query word must prefix some word of the name, e.g. "ic lat" -> "Iced Latte"
+            word_match = np.ones(size, dtype=bool)
+            for term in query.split():
+                term_match = np.zeros(size, dtype=bool)
+                term_match[self._prefix_range(self.word_keys, self.word_slots, term)] = True
+                word_match &= term_match
+            tier[word_match] = WORD_PREFIX
+            tier[self._prefix_range(self.name_keys, self.name_slots, query)] = NAME_PREFIX
+            exact = self.name_slots[bisect_left(self.name_keys, query):bisect_right(self.name_keys, query)]
+            tier[exact] = EXACT
+
+            keep = self.alive[:size] & ((tier > FUZZY) | (similarity >= FUZZY_THRESHOLD))
+            candidates = np.flatnonzero(keep)
+            scores = tier[candidates] + similarity[candidates]
+            if len(candidates) > limit:
+                top = np.argpartition(-scores, limit - 1)[:limit]
+                candidates, scores = candidates[top], scores[top]
+
+            results = [(*self.entries[slot][:2], float(score)) for slot, score in zip(candidates, scores)]
+
+        results.sort(key=lambda row: (-row[2], len(row[1]), row[1]))
+        return [(item_id, name, round(score, 3)) for item_id, name, score in results]
+
+    def __len__(self):
+        return len(self.slot_of)
+
+
+_index = None
+_build_lock = threading.Lock()
+
+
+def get_index():
+    """Return the search index, rebuilding it when the catalog changed in another process."""
+    global _index
+    version = pricelist.current_version()
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _build_lock:
+        if _index is None or _index.version != version:
+            _index = SearchIndex.build(version)
+        return _index
+
+
+def apply_change(item, previous_version, version, deleted=False):
+    """
+    Fold a committed change to ``item`` into this process's index.
+
+    The index only adopts the new catalog version when it was current before
+    the change; if anything else moved the catalog in between, the next
+    search rebuilds from the database instead.
+    """
+    index = _index
+    if index is None:
+        return
+    if deleted:
+        index.remove(item.item_id)
+    else:
+        index.upsert(item.item_id, item.item_name, item.is_active)
+    if index.version == previous_version:
+        index.version = version
+
+
+def search(query, limit=20):
+    return get_index().search(query, limit)
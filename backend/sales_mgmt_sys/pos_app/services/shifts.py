@@ -0,0 +1,116 @@
+# shifts.py
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from pos_app.models.sale import Sale
+from pos_app.models.sale_item import SaleItem
+from pos_app.models.shift import Shift
+
+
+class ShiftError(Exception):
+    pass
+
+
+def open_shift(staff, opened_by=None):
+    """Open a shift for ``staff``; at most one can be open per person, enforced by the database."""
+    try:
+        with transaction.atomic():
+            return Shift.objects.create(staff=staff, opened_by=opened_by or staff)
+    except IntegrityError:
+        raise ShiftError(f"{staff.username} already has an open shift.")
+
+
+def close_shift(shift, closed_by=None):
+    """Close ``shift``; its running totals already are the Z-report, so nothing is recomputed."""
+    closed = Shift.objects.filter(pk=shift.pk, closed_at__isnull=True).update(
+        closed_at=timezone.now(), closed_by=closed_by,
+    )
+    if not closed:
+        raise ShiftError("Shift is already closed.")
+    shift.refresh_from_db()
+    return shift
+
+
+def open_shift_id(staff_id):
+    """The staff member's open shift, which new sales are booked against, or None."""
+    return Shift.objects.filter(staff_id=staff_id, closed_at__isnull=True).values_list("shift_id", flat=True).first()
+
+
+def record(shift_id, sales=0, items=0, revenue=Decimal("0.00")):
+    """
+    Add deltas to a shift's running totals in a single UPDATE.
+
+    Call it inside the transaction that writes the sale, so the totals commit
+    or roll back with it; F() expressions keep concurrent tills from
+    overwriting each other's increments.
+    """
+    if shift_id is None or not (sales or items or revenue):
+        return
+    Shift.objects.filter(pk=shift_id).update(
+        sale_count=F("sale_count") + sales,
+        item_count=F("item_count") + items,
+        revenue=F("revenue") + revenue,
+    )
+
+
+def sale_item_count(sale_id):
+    return SaleItem.objects.filter(sale_id=sale_id).aggregate(n=Sum("quantity"))["n"] or 0
+
+
+def z_report(shift):
+    sale_count = shift.sale_count
+    return {
+        "shift_id": shift.shift_id,
+        "staff": shift.staff_id,
+        "staff_username": shift.staff.username,
+        "opened_at": shift.opened_at,
+        "closed_at": shift.closed_at,
+        "sale_count": sale_count,
+        "item_count": shift.item_count,
+        "revenue": str(shift.revenue),
+        "average_sale": str((shift.revenue / sale_count).quantize(Decimal("0.01")) if sale_count else Decimal("0.00")),
+    }
+
+
+def recompute(shift_ids):
+    """Totals for ``shift_ids`` rebuilt from their live sales: ``{shift_id: (sales, items, revenue)}``."""
+    totals = {shift_id: (0, 0, Decimal("0.00")) for shift_id in shift_ids}
+    sales = Sale.objects.filter(shift_id__in=shift_ids, is_void=False).values("shift_id").annotate(n=Count("sale_id"), revenue=Sum("total_amount"))
+    items = dict(
+        SaleItem.objects.filter(sale__shift_id__in=shift_ids, sale__is_void=False).values("sale__shift_id")
+        .annotate(n=Sum("quantity")).values_list("sale__shift_id", "n")
+    )
+    for row in sales:
+        totals[row["shift_id"]] = (row["n"], items.get(row["shift_id"], 0), row["revenue"])
+    return totals
+
+
+def reconcile(days=7, fix=False):
+    """
+    Compare running totals of shifts opened in the last ``days`` days with a full recompute.
+
+    Returns the mismatches as ``(shift, stored, expected)`` totals tuples; with ``fix`` the stored
+    totals are overwritten with the recomputed ones. Older shifts are skipped
+    by default because their sales may already have been archived.
+    """
+    shifts = Shift.objects.select_related("staff").order_by("shift_id")
+    if days is not None:
+        shifts = shifts.filter(opened_at__gte=timezone.now() - timedelta(days=days))
+
+    mismatches = []
+    # One transaction so the stored and recomputed totals are read from the same state
+    with transaction.atomic():
+        shifts = list(shifts)
+        expected = recompute([shift.shift_id for shift in shifts])
+        for shift in shifts:
+            stored, totals = (shift.sale_count, shift.item_count, shift.revenue), expected[shift.shift_id]
+            if stored != totals:
+                mismatches.append((shift, stored, totals))
+                if fix:
+                    shift.sale_count, shift.item_count, shift.revenue = totals
+                    shift.save(update_fields=["sale_count", "item_count", "revenue"])
+    return mismatches
@@ -0,0 +1,124 @@
+# staff_performance.py
+# Kept free of heavy imports: signal handlers load this at startup.
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum, Window
+from django.db.models.functions import ExtractHour, RowNumber
+from django.utils import timezone
+
+from pos_app import db_router
+from pos_app.models.archive_rollup import ArchiveStaffRollup
+from pos_app.models.rating import Rating
+from pos_app.models.sale import Sale
+from pos_app.models.sale_item import SaleItem
+from pos_app.models.staff_performance import StaffDailyPerformance, StaffPerformanceDay
+from pos_app.services import tasks
+
+# Seconds a background refresh waits after the first change, so a rush of sales costs one refresh
+REFRESH_DELAY = getattr(settings, "STAFF_PERFORMANCE_REFRESH_DELAY", 30)
+
+
+def invalidate(days):
+    """
+    Forget the materialized rows of ``days``. When that dropped rows a
+    dashboard was using, a refresh is queued for a worker; until it runs,
+    the next dashboard read recomputes them.
+    """
+    days = {day for day in days if day}
+    if days and StaffPerformanceDay.objects.filter(day__in=days).delete()[0]:
+        tasks.enqueue("staff_performance", key="staff_performance", delay=REFRESH_DELAY)
+
+
+def _hourly(start, end):
+    """
+    Sale count and revenue per staff, day and hour, with the day's busiest
+    hour ranked first by a window over each staff member's day.
+    """
+    partition = [F("staff_id"), F("sale_date")]
+    return (
+        Sale.objects.filter(sale_date__range=(start, end), is_void=False)
+        .values("staff_id", "sale_date", hour=ExtractHour("created_at"))
+        .annotate(sales=Count("sale_id"), revenue=Sum("total_amount"))
+        .annotate(rank=Window(RowNumber(), partition_by=partition, order_by=[F("sales").desc(), F("hour").asc()]))
+        .values_list("staff_id", "sale_date", "hour", "sales", "revenue", "rank")
+    )
+
+
+@transaction.atomic
+def materialize(start, end):
+    """
+    Recompute the performance rows of ``start``..``end`` in a fixed number of queries.
+
+    The day markers are written before anything is read, so on SQLite a
+    checkout committing meanwhile waits and then invalidates the fresh rows
+    rather than being missed by them. Archived sales count through their
+    daily rollups.
+    """
+    days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+    StaffPerformanceDay.objects.filter(day__range=(start, end)).delete()
+    StaffPerformanceDay.objects.bulk_create([StaffPerformanceDay(day=day) for day in days], batch_size=500)
+    StaffDailyPerformance.objects.filter(day__range=(start, end)).delete()
+
+    rows = defaultdict(lambda: {
+        "sale_count": 0, "item_count": 0, "revenue": Decimal("0.00"), "hourly_sales": [0] * 24,
+        "active_hours": 0, "peak_hour": None, "rating_count": 0, "rating_total": 0.0,
+    })
+    for staff_id, day, hour, sales, revenue, rank in _hourly(start, end):
+        row = rows[day, staff_id]
+        row["sale_count"] += sales
+        row["revenue"] += revenue or 0
+        row["hourly_sales"][hour] = sales
+        row["active_hours"] += 1
+        if rank == 1:
+            row["peak_hour"] = hour
+
+    items = (
+        SaleItem.objects.filter(sale__sale_date__range=(start, end), sale__is_void=False)
+        .values("sale__staff_id", "sale__sale_date").annotate(n=Sum("quantity"))
+        .values_list("sale__staff_id", "sale__sale_date", "n")
+    )
+    for staff_id, day, units in items:
+        rows[day, staff_id]["item_count"] += units
+
+    archived = ArchiveStaffRollup.objects.filter(day__range=(start, end)).values_list(
+        "staff_id", "day", "sale_count", "item_count", "revenue"
+    )
+    for staff_id, day, sales, units, revenue in archived:
+        row = rows[day, staff_id]
+        row["sale_count"] += sales
+        row["item_count"] += units
+        row["revenue"] += revenue
+
+    ratings = (
+        Rating.objects.filter(rating_date__range=(start, end)).values("staff_id", "rating_date")
+        .annotate(n=Count("rating_id"), total=Sum("rating_score")).values_list("staff_id", "rating_date", "n", "total")
+    )
+    for staff_id, day, count, total in ratings:
+        rows[day, staff_id]["rating_count"] = count
+        rows[day, staff_id]["rating_total"] = total
+
+    StaffDailyPerformance.objects.bulk_create(
+        [StaffDailyPerformance(day=day, staff_id=staff_id, **values) for (day, staff_id), values in rows.items()],
+        batch_size=500,
+    )
+    return len(rows)
+
+
+def ensure(start, end):
+    """
+    Materialize the days of ``start``..``end`` (up to today) that have no fresh
+    rows yet. Fresh days between the first and last stale one are recomputed
+    with them, keeping every query a range scan.
+    """
+    end = min(end, timezone.localdate())
+    if start > end:
+        return 0
+    wanted = {start + timedelta(days=n) for n in range((end - start).days + 1)}
+    # Rows are written to the primary, so freshness is judged there too
+    with db_router.use_primary():
+        missing = wanted - set(StaffPerformanceDay.objects.filter(day__range=(start, end)).values_list("day", flat=True))
+        return materialize(min(missing), max(missing)) if missing else 0
@@ -0,0 +1,89 @@
+# stock.py
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from pos_app.models.item import Item
+
+
+class InsufficientStock(Exception):
+    """Raised when a decrement would take an item below zero; ``items`` maps item_id to units on hand."""
+
+    def __init__(self, items):
+        self.items = items
+        super().__init__(f"Not enough stock for items {sorted(items)}")
+
+
+def combine(lines):
+    """Sum ``(item_id, delta)`` pairs into one delta per item."""
+    deltas = defaultdict(int)
+    for item_id, delta in lines:
+        deltas[item_id] += delta
+    return {item_id: delta for item_id, delta in deltas.items() if delta}
+
+
+def apply_deltas(deltas):
+    """
+    Apply ``{item_id: delta}`` to stock in a single conditional UPDATE.
+
+    Each decrement only matches while the item still has enough units, so
+    concurrent sales cannot oversell and no row is read first. If any row
+    fails its condition, nothing changes and InsufficientStock is raised
+    naming the items that are short; call this inside the caller's
+    transaction so whatever else it wrote rolls back with it.
+    """
+    if not deltas:
+        return
+    condition = Q()
+    for item_id, delta in deltas.items():
+        condition |= Q(item_id=item_id, quantity__gte=-delta) if delta < 0 else Q(item_id=item_id)
+
+    while True:
+        with transaction.atomic():
+            updated = Item.objects.filter(condition).update(
+                quantity=F("quantity") + Case(*[When(item_id=item_id, then=Value(delta)) for item_id, delta in deltas.items()]),
+                updated_at=timezone.now(),
+            )
+            if updated == len(deltas):
+                return
+            # Undo the rows that matched; the write lock stays with the transaction, so the stock read next is what the UPDATE saw
+            transaction.set_rollback(True)
+        on_hand = dict(Item.objects.filter(item_id__in=list(deltas)).values_list("item_id", "quantity"))
+        # Unknown items count as empty
+        short = {item_id: on_hand.get(item_id, 0) for item_id, delta in deltas.items() if item_id not in on_hand or on_hand[item_id] < -delta}
+        if short:
+            raise InsufficientStock(short)
+        # Outside a transaction the stock can move back before it is read; try again
+
+
+def set_counts(counts):
+    """
+    Set ``{item_id: (expected, counted)}`` in a single UPDATE, only where stock still equals ``expected``.
+
+    Returns the item_ids whose stock moved since it was read; those rows are
+    left untouched so the caller can re-read them and try again. When some
+    moved, the UPDATE is rolled back and run again over the rest, so which
+    rows were written never depends on telling timestamps apart.
+    """
+    moved = set()
+    while counts:
+        condition = Q()
+        for item_id, (expected, _) in counts.items():
+            condition |= Q(item_id=item_id, quantity=expected)
+
+        with transaction.atomic():
+            updated = Item.objects.filter(condition).update(
+                quantity=Case(*[When(item_id=item_id, then=Value(counted)) for item_id, (_, counted) in counts.items()]),
+                updated_at=timezone.now(),
+            )
+            if updated == len(counts):
+                break
+            # Undo and read back the stock the UPDATE compared against, then write the rows that still match
+            transaction.set_rollback(True)
+        on_hand = dict(Item.objects.filter(item_id__in=list(counts)).values_list("item_id", "quantity"))
+        stale = {item_id for item_id, (expected, _) in counts.items() if on_hand.get(item_id) != expected}
+        moved |= stale
+        counts = {item_id: count for item_id, count in counts.items() if item_id not in stale}
+    return moved
@@ -0,0 +1,197 @@
+# tasks.py
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Max, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from pos_app.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+# Job name -> import path of the function that runs it
+JOBS = {
+    "staff_performance": "pos_app.jobs.refresh_staff_performance",
+    "forecasts": "pos_app.jobs.compute_forecasts",
+    "archive": "pos_app.jobs.archive_sales",
+    "backup": "pos_app.jobs.backup_db",
+    "refresh_replica": "pos_app.jobs.refresh_replica",
+    "dispatch_outbox": "pos_app.jobs.dispatch_outbox",
+    "purge_tasks": "pos_app.jobs.purge_tasks",
+    **getattr(settings, "TASK_JOBS", {}),
+}
+SCHEDULE = getattr(settings, "TASK_SCHEDULE", {})
+MAX_ATTEMPTS = getattr(settings, "TASK_MAX_ATTEMPTS", 5)
+# Retry after 4, 16, 64 ... seconds, at most RETRY_MAX apart
+RETRY_BASE = getattr(settings, "TASK_RETRY_BASE", 4)
+RETRY_MAX = getattr(settings, "TASK_RETRY_MAX", 30 * 60)
+# A running task whose worker sent no heartbeat for this long is taken over by another worker
+LEASE = timedelta(seconds=getattr(settings, "TASK_LEASE", 5 * 60))
+RETAIN_DAYS = getattr(settings, "TASK_RETAIN_DAYS", 7)
+
+
+def enqueue(job, args=None, key=None, run_at=None, delay=None, max_attempts=MAX_ATTEMPTS):
+    """
+    Queue ``job`` to run with the keyword arguments ``args`` at ``run_at`` (or ``delay`` seconds
+    from now, or as soon as a worker is free) in one INSERT.
+
+    With a ``key``, the task is dropped if one with that key is already
+    queued, so a burst of requests for the same work runs it once. A task
+    that is already running does not count: the work it started may predate
+    the request. Returns the task; with a ``key`` its ``task_id`` is not
+    filled in (look it up with ``queued``).
+    """
+    if job not in JOBS:
+        raise ValueError(f"Unknown job {job!r}")
+    if run_at is None:
+        run_at = timezone.now() + timedelta(seconds=delay or 0)
+    task = Task(job=job, args=args or {}, dedupe_key=key, run_at=run_at, max_attempts=max_attempts)
+    Task.objects.bulk_create([task], ignore_conflicts=key is not None)
+    return task
+
+
+def queued(key):
+    return Task.objects.filter(dedupe_key=key, status=Task.QUEUED).first()
+
+
+def schedule_periodic(schedule=SCHEDULE, now=None):
+    """
+    Queue the next run of every periodic job in ``schedule`` that has none
+    queued or running. Each entry is ``{"job": name, "every": seconds,
+    "args": {...}}``; the next run comes ``every`` seconds after the last one
+    finished, or now for a job that never ran. Costs two queries however
+    many entries there are, plus one INSERT per run queued.
+    """
+    if not schedule:
+        return 0
+    now = now or timezone.now()
+    keys = {f"schedule:{name}": entry for name, entry in schedule.items()}
+    busy = set(
+        Task.objects.filter(dedupe_key__in=keys, status__in=[Task.QUEUED, Task.RUNNING]).values_list("dedupe_key", flat=True)
+    )
+    last = dict(
+        Task.objects.filter(dedupe_key__in=keys, finished_at__isnull=False)
+        .values("dedupe_key").annotate(last=Max("finished_at")).values_list("dedupe_key", "last")
+    )
+    count = 0
+    for key, entry in keys.items():
+        if key in busy:
+            continue
+        run_at = max(now, last[key] + timedelta(seconds=entry["every"])) if key in last else now
+        enqueue(entry["job"], entry.get("args"), key=key, run_at=run_at)
+        count += 1
+    return count
+
+
+def claim(worker_id, limit, now=None):
+    """
+    Take up to ``limit`` due tasks for ``worker_id``, oldest due first, and
+    return their ids. Tasks whose worker stopped sending heartbeats are taken
+    over too. Each task is claimed with a conditional UPDATE, so when several
+    workers race for one only the first gets it.
+    """
+    now = now or timezone.now()
+    lost = Q(status=Task.RUNNING, locked_until__lt=now)
+    # A task that keeps losing its worker (e.g. it crashes the process) stops being retried
+    Task.objects.filter(lost, attempts__gte=F("max_attempts")).update(
+        status=Task.FAILED, last_error="Worker stopped sending heartbeats", finished_at=now, locked_until=None,
+    )
+    due = Q(status=Task.QUEUED, run_at__lte=now) | lost
+    candidates = Task.objects.filter(due).order_by("run_at", "task_id").values_list("task_id", flat=True)[:limit * 2]
+    claimed = []
+    for task_id in candidates:
+        taken = Task.objects.filter(due, pk=task_id).update(
+            status=Task.RUNNING, locked_by=worker_id, locked_until=now + LEASE, started_at=now, attempts=F("attempts") + 1,
+        )
+        if taken:
+            claimed.append(task_id)
+            if len(claimed) == limit:
+                break
+    return claimed
+
+
+def heartbeat(worker_id, task_ids):
+    """Extend the lease ``worker_id`` holds on ``task_ids``, the tasks it is still running."""
+    return Task.objects.filter(pk__in=task_ids, status=Task.RUNNING, locked_by=worker_id).update(
+        locked_until=timezone.now() + LEASE,
+    )
+
+
+def _backoff(attempts):
+    return timedelta(seconds=min(RETRY_BASE ** attempts, RETRY_MAX))
+
+
+def _jsonable(value):
+    try:
+        json.dumps(value, cls=DjangoJSONEncoder)
+    except (TypeError, ValueError):
+        return str(value)
+    return value
+
+
+def execute(task_id, worker_id):
+    """
+    Run a task claimed by ``worker_id`` and record how it went; returns the
+    new status. Runs in a pool thread or process, so it loads the task
+    itself and leaves no database connection behind.
+
+    A failed task goes back to the queue after an exponential backoff and is
+    marked failed after ``max_attempts``. Updates only apply while the
+    worker still holds the task, so a worker that lost its lease cannot
+    overwrite the outcome of the one that took over.
+    """
+    close_old_connections()
+    try:
+        mine = Task.objects.filter(pk=task_id, status=Task.RUNNING, locked_by=worker_id)
+        task = mine.first()
+        if task is None:
+            return None
+        try:
+            result = import_string(JOBS[task.job])(**task.args)
+        except Exception as e:
+            logger.exception("Task %s (%s) failed", task_id, task.job)
+            return _fail(task, mine, f"{type(e).__name__}: {e}"[:1000])
+        mine.update(status=Task.DONE, result=_jsonable(result), finished_at=timezone.now(), locked_until=None, last_error="")
+        return Task.DONE
+    finally:
+        close_old_connections()
+
+
+def _fail(task, mine, error):
+    now = timezone.now()
+    if task.attempts < task.max_attempts:
+        try:
+            with transaction.atomic():
+                mine.update(status=Task.QUEUED, run_at=now + _backoff(task.attempts), last_error=error, locked_by="", locked_until=None)
+            return Task.QUEUED
+        except IntegrityError:
+            # A copy was queued under the same key meanwhile; it does the work instead
+            error += " (superseded by a queued copy)"
+    mine.update(status=Task.FAILED, last_error=error, finished_at=now, locked_until=None)
+    return Task.FAILED
+
+
+def requeue_failed():
+    """Give failed tasks a fresh set of attempts, e.g. once the cause is fixed. Returns how many were queued again."""
+    count = 0
+    # Newest first: of several failed tasks with one key, only the newest can be queued
+    for task_id in Task.objects.filter(status=Task.FAILED).order_by("-task_id").values_list("task_id", flat=True):
+        try:
+            with transaction.atomic():
+                count += Task.objects.filter(pk=task_id).update(
+                    status=Task.QUEUED, attempts=0, run_at=timezone.now(), finished_at=None,
+                )
+        except IntegrityError:
+            continue
+    return count
+
+
+def purge(days=RETAIN_DAYS):
+    """Delete tasks that finished successfully more than ``days`` ago."""
+    cutoff = timezone.now() - timedelta(days=days)
+    return Task.objects.filter(status=Task.DONE, finished_at__lt=cutoff).delete()[0]
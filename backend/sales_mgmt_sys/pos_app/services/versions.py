@@ -0,0 +1,39 @@
+# versions.py
+import time
+
+from django.conf import settings
+
+from pos_app.models.cache_version import CacheVersion
+
+# How long a process trusts the version it last read before asking the database again
+CHECK_INTERVAL = getattr(settings, "CACHE_VERSION_CHECK_INTERVAL", 1.0)
+
+_seen = {}  # name -> (version, time.monotonic() when read)
+
+
+def current(name, max_age=CHECK_INTERVAL):
+    """
+    The version of ``name`` as committed in the database, re-read at most
+    every ``max_age`` seconds so snapshots checked on every use cost no query.
+    """
+    seen = _seen.get(name)
+    now = time.monotonic()
+    if seen is not None and now - seen[1] < max_age:
+        return seen[0]
+    version = CacheVersion.objects.filter(name=name).values_list("version", flat=True).first() or 0
+    _seen[name] = (version, now)
+    return version
+
+
+def bump(name):
+    """
+    Give ``name`` a new version. Call it in the transaction that changes the
+    data: other processes see the new version exactly when they can see the
+    change, and this one on its next read.
+    """
+    version = time.time_ns()
+    if not CacheVersion.objects.filter(name=name).update(version=version):
+        # First bump of this name; a racing first bump wins just as well
+        CacheVersion.objects.bulk_create([CacheVersion(name=name, version=version)], ignore_conflicts=True)
+    _seen.pop(name, None)
+    return version
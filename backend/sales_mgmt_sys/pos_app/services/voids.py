@@ -0,0 +1,86 @@
+# voids.py
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from pos_app.models.sale import Sale
+from pos_app.models.sale_item import SaleItem
+from pos_app.services import outbox, query_cache, shifts, staff_performance, stock
+
+MAX_SALES = 1000
+
+
+@transaction.atomic
+def void_sales(sale_ids, staff=None, reason=""):
+    """
+    Void every live sale in ``sale_ids`` in one transaction.
+
+    The sales are flagged in a single conditional UPDATE, so a sale voided
+    twice at once is only reversed once. Their unreturned units go back to
+    stock in one grouped update, shift running totals drop by what the sales
+    had added and cached reports covering them are invalidated; the sales
+    and their lines are kept for the audit trail.
+    """
+    sale_ids = set(sale_ids)
+    while True:
+        with transaction.atomic():
+            voided = list(
+                Sale.objects.filter(sale_id__in=sale_ids, is_void=False)
+                .values("sale_id", "shift_id", "staff_id", "sale_date", "total_amount")
+            )
+            ids = [sale["sale_id"] for sale in voided]
+            now = timezone.now()
+            flipped = Sale.objects.filter(sale_id__in=ids, is_void=False).update(
+                is_void=True, voided_at=now, voided_by=staff, void_reason=reason, updated_at=now,
+            )
+            if flipped == len(ids):
+                break
+            # Another void took some of them between the read and the UPDATE; that UPDATE holds
+            # the write lock now, so reading again sees exactly the sales that are still live
+            transaction.set_rollback(True)
+    result = {
+        "voided": sorted(ids),
+        "already_void": sorted(Sale.objects.filter(sale_id__in=sale_ids - set(ids)).values_list("sale_id", flat=True)),
+        "restocked": 0,
+    }
+    result["not_found"] = sorted(sale_ids - set(ids) - set(result["already_void"]))
+    if not voided:
+        return result
+
+    lines = SaleItem.objects.filter(sale_id__in=ids)
+    per_sale = defaultdict(dict)
+    for sale_id, item_id, units in (
+        lines.values("sale_id", "item_id").annotate(units=Sum(F("quantity") - F("returned_quantity")))
+        .values_list("sale_id", "item_id", "units")
+    ):
+        if units:
+            per_sale[sale_id][item_id] = units
+    restock = stock.combine((item_id, units) for deltas in per_sale.values() for item_id, units in deltas.items())
+    stock.apply_deltas(restock)
+    result["restocked"] = sum(restock.values())
+
+    totals = defaultdict(lambda: [0, 0, Decimal("0.00")])
+    for sale in voided:
+        if sale["shift_id"] is not None:
+            totals[sale["shift_id"]][0] += 1
+            totals[sale["shift_id"]][2] += sale["total_amount"]
+    units = lines.filter(sale__shift_id__isnull=False).values("sale__shift_id").annotate(n=Sum("quantity"))
+    for row in units.values_list("sale__shift_id", "n"):
+        totals[row[0]][1] += row[1]
+    for shift_id, (sales, items, revenue) in totals.items():
+        shifts.record(shift_id, sales=-sales, items=-items, revenue=-revenue)
+
+    outbox.emit([
+        outbox.sale_event("sale.voided", sale, reason=reason, voided_by=staff.pk if staff else None,
+                          stock=outbox.stock_payload(per_sale[sale["sale_id"]]))
+        for sale in voided
+    ])
+    staff_performance.invalidate({sale["sale_date"] for sale in voided})
+    query_cache.invalidate(
+        {query_cache.month_tag(sale["sale_date"]) for sale in voided}
+        | {query_cache.staff_tag(sale["staff_id"]) for sale in voided}
+    )
+    return result
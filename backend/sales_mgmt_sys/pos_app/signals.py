@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from pos_app.models.item import Item
+from pos_app.models.item_barcode import ItemBarcode
+from pos_app.models.pricing_rule import PromotionItem, PromotionRule, TaxRule
+from pos_app.models.rating import Rating
+from pos_app.models.sale import Sale
+from pos_app.models.sale_item import SaleItem
+from pos_app.models.user import User
+from pos_app.services import catalog, pricelist, pricing, query_cache, staff_performance
+
+
+@receiver([post_save, post_delete], sender=Sale)
+def invalidate_sale_reports(sender, instance, **kwargs):
+    # A sale moved to another month or staff member leaves stale reports behind too
+    query_cache.invalidate(
+        {query_cache.month_tag(day) for day in (instance.sale_date, instance.stored("sale_date"))}
+        | {query_cache.staff_tag(staff_id) for staff_id in (instance.staff_id, instance.stored("staff_id"))}
+    )
+
+
+@receiver([post_save, post_delete], sender=SaleItem)
+def invalidate_sale_item_reports(sender, instance, **kwargs):
+    if SaleItem.sale.is_cached(instance):
+        sale_date = instance.sale.sale_date
+    else:
+        sale_date = Sale.objects.filter(pk=instance.sale_id).values_list("sale_date", flat=True).first()
+    if sale_date is not None:
+        query_cache.invalidate([query_cache.month_tag(sale_date)])
+
+
+# Deletes are left out: archiving deletes sales whose day stays counted through the rollups.
+# Invalidating inside the transaction keeps a concurrent refresh from marking the day fresh.
+@receiver(post_save, sender=Sale)
+def invalidate_sale_performance(sender, instance, **kwargs):
+    # A sale moved to another day leaves that day's rows stale too
+    staff_performance.invalidate({instance.sale_date, instance.stored("sale_date")})
+
+
+@receiver(post_save, sender=SaleItem)
+def invalidate_sale_item_performance(sender, instance, **kwargs):
+    if SaleItem.sale.is_cached(instance):
+        sale_date = instance.sale.sale_date
+    else:
+        sale_date = Sale.objects.filter(pk=instance.sale_id).values_list("sale_date", flat=True).first()
+    staff_performance.invalidate([sale_date])
+
+
+@receiver([post_save, post_delete], sender=Rating)
+def invalidate_ratings(sender, instance, **kwargs):
+    query_cache.invalidate(["ratings"])
+    staff_performance.invalidate([instance.rating_date])
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_users(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no cached report shows
+    if update_fields is None or set(update_fields) != {"last_login"}:
+        query_cache.invalidate(["users"])
+
+
+@receiver([post_save, post_delete], sender=Item)
+def invalidate_catalog(sender, instance, signal, **kwargs):
+    deleted = signal is post_delete
+    # Bumped in the writing transaction, so other processes see the new version exactly when the change commits
+    previous = pricelist.current_version(max_age=0)
+    version = pricelist.bump_version()
+
+    def update_catalog():
+        from pos_app.services import search
+
+        search.apply_change(instance, previous, version, deleted=deleted)
+        query_cache.bump(["items"])
+
+    transaction.on_commit(update_catalog)
+
+
+@receiver(post_delete, sender=Item)
+def record_item_deletion(sender, instance, **kwargs):
+    catalog.record_deletion(instance.item_id)
+
+
+@receiver([post_save, post_delete], sender=ItemBarcode)
+def invalidate_barcodes(sender, instance, **kwargs):
+    # Barcodes are part of the item as terminals see it, so delta syncs pick the change up
+    Item.objects.filter(pk=instance.item_id).update(updated_at=timezone.now())
+    pricelist.bump_version()
+
+
+@receiver([post_save, post_delete], sender=PromotionRule)
+@receiver([post_save, post_delete], sender=PromotionItem)
+@receiver([post_save, post_delete], sender=TaxRule)
+@receiver(m2m_changed, sender=TaxRule.items.through)
+def invalidate_pricing_rules(sender, **kwargs):
+    # Bumped in the writing transaction: no process sees the new version before the rules commit
+    pricing.bump_version()
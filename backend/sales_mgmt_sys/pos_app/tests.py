@@ -1,3 +1,142 @@
-from django.test import TestCase
+from datetime import datetime, time
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from pos_app.models.pricing_rule import PromotionRule
+from pos_app.services import pricing
+
+LATTE, MUFFIN, TEA = 1, 2, 3
+PRICES = {LATTE: Decimal("3.50"), MUFFIN: Decimal("2.25"), TEA: Decimal("1.00")}
+# A Monday, 17:30 local time
+AT = timezone.make_aware(datetime(2026, 10, 19, 17, 30))
+
+
+def rule(rule_id, kind, value, applies_to_all=False, **window):
+    return {
+        "rule_id": rule_id, "name": f"Rule {rule_id}", "kind": kind, "value": Decimal(value),
+        "applies_to_all": applies_to_all, "starts_at": None, "ends_at": None, "weekdays": "",
+        "start_time": None, "end_time": None, "created_at": timezone.make_aware(datetime(2026, 1, 1)), **window,
+    }
+
+
+def table(promotions=(), members=(), taxes=(), tax_items=()):
+    return pricing.compile_rules(0, list(promotions), list(members), list(taxes), list(tax_items))
+
+
+def quote(lines, rules, at=AT):
+    return pricing.quote([(item_id, quantity, PRICES[item_id]) for item_id, quantity in lines], at=at, table=rules)
+
+
+class QuoteTests(SimpleTestCase):
+    def test_no_rules(self):
+        basket = quote([(LATTE, 2), (TEA, 1)], table())
+        self.assertEqual(basket.total, Decimal("8.00"))
+        self.assertEqual((basket.discount, basket.tax), (Decimal("0.00"), Decimal("0.00")))
+        self.assertEqual(basket.lines[0].promotions, ())
+
+    def test_percent_off(self):
+        basket = quote([(LATTE, 3)], table([rule(1, PromotionRule.PERCENT_OFF, 10)], [(1, LATTE, 1)]))
+        line = basket.lines[0]
+        self.assertEqual((line.discount, line.subtotal, line.promotions), (Decimal("1.05"), Decimal("9.45"), (1,)))
+
+    def test_amount_off_is_capped_at_the_price(self):
+        basket = quote([(TEA, 2)], table([rule(1, PromotionRule.AMOUNT_OFF, "1.50")], [(1, TEA, 1)]))
+        self.assertEqual((basket.lines[0].discount, basket.total), (Decimal("2.00"), Decimal("0.00")))
+
+    def test_fixed_price(self):
+        basket = quote([(LATTE, 2)], table([rule(1, PromotionRule.FIXED_PRICE, "3.00")], [(1, LATTE, 1)]))
+        self.assertEqual(basket.lines[0].subtotal, Decimal("6.00"))
+
+    def test_best_promotion_wins(self):
+        rules = table(
+            [rule(1, PromotionRule.PERCENT_OFF, 10), rule(2, PromotionRule.AMOUNT_OFF, "0.50", applies_to_all=True)],
+            [(1, LATTE, 1)],
+        )
+        line = quote([(LATTE, 1)], rules).lines[0]
+        self.assertEqual((line.discount, line.promotions), (Decimal("0.50"), (2,)))
+
+    def test_combo_spreads_its_saving_by_value(self):
+        rules = table([rule(1, PromotionRule.COMBO, "5.00")], [(1, LATTE, 1), (1, MUFFIN, 1)])
+        basket = quote([(LATTE, 1), (MUFFIN, 1)], rules)
+        self.assertEqual(basket.total, Decimal("5.00"))
+        self.assertEqual([line.discount for line in basket.lines], [Decimal("0.46"), Decimal("0.29")])
+        self.assertEqual([line.promotions for line in basket.lines], [(1,), (1,)])
+
+    def test_units_outside_the_combo_get_the_best_promotion(self):
+        rules = table(
+            [rule(1, PromotionRule.PERCENT_OFF, 10), rule(2, PromotionRule.COMBO, "5.00")],
+            [(1, LATTE, 1), (2, LATTE, 1), (2, MUFFIN, 1)],
+        )
+        basket = quote([(LATTE, 3), (MUFFIN, 1)], rules)
+        # 0.75 off the combo, then 10% off the two lattes left
+        self.assertEqual(basket.discount, Decimal("1.45"))
+        self.assertEqual(basket.total, Decimal("11.30"))
+        self.assertEqual(basket.lines[0].promotions, (2, 1))
+
+    def test_combo_that_saves_nothing_is_skipped(self):
+        rules = table([rule(1, PromotionRule.COMBO, "6.00")], [(1, LATTE, 1), (1, MUFFIN, 1)])
+        self.assertEqual(quote([(LATTE, 1), (MUFFIN, 1)], rules).discount, Decimal("0.00"))
+
+    def test_lines_of_one_item_share_its_combo_discount(self):
+        rules = table([rule(1, PromotionRule.COMBO, "6.00")], [(1, LATTE, 2)])
+        basket = quote([(LATTE, 1), (LATTE, 1)], rules)
+        self.assertEqual([line.discount for line in basket.lines], [Decimal("0.50"), Decimal("0.50")])
+        self.assertEqual(basket.total, Decimal("6.00"))
+
+    def test_happy_hour_window(self):
+        rules = table(
+            [rule(1, PromotionRule.PERCENT_OFF, 50, start_time=time(17), end_time=time(18), weekdays="12345")],
+            [(1, TEA, 1)],
+        )
+        self.assertEqual(quote([(TEA, 2)], rules).discount, Decimal("1.00"))
+        self.assertEqual(quote([(TEA, 2)], rules, at=AT.replace(hour=18)).discount, Decimal("0.00"))
+        # Saturday
+        self.assertEqual(quote([(TEA, 2)], rules, at=AT.replace(day=24)).discount, Decimal("0.00"))
+
+    def test_window_past_midnight(self):
+        rules = table([rule(1, PromotionRule.PERCENT_OFF, 50, start_time=time(22), end_time=time(2))], [(1, TEA, 1)])
+        self.assertEqual(quote([(TEA, 2)], rules, at=AT.replace(hour=1)).discount, Decimal("1.00"))
+        self.assertEqual(quote([(TEA, 2)], rules, at=AT.replace(hour=3)).discount, Decimal("0.00"))
+
+    def test_rule_before_it_starts(self):
+        rules = table([rule(1, PromotionRule.PERCENT_OFF, 50, starts_at=AT.replace(day=20))], [(1, TEA, 1)])
+        self.assertEqual(quote([(TEA, 2)], rules).discount, Decimal("0.00"))
+
+    def test_tax_is_included_in_the_price(self):
+        rules = table([rule(1, PromotionRule.PERCENT_OFF, 10)], [(1, LATTE, 1)], [(1, Decimal(16), True), (2, Decimal(5), False)], [(2, TEA)])
+        basket = quote([(LATTE, 1), (TEA, 1)], rules)
+        # 3.15 x 16/116 and 1.00 x 21/121
+        self.assertEqual([line.tax for line in basket.lines], [Decimal("0.43"), Decimal("0.17")])
+        self.assertEqual(basket.tax, Decimal("0.60"))
+
+
+class ApplyCombosTests(SimpleTestCase):
+    def combos(self, *combos):
+        return {combo.rule_id: combo for combo in combos}
+
+    def test_best_saving_first(self):
+        window = pricing._window(rule(0, PromotionRule.COMBO, 0))
+        small = pricing.Combo(1, Decimal("5.50"), ((LATTE, 1), (MUFFIN, 1)), window)
+        big = pricing.Combo(2, Decimal("4.00"), ((LATTE, 1), (TEA, 1)), window)
+        taken, discount, applied = pricing._apply_combos(
+            self.combos(small, big), {LATTE: 1, MUFFIN: 1, TEA: 1}, PRICES, lambda combo: True,
+        )
+        # Only one latte: the bigger saving takes it
+        self.assertEqual(dict(taken), {LATTE: 1, TEA: 1})
+        self.assertEqual(discount[LATTE] + discount[TEA], Decimal("0.50"))
+        self.assertEqual(dict(applied), {LATTE: [2], TEA: [2]})
+
+    def test_combo_applies_as_often_as_the_units_allow(self):
+        window = pricing._window(rule(0, PromotionRule.COMBO, 0))
+        combo = pricing.Combo(1, Decimal("5.00"), ((LATTE, 1), (MUFFIN, 1)), window)
+        taken, discount, _ = pricing._apply_combos(self.combos(combo), {LATTE: 3, MUFFIN: 2}, PRICES, lambda combo: True)
+        self.assertEqual(dict(taken), {LATTE: 2, MUFFIN: 2})
+        self.assertEqual(discount[LATTE] + discount[MUFFIN], Decimal("1.50"))
+
+    def test_inactive_combo_is_ignored(self):
+        window = pricing._window(rule(0, PromotionRule.COMBO, 0))
+        combo = pricing.Combo(1, Decimal("5.00"), ((LATTE, 1), (MUFFIN, 1)), window)
+        taken, _, _ = pricing._apply_combos(self.combos(combo), {LATTE: 1, MUFFIN: 1}, PRICES, lambda combo: False)
+        self.assertEqual(dict(taken), {})
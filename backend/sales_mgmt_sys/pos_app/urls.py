@@ -2,10 +2,18 @@ from django.urls import path
 from django.http import JsonResponse
 from rest_framework_simplejwt.views import TokenRefreshView
 from pos_app.views.auth_views import RegisterView, LoginView, logout_view
-from pos_app.views.item_views import ItemListCreateView, ItemDetailView, ReduceStockView
-from pos_app.views.sale_views import SaleListCreateView, SaleEditView, UpdateItemQuantityView, update_sales, delete_sale, UpdateSaleTotalView
-from pos_app.views.report_views import SalesSummaryView, SalesHistoryView, CompletedReturnsView
+from pos_app.views.item_views import ItemListCreateView, ItemDetailView, ItemSearchView, ItemImportView, ReduceStockView, LowStockView
+from pos_app.views.sale_views import SaleListCreateView, SaleEditView, UpdateItemQuantityView, update_sales, delete_sale, UpdateSaleTotalView, SaleVoidView
+from pos_app.views.report_views import SalesSummaryView, SalesHistoryView, CompletedReturnsView, SalesExportView
 from pos_app.views.rating_views import StaffRatingsView
+from pos_app.views.return_views import SaleReturnListCreateView
+from pos_app.views.receipt_views import SaleReceiptView, ReprintReceiptsView
+from pos_app.views.shift_views import ShiftListView, OpenShiftView, CloseShiftView, ZReportView
+from pos_app.views.scan_views import ScanView, BatchScanView
+from pos_app.views.stock_views import StockAdjustmentListCreateView
+from pos_app.views.analytics_views import HourlyHeatmapView, TopItemsView, BasketAffinityView, StaffPerformanceView
+from pos_app.views.pricing_views import PricingQuoteView
+from pos_app.views.task_views import TaskListCreateView, TaskDetailView
 
 def api_home(request):
     return JsonResponse({
@@ -17,7 +25,8 @@ def api_home(request):
             "register": "/v1/register/",
             "items": "/v1/items/",
             "sales": "/v1/sales/",
-            "reports": "/v1/sales/summary/"
+            "reports": "/v1/sales/summary/",
+            "analytics": "/v1/analytics/"
         }
     })
 
@@ -33,22 +42,58 @@ urlpatterns = [
     
     # Item Management
     path("v1/items/", ItemListCreateView.as_view(), name="items"),
+    path("v1/items/search/", ItemSearchView.as_view(), name="item_search"),
+    path("v1/items/import/", ItemImportView.as_view(), name="item_import"),
+    path("v1/items/low-stock/", LowStockView.as_view(), name="low_stock"),
     path("v1/items/<int:pk>/", ItemDetailView.as_view(), name="item_detail"),
     path("v1/items/<int:item_id>/reduce-stock/", ReduceStockView.as_view(), name="reduce_stock"),  
 
+    # Stock Counts & Deliveries
+    path("v1/stock/adjustments/", StockAdjustmentListCreateView.as_view(), name="stock_adjustments"),
+
+    # Barcode Scanning
+    path("v1/scan/", BatchScanView.as_view(), name="scan_batch"),
+    path("v1/scan/<str:code>/", ScanView.as_view(), name="scan"),
+
     # Sales Management
     path("v1/sales/", SaleListCreateView.as_view(), name="sales"),
     path('v1/update-item-quantity/', UpdateItemQuantityView.as_view(), name='update-item-quantity'),
+    path("v1/sales/void/", SaleVoidView.as_view(), name="sale_void"),
     path("v1/sales/<int:pk>/edit/", SaleEditView.as_view(), name="sale_edit"),
     path("v1/sales/<int:sale_id>/delete/", delete_sale, name="sale_delete"),
     path('v1/update-sales/', update_sales, name='update-sales'),
+    path("v1/sales/<int:sale_id>/returns/", SaleReturnListCreateView.as_view(), name="sale_returns"),
     path("v1/sales/<int:sale_id>/update-total/", UpdateSaleTotalView.as_view(), name="update_sale_total"),  
 
+    # Pricing
+    path("v1/pricing/quote/", PricingQuoteView.as_view(), name="pricing_quote"),
+
+    # Shifts
+    path("v1/shifts/", ShiftListView.as_view(), name="shifts"),
+    path("v1/shifts/open/", OpenShiftView.as_view(), name="shift_open"),
+    path("v1/shifts/<int:shift_id>/close/", CloseShiftView.as_view(), name="shift_close"),
+    path("v1/shifts/<int:shift_id>/z-report/", ZReportView.as_view(), name="shift_z_report"),
+
+    # Receipts
+    path("v1/sales/<int:sale_id>/receipt/", SaleReceiptView.as_view(), name="sale_receipt"),
+    path("v1/receipts/reprint/", ReprintReceiptsView.as_view(), name="reprint_receipts"),
+
     # Sales Reports & History
     path("v1/sales/history/<int:user_id>/", SalesHistoryView.as_view(), name="sales_history"),
     path("v1/sales/returns/", CompletedReturnsView.as_view(), name="completed_returns"),
     path("v1/sales/summary/", SalesSummaryView.as_view(), name="sales_summary"),
+    path("v1/sales/export/", SalesExportView.as_view(), name="sales_export"),
     
+    # Sales Analytics
+    path("v1/analytics/heatmap/", HourlyHeatmapView.as_view(), name="analytics_heatmap"),
+    path("v1/analytics/top-items/", TopItemsView.as_view(), name="analytics_top_items"),
+    path("v1/analytics/affinity/", BasketAffinityView.as_view(), name="analytics_affinity"),
+    path("v1/analytics/staff-performance/", StaffPerformanceView.as_view(), name="analytics_staff_performance"),
+
     # Staff Ratings
     path("v1/staff/ratings/", StaffRatingsView.as_view(), name="staff_ratings"),
+
+    # Background Tasks
+    path("v1/tasks/", TaskListCreateView.as_view(), name="tasks"),
+    path("v1/tasks/<int:pk>/", TaskDetailView.as_view(), name="task_detail"),
 ]
\ No newline at end of file
@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from pos_app.db_router import ReplicaReadMixin
+from pos_app.permissions import IsManager, IsSuperuser
+from pos_app.services import query_cache
+
+
+class AnalyticsView(ReplicaReadMixin, APIView):
+    """Base view for date-range analytics (``?start=YYYY-MM-DD&end=YYYY-MM-DD``, default last 30 days; ``&fresh=1`` skips the replica)"""
+    permission_classes = [IsManager | IsSuperuser]
+    default_days = 30
+    max_limit = 100
+    # Cached results are also dropped when these change, on top of the sales in the range
+    tags = ["items"]
+
+    def get_range(self, request):
+        end = request.query_params.get("end")
+        start = request.query_params.get("start")
+        try:
+            end = parse_date(end) if end else timezone.localdate()
+            start = parse_date(start) if start else (end - timedelta(days=self.default_days - 1) if end else None)
+        except ValueError:
+            # Well formed but impossible, e.g. 2024-02-30
+            return None
+        if not start or not end or start > end:
+            return None
+        return start, end
+
+    def get_limit(self, request, default):
+        try:
+            limit = int(request.query_params.get("limit", default))
+        except (TypeError, ValueError):
+            return None
+        return limit if 0 < limit <= self.max_limit else None
+
+    def get(self, request):
+        date_range = self.get_range(request)
+        if date_range is None:
+            return Response({"error": "Invalid date range"}, status=status.HTTP_400_BAD_REQUEST)
+
+        params = self.get_params(request)
+        if params is None:
+            return Response({"error": "Invalid limit"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # NumPy is only imported once analytics are actually requested, keeping it off cold starts
+        from pos_app.services import analytics
+
+        start, end = date_range
+        compute = getattr(analytics, self.compute)
+        data = query_cache.cached(
+            f"analytics:{self.report}", query_cache.month_tags(start, end) + self.tags, compute, start=start, end=end, **params,
+        )
+        return Response({"start": start, "end": end, "results": data})
+
+    def get_params(self, request):
+        return {}
+
+
+class HourlyHeatmapView(AnalyticsView):
+    report = "heatmap"
+    compute = "hourly_heatmap"
+
+
+class TopItemsView(AnalyticsView):
+    report = "top_items"
+    compute = "top_items"
+
+    def get_params(self, request):
+        limit = self.get_limit(request, 10)
+        return {"limit": limit} if limit else None
+
+
+class BasketAffinityView(AnalyticsView):
+    report = "affinity"
+    compute = "basket_affinity"
+
+    def get_params(self, request):
+        limit = self.get_limit(request, 20)
+        return {"limit": limit} if limit else None
+
+
+class StaffPerformanceView(AnalyticsView):
+    """Per staff sales per active hour, basket size, items per sale and ratings, with rating correlations"""
+    report = "staff_performance"
+    compute = "staff_performance"
+    tags = ["users", "ratings"]
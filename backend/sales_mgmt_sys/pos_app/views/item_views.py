@@ -1,15 +1,35 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import generics, status
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from pos_app.models.item import Item
 from pos_app.models.sale import Sale
+from pos_app.models.item_forecast import ItemForecast
 from pos_app.serializers.item_serializer import ItemSerializer
+from pos_app.serializers.item_forecast_serializer import ItemForecastSerializer
 from pos_app.serializers.sale_serializer import SaleUpdateSerializer
 from pos_app.permissions import IsManager, IsSuperuser  
+from pos_app.services import catalog, item_import, outbox, stock
 
 class ItemListCreateView(generics.ListCreateAPIView):
+    """
+    Active items. ``?fields=item_id,item_name,price`` trims each item to
+    those fields (``item_id`` is always kept).
+
+    ``?since=<cursor>`` returns only what changed after the ``cursor`` of an
+    earlier sync, as ``{"items": [...], "removed": [item_id, ...], "cursor": ..., "full": false}``.
+    ``removed`` lists items deleted or deactivated since; when ``since`` is
+    too old to answer with a delta, ``full`` is true and ``items`` is the
+    whole catalog. Items can come again in the next delta, so apply them as upserts.
+    """
     queryset = Item.objects.filter(is_active=True)
     serializer_class = ItemSerializer
+    sparse_fields = None
 
     def get_permissions(self):
         """
@@ -17,32 +37,150 @@ class ItemListCreateView(generics.ListCreateAPIView):
         - Only Managers & Superusers can create new items (POST request).
         """
         if self.request.method == "POST":
-            return [IsManager() | IsSuperuser()]
+            return [(IsManager | IsSuperuser)()]
         return [IsAuthenticated()]
+
+    def get_serializer(self, *args, **kwargs):
+        if self.sparse_fields is not None:
+            kwargs.setdefault("fields", self.sparse_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.sparse_fields is not None:
+            # Only load the columns being sent; barcodes come from the price-list snapshot
+            queryset = queryset.only(*[name for name in self.sparse_fields if name != "barcodes"])
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        fields = request.query_params.get("fields")
+        if fields:
+            names = ["item_id"] + [name.strip() for name in fields.split(",") if name.strip() and name.strip() != "item_id"]
+            unknown = sorted(set(names) - set(ItemSerializer.Meta.fields))
+            if unknown:
+                return Response({"error": f"Unknown fields: {', '.join(unknown)}"}, status=status.HTTP_400_BAD_REQUEST)
+            self.sparse_fields = names
+
+        since = request.query_params.get("since")
+        if since is None:
+            return super().list(request, *args, **kwargs)
+
+        try:
+            since = parse_datetime(since)
+        except ValueError:
+            since = None
+        if since is None:
+            return Response({"error": "since must be a cursor returned by an earlier sync"}, status=status.HTTP_400_BAD_REQUEST)
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+
+        delta = catalog.changes(since, self.get_queryset())
+        if delta is None:
+            cursor = timezone.now()
+            items = self.get_serializer(self.get_queryset(), many=True).data
+            return Response({"items": items, "removed": [], "cursor": cursor, "full": True})
+        items, removed, cursor = delta
+        return Response({"items": self.get_serializer(items, many=True).data, "removed": removed, "cursor": cursor, "full": False})
+
+class ItemSearchView(generics.GenericAPIView):
+    """Ranked item search on ``?q=``: exact, prefix and word-prefix matches first, then typo-tolerant ones"""
+    serializer_class = ItemSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"error": "q is required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), 100)
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        from pos_app.services import search
+
+        matches = search.search(query, limit)
+        items = Item.objects.in_bulk([item_id for item_id, _, _ in matches])
+        results = []
+        for item_id, _, score in matches:
+            if item_id in items:
+                results.append(dict(self.get_serializer(items[item_id]).data, score=score))
+        return Response(results)
+
 class ItemDetailView(generics.RetrieveUpdateAPIView):
     queryset = Item.objects.all()
     serializer_class = ItemSerializer
     permission_classes = [IsManager | IsSuperuser]  
 
+    def perform_update(self, serializer):
+        # A quantity set by hand moves stock like a sale does, so it is published in the same transaction
+        with transaction.atomic():
+            row = Item.objects.filter(pk=serializer.instance.pk)
+            # A no-op write locks the row (SQLite ignores select_for_update), so no sale can commit between this read and the save
+            row.update(quantity=F("quantity"))
+            before = row.values_list("quantity", flat=True).get()
+            item = serializer.save()
+            outbox.emit(outbox.stock_events({item.pk: item.quantity - before}))
+
+class ItemImportView(APIView):
+    """
+    Bulk upsert of items from an uploaded ``file`` (CSV with a header row, or NDJSON).
+
+    Rows match existing items on ``sku``, else on ``item_name``. Valid rows are
+    applied and invalid ones reported by line; ``?strict=1`` applies nothing
+    unless every row is valid and ``?dry_run=1`` only validates.
+    """
+    permission_classes = [IsManager | IsSuperuser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "Upload the items as 'file'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        flags = {name: request.query_params.get(name) in ("1", "true") for name in ("dry_run", "strict")}
+        try:
+            fmt = item_import.detect_format(upload.name, upload.content_type or "")
+            result = item_import.import_items(upload.file, fmt, **flags)
+        except item_import.ItemImportError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        code = status.HTTP_200_OK if result["applied"] or result["dry_run"] else status.HTTP_400_BAD_REQUEST
+        return Response(result, status=code)
+
 class ReduceStockView(generics.UpdateAPIView):
     permission_classes = [IsAuthenticated]
 
     def put(self, request, item_id, *args, **kwargs):
         """Reduce stock quantity when a sale is made"""
-        try:
-            item = Item.objects.get(id=item_id)
-            quantity_sold = request.data.get("quantity", 0)
+        quantity_sold = request.data.get("quantity", 0)
 
-            if not isinstance(quantity_sold, int) or quantity_sold <= 0:
-                return Response({"error": "Invalid quantity"}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(quantity_sold, int) or quantity_sold <= 0:
+            return Response({"error": "Invalid quantity"}, status=status.HTTP_400_BAD_REQUEST)
 
-            if item.quantity < quantity_sold:
-                return Response({"error": "Insufficient stock"}, status=status.HTTP_400_BAD_REQUEST)
+        if not Item.objects.filter(item_id=item_id).exists():
+            return Response({"error": "Item not found"}, status=status.HTTP_404_NOT_FOUND)
 
-            item.quantity -= quantity_sold
-            item.save()
+        try:
+            with transaction.atomic():
+                stock.apply_deltas({item_id: -quantity_sold})
+                outbox.emit(outbox.stock_events({item_id: -quantity_sold}))
+        except stock.InsufficientStock:
+            return Response({"error": "Insufficient stock"}, status=status.HTTP_400_BAD_REQUEST)
 
-            return Response({"message": "Stock updated successfully"}, status=status.HTTP_200_OK)
+        return Response({"message": "Stock updated successfully"}, status=status.HTTP_200_OK)
 
-        except Item.DoesNotExist:
-            return Response({"error": "Item not found"}, status=status.HTTP_404_NOT_FOUND)
+class LowStockView(generics.ListAPIView):
+    """Items forecast to run out within ``?days=`` days (default 7), read from the nightly forecasts"""
+    serializer_class = ItemForecastSerializer
+    permission_classes = [IsManager | IsSuperuser]
+
+    def get_queryset(self):
+        try:
+            days = float(self.request.query_params.get("days", 7))
+        except (TypeError, ValueError):
+            days = 7
+        return (
+            ItemForecast.objects.filter(days_until_stockout__lte=days)
+            .select_related("item")
+            .order_by("days_until_stockout")
+        )
@@ -0,0 +1,62 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from pos_app.serializers.sale_serializer import SaleItemSerializer
+from pos_app.services import pricing
+from pos_app.services.pricelist import get_price_list
+
+
+class PricingQuoteView(APIView):
+    """
+    POST ``{"sale_items": [{"item": id, "quantity": n}], "at": optional ISO time}`` to price a
+    basket with the current promotions and tax rules without recording a sale
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = SaleItemSerializer(data=request.data.get("sale_items"), many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        if not serializer.validated_data:
+            return Response({"error": "sale_items must not be empty"}, status=status.HTTP_400_BAD_REQUEST)
+
+        at = request.data.get("at") or None
+        if at is not None:
+            try:
+                at = parse_datetime(at) if isinstance(at, str) else None
+            except ValueError:
+                at = None
+            if at is None:
+                return Response({"error": "at must be an ISO 8601 date and time"}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(at):
+                at = timezone.make_aware(at)
+
+        price_list = get_price_list()
+        table = pricing.get_table()
+        basket = pricing.quote(
+            [(line["item_id"], line["quantity"], price_list.get(line["item_id"]).price) for line in serializer.validated_data],
+            at=at,
+            table=table,
+        )
+        return Response({
+            "lines": [
+                {
+                    "item": line.item_id,
+                    "item_name": price_list.get(line.item_id).item_name,
+                    "quantity": line.quantity,
+                    "unit_price": line.unit_price,
+                    "discount": line.discount,
+                    "tax": line.tax,
+                    "subtotal": line.subtotal,
+                    "promotions": [table.names.get(rule_id) for rule_id in line.promotions],
+                }
+                for line in basket.lines
+            ],
+            "discount": basket.discount,
+            "tax": basket.tax,
+            "total_amount": basket.total,
+        })
@@ -1,10 +1,19 @@
 from rest_framework import generics
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from pos_app.models.rating import Rating
 from pos_app.serializers.rating_serializer import RatingSerializer
 from pos_app.permissions import IsManager, IsSuperuser  
+from pos_app.services import query_cache
 
 class StaffRatingsView(generics.ListAPIView):
     queryset = Rating.objects.all()
     serializer_class = RatingSerializer
     permission_classes = [IsManager | IsSuperuser]
+
+    def list(self, request, *args, **kwargs):
+        # Cached as serialized data; rating or staff changes invalidate it
+        return Response(query_cache.cached("ratings", ["ratings", "users"], self.serialize))
+
+    def serialize(self):
+        return self.get_serializer(self.get_queryset().select_related("staff"), many=True).data
@@ -0,0 +1,74 @@
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from pos_app.models.sale import Sale
+from pos_app.permissions import IsCashier, IsManager, IsSuperuser
+from pos_app.services import receipts
+
+
+def _receipt_type(request):
+    # ``format`` is reserved by DRF for renderer negotiation, so receipts use ``type``
+    fmt = request.query_params.get("type", "text")
+    return fmt if fmt in receipts.FORMATS else None
+
+
+class SaleReceiptView(APIView):
+    """Printable receipt for a sale (``?type=text|html|pdf``); POST ``{"email": ...}`` to email it. Voided sales have none."""
+
+    def get_permissions(self):
+        """
+        - All authenticated users can print a receipt (GET request).
+        - Only Cashiers, Managers & Superusers can email one (POST request).
+        """
+        if self.request.method == "POST":
+            return [(IsCashier | IsManager | IsSuperuser)()]
+        return [IsAuthenticated()]
+
+    def get(self, request, sale_id):
+        fmt = _receipt_type(request)
+        if fmt is None:
+            return Response({"error": "Invalid receipt type"}, status=status.HTTP_400_BAD_REQUEST)
+
+        sale = get_object_or_404(Sale.objects.only("sale_id", "updated_at"), sale_id=sale_id, is_void=False)
+        return HttpResponse(receipts.get_receipt(sale, fmt), content_type=receipts.FORMATS[fmt])
+
+    def post(self, request, sale_id):
+        recipient = request.data.get("email")
+        try:
+            validate_email(recipient)
+        except ValidationError:
+            return Response({"error": "A valid email is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        get_object_or_404(Sale.objects.only("sale_id"), sale_id=sale_id, is_void=False)
+        if not receipts.email_receipt(sale_id, recipient):
+            return Response({"error": "Receipt queue is busy, try again shortly"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response({"message": "Receipt queued for delivery"}, status=status.HTTP_202_ACCEPTED)
+
+
+class ReprintReceiptsView(APIView):
+    """Reprint every receipt for ``?date=YYYY-MM-DD`` (default today) as one document"""
+    permission_classes = [IsCashier | IsManager | IsSuperuser]
+
+    def get(self, request):
+        fmt = _receipt_type(request)
+        day = request.query_params.get("date")
+        try:
+            day = parse_date(day) if day else timezone.localdate()
+        except ValueError:
+            day = None
+        if fmt is None or day is None:
+            return Response({"error": "Invalid receipt type or date"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            document = receipts.reprint_day(day, fmt)
+        except receipts.RenderTimeout:
+            return Response({"error": "Receipts are taking too long to render, try again shortly"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return HttpResponse(document, content_type=receipts.FORMATS[fmt])
@@ -1,30 +1,89 @@
+import csv
+
+from django.db.models import Sum
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_date
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from pos_app.models.sale import Sale
 from pos_app.models.rating import Rating
+from pos_app.models.archive_rollup import ArchiveStaffRollup
+from pos_app.db_router import ReplicaReadMixin, bind
+from pos_app.services import archive, query_cache, returns
 from pos_app.permissions import IsCashier, IsSuperuser, IsManager, IsWaiter  
+from pos_app.views.analytics_views import AnalyticsView
 
-class SalesSummaryView(APIView):
-    permission_classes = [IsManager | IsSuperuser]
-
-    def get(self, request):
-        return Response({"message": "Sales summary coming soon"})
+class SalesSummaryView(AnalyticsView):
+    """Totals, daily series and staff breakdown for ``?start=&end=`` (default last 30 days)"""
+    report = "summary"
+    compute = "sales_summary"
+    tags = ["users"]
 
-class SalesHistoryView(APIView):
+class SalesHistoryView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, user_id):
         user = request.user
 
         if user.role in ["Manager", "Superuser"] or user.user_id == user_id:
-            sales = Sale.objects.filter(staff_id=user_id)
-            return Response({"sales": sales.count()})
+            sales = query_cache.cached("sales_history", [query_cache.staff_tag(user_id)], count_sales, staff_id=user_id)
+            return Response({"sales": sales})
 
         return Response({"error": "You are not allowed to view this sales history."}, status=403)
 
-class CompletedReturnsView(APIView):
-    permission_classes = [IsCashier | IsSuperuser]
+def count_sales(staff_id):
+    live = Sale.objects.filter(staff_id=staff_id, is_void=False).count()
+    archived = ArchiveStaffRollup.objects.filter(staff_id=staff_id).aggregate(n=Sum("sale_count"))["n"] or 0
+    return live + archived
+
+class CompletedReturnsView(ReplicaReadMixin, APIView):
+    """Returns per day and in total for ``?start=&end=``, served from the daily returns rollup"""
+    permission_classes = [IsCashier | IsManager | IsSuperuser]
 
     def get(self, request):
-        return Response({"message": "Completed returns coming soon"})
+        start = request.query_params.get("start")
+        end = request.query_params.get("end")
+        try:
+            start = parse_date(start) if start else None
+            end = parse_date(end) if end else None
+        except ValueError:
+            return Response({"error": "Invalid date range"}, status=400)
+        return Response(returns.report(start, end))
+
+
+class _Echo:
+    """File-like object whose ``write`` hands rows straight back to the streaming response."""
+    def write(self, value):
+        return value
+
+
+class SalesExportView(ReplicaReadMixin, APIView):
+    """CSV export of sale lines for ``?start=&end=`` covering both live and archived sales"""
+    permission_classes = [IsManager | IsSuperuser]
+
+    def get(self, request):
+        start = request.query_params.get("start")
+        end = request.query_params.get("end")
+        try:
+            start = parse_date(start) if start else None
+            end = parse_date(end) if end else None
+        except ValueError:
+            return Response({"error": "Invalid date range"}, status=400)
+
+        writer = csv.writer(_Echo())
+        header = ["sale_id", "sale_date", "staff_id", "total_amount", "sale_item_id", "item_id", "quantity", "subtotal", "archived"]
+
+        def rows():
+            yield writer.writerow(header)
+            for sale in archive.iter_sales(start, end):
+                for line in sale["lines"]:
+                    yield writer.writerow([
+                        sale["sale_id"], sale["sale_date"], sale["staff_id"], sale["total_amount"],
+                        line["sale_item_id"], line["item_id"], line["quantity"], line["subtotal"], sale["archived"],
+                    ])
+
+        # The rows are produced after this view returns, so they keep its replica routing explicitly
+        response = StreamingHttpResponse(bind(rows()), content_type="text/csv")
+        response["Content-Disposition"] = 'attachment; filename="sales.csv"'
+        return response
@@ -0,0 +1,39 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import generics
+from rest_framework.permissions import BasePermission
+
+from pos_app.models.sale import Sale
+from pos_app.models.sale_return import SaleReturn
+from pos_app.serializers.return_serializer import PurchaseReturnSerializer
+
+
+class CanProcessReturnPermission(BasePermission):
+    """Only Cashiers, Managers, and Supervisors can refund sales (Superusers always allowed)"""
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.is_superuser or request.user.role in ["Cashier", "Manager", "Supervisor"]
+        )
+
+
+class SaleReturnListCreateView(generics.ListCreateAPIView):
+    """Returns made against a sale; POST ``{"items": [{"sale_item", "quantity"}], "reason"}`` to refund"""
+    serializer_class = PurchaseReturnSerializer
+    permission_classes = [CanProcessReturnPermission]
+
+    def get_sale(self):
+        if not hasattr(self, "_sale"):
+            self._sale = get_object_or_404(Sale.objects.filter(is_void=False).prefetch_related("sale_items"), sale_id=self.kwargs["sale_id"])
+        return self._sale
+
+    def get_queryset(self):
+        return (
+            SaleReturn.objects.filter(sale_id=self.kwargs["sale_id"])
+            .prefetch_related("lines__item")
+            .order_by("return_id")
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method == "POST":
+            context["sale"] = self.get_sale()
+        return context
@@ -1,3 +1,5 @@
+import logging
+from decimal import Decimal
 from rest_framework import generics, permissions, status, views
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
@@ -9,6 +11,10 @@ from django.db import transaction
 from pos_app.models.sale import Sale
 from pos_app.models.item import Item  
 from pos_app.serializers.sale_serializer import SaleSerializer, SaleUpdateSerializer
+from pos_app.services import outbox, receipts, shifts, stock, voids
+
+logger = logging.getLogger(__name__)
+
 class CanCreateSalePermission(BasePermission):
     """Only Waiters, Managers, Cashiers, and Supervisors can create sales (Superusers always allowed)"""
     def has_permission(self, request, view):
@@ -33,7 +39,7 @@ class CanDeleteSalePermission(BasePermission):
         )
 
 class SaleListCreateView(generics.ListCreateAPIView):
-    queryset = Sale.objects.all()
+    queryset = Sale.objects.filter(is_void=False).prefetch_related("sale_items")
     serializer_class = SaleSerializer
 
     def get_permissions(self):
@@ -44,19 +50,21 @@ class SaleListCreateView(generics.ListCreateAPIView):
 
     def perform_create(self, serializer):
         sale = serializer.save()
+        # Receipts render in the background once the sale is committed
+        transaction.on_commit(lambda: receipts.prerender(sale.sale_id))
                 
     def create(self, request, *args, **kwargs):
-        print("Received Data:", request.data)  
+        logger.debug("Received sale: %s", request.data)
         serializer = self.get_serializer(data=request.data)
     
         if not serializer.is_valid():
-            print("Serializer Errors:", serializer.errors) 
+            logger.debug("Rejected sale: %s", serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         return super().create(request, *args, **kwargs)
 
 class SaleEditView(generics.UpdateAPIView):
-    queryset = Sale.objects.all()
+    queryset = Sale.objects.filter(is_void=False)
     serializer_class = SaleUpdateSerializer
     permission_classes = [CanEditSalePermission]
 
@@ -66,62 +74,79 @@ class SaleEditView(generics.UpdateAPIView):
 @api_view(["DELETE"])
 @permission_classes([CanDeleteSalePermission])
 def delete_sale(request, sale_id):
-    try:
-        sale = Sale.objects.get(sale_id=sale_id)
-        sale.delete()
-        return Response({"message": "Sale deleted successfully"}, status=status.HTTP_200_OK)
-    except Sale.DoesNotExist:
+    # Deleting voids the sale: its stock and shift totals are reversed but the record stays for the audit trail
+    result = voids.void_sales([sale_id], staff=request.user)
+    if not result["voided"]:
         return Response({"error": "Sale not found"}, status=status.HTTP_404_NOT_FOUND)
+    return Response({"message": "Sale deleted successfully"}, status=status.HTTP_200_OK)
+
+class SaleVoidView(APIView):
+    """POST ``{"sale_ids": [...], "reason": ""}`` to void many sales at once, e.g. test sales at end of day"""
+    permission_classes = [CanDeleteSalePermission]
+
+    def post(self, request, *args, **kwargs):
+        sale_ids = request.data.get("sale_ids")
+        reason = request.data.get("reason", "")
+        if (not isinstance(sale_ids, list) or not sale_ids
+                or not all(isinstance(sale_id, int) and not isinstance(sale_id, bool) for sale_id in sale_ids)):
+            return Response({"error": "sale_ids must be a non-empty list of sale IDs"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(sale_ids) > voids.MAX_SALES:
+            return Response({"error": f"At most {voids.MAX_SALES} sales can be voided at once"}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(reason, str):
+            return Response({"error": "reason must be a string"}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = voids.void_sales(sale_ids, staff=request.user, reason=reason[:255])
+        return Response(result, status=status.HTTP_200_OK)
 
 @api_view(["POST"])
 @permission_classes([CanEditSalePermission])
 def update_sales(request):
-    print("Raw Request Data:", request.data) 
-
     sold_items = request.data.get("sale_items", [])
 
     if not isinstance(sold_items, list) or not sold_items:
         return Response({"error": "Invalid or missing sale_items"}, status=400)
 
-    try:
-        with transaction.atomic(): 
-            for sale_item in sold_items:
-                print("Processing Sale Item:", sale_item)  
-                
-                item_id = sale_item.get("item")
-                quantity_sold = sale_item.get("quantity", 0)
-
-                if not item_id or quantity_sold <= 0:
-                    return Response({"error": "Invalid item data"}, status=400)
-
-                item = Item.objects.filter(item_id=item_id).first()
-                if not item:
-                    return Response({"error": f"Item ID {item_id} not found"}, status=404)
+    lines = []
+    for sale_item in sold_items:
+        item_id = sale_item.get("item") if isinstance(sale_item, dict) else None
+        quantity_sold = sale_item.get("quantity", 0) if isinstance(sale_item, dict) else 0
 
-                if item.quantity < quantity_sold:
-                    return Response({"error": f"Not enough stock for {item.item_name}"}, status=400)
+        if not isinstance(item_id, int) or not isinstance(quantity_sold, int) or quantity_sold <= 0:
+            return Response({"error": "Invalid item data"}, status=400)
+        lines.append((item_id, -quantity_sold))
 
-                item.quantity -= quantity_sold
-                item.save()
+    deltas = stock.combine(lines)
+    names = dict(Item.objects.filter(item_id__in=list(deltas)).values_list("item_id", "item_name"))
+    missing = [item_id for item_id in deltas if item_id not in names]
+    if missing:
+        return Response({"error": f"Item ID {missing[0]} not found"}, status=404)
 
-        return Response({"message": "Stock updated successfully"}, status=200)
+    try:
+        # One conditional UPDATE for the whole basket: either every line is in stock or nothing changes
+        with transaction.atomic():
+            stock.apply_deltas(deltas)
+            outbox.emit(outbox.stock_events(deltas))
+    except stock.InsufficientStock as e:
+        return Response({"error": f"Not enough stock for {names[min(e.items)]}"}, status=400)
 
-    except Exception as e:
-        print("Unexpected Error:", str(e)) 
-        return Response({"error": "Something went wrong. Please try again."}, status=500)
+    return Response({"message": "Stock updated successfully"}, status=200)
 
 @api_view(["PATCH"])
 @permission_classes([CanEditSalePermission])
 def update_total_amount(request, sale_id):
     try:
-        sale = Sale.objects.get(sale_id=sale_id)
+        sale = Sale.objects.get(sale_id=sale_id, is_void=False)
         amount_sold = request.data.get("amount_sold", 0)
 
         if not isinstance(amount_sold, (int, float)) or amount_sold <= 0:
             return Response({"error": "Invalid amount"}, status=status.HTTP_400_BAD_REQUEST)
 
-        sale.total_amount += amount_sold
-        sale.save()
+        amount = Decimal(str(amount_sold))
+        with transaction.atomic():
+            sale.total_amount += amount
+            sale.save()
+            shifts.record(sale.shift_id, revenue=amount)
+            outbox.emit([outbox.sale_event("sale.edited", sale, revenue=amount, stock={})])
 
         return Response({"message": "Total amount updated successfully"}, status=status.HTTP_200_OK)
 
@@ -129,21 +154,25 @@ def update_total_amount(request, sale_id):
         return Response({"error": "Sale not found"}, status=status.HTTP_404_NOT_FOUND)
 
 class UpdateSaleTotalView(UpdateAPIView):
-    queryset = Sale.objects.all()
+    queryset = Sale.objects.filter(is_void=False)
     serializer_class = SaleUpdateSerializer
     permission_classes = [CanEditSalePermission]
 
     def put(self, request, sale_id, *args, **kwargs):
         """Increase total amount of a sale"""
         try:
-            sale = Sale.objects.get(sale_id=sale_id)
+            sale = Sale.objects.get(sale_id=sale_id, is_void=False)
             amount_to_add = request.data.get("amount", 0)
 
             if not isinstance(amount_to_add, (int, float)) or amount_to_add <= 0:
                 return Response({"error": "Invalid amount"}, status=status.HTTP_400_BAD_REQUEST)
 
-            sale.total_amount += amount_to_add
-            sale.save()
+            amount = Decimal(str(amount_to_add))
+            with transaction.atomic():
+                sale.total_amount += amount
+                sale.save()
+                shifts.record(sale.shift_id, revenue=amount)
+                outbox.emit([outbox.sale_event("sale.edited", sale, revenue=amount, stock={})])
 
             return Response({"message": "Sale total amount updated successfully"}, status=status.HTTP_200_OK)
 
@@ -158,23 +187,19 @@ class UpdateItemQuantityView(APIView):
         serializer = SaleSerializer(data=request.data)
         
         if serializer.is_valid():
-            sale_data = serializer.validated_data
-            items_sold = sale_data.get('items', [])  
-            
-            for item_data in items_sold:
-                item_id = item_data.get('item_id')
-                quantity_sold = item_data.get('quantity')
-
-                item = get_object_or_404(Item, id=item_id)
-
-                if item.stock >= quantity_sold:
-                    item.stock -= quantity_sold
-                    item.save()
-                else:
-                    return Response(
-                        {"error": f"Not enough stock for item {item.name}"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
+            items_sold = serializer.validated_data.get("sale_items", [])
+            deltas = stock.combine((item_data["item_id"], -item_data["quantity"]) for item_data in items_sold)
+
+            try:
+                with transaction.atomic():
+                    stock.apply_deltas(deltas)
+                    outbox.emit(outbox.stock_events(deltas))
+            except stock.InsufficientStock as e:
+                item = Item.objects.get(item_id=min(e.items))
+                return Response(
+                    {"error": f"Not enough stock for item {item.item_name}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
             return Response({"message": "Stock updated successfully"}, status=status.HTTP_200_OK)
         
@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from pos_app.services import scan
+
+MAX_BATCH_CODES = 500
+
+
+def _as_json(item):
+    return dict(item, price=str(item["price"]))
+
+
+class ScanView(APIView):
+    """Resolve a single SKU or barcode to its item, price and stock"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, code):
+        code = code.strip()
+        item = scan.resolve([code])[code]
+        if item is None:
+            return Response({"error": "Unknown code"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(_as_json(item))
+
+
+class BatchScanView(APIView):
+    """Resolve a whole scanned basket (``{"codes": [...]}``, one entry per scan) in one call"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        codes = request.data.get("codes")
+        if not isinstance(codes, list) or not codes or not all(isinstance(c, str) for c in codes):
+            return Response({"error": "codes must be a non-empty list of strings"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(codes) > MAX_BATCH_CODES:
+            return Response({"error": f"At most {MAX_BATCH_CODES} codes per request"}, status=status.HTTP_400_BAD_REQUEST)
+
+        codes = [code.strip() for code in codes]
+        resolved = scan.resolve(list(dict.fromkeys(codes)))
+
+        # One line per item in first-scan order; scanning a code twice means two units
+        lines, unknown = {}, []
+        for code in codes:
+            item = resolved[code]
+            if item is None:
+                unknown.append(code)
+                continue
+            line = lines.get(item["item_id"])
+            if line is None:
+                line = lines[item["item_id"]] = dict(item, count=0)
+            line["count"] += 1
+
+        total = Decimal("0.00")
+        results = []
+        for line in lines.values():
+            subtotal = line["price"] * line["count"]
+            if line["is_active"]:
+                total += subtotal
+            results.append(dict(_as_json(line), subtotal=str(subtotal), in_stock=line["quantity"] >= line["count"]))
+
+        return Response({"lines": results, "unknown": unknown, "total": str(total)})
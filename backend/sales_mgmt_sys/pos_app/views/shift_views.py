@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from pos_app.models.shift import Shift
+from pos_app.permissions import IsManager, IsSupervisor, IsSuperuser
+from pos_app.serializers.shift_serializer import ShiftSerializer
+from pos_app.services import shifts
+
+User = get_user_model()
+
+
+def _oversees(user, staff_id):
+    """Staff run their own shifts; Managers, Supervisors and Superusers may run anyone's."""
+    return user.user_id == staff_id or user.is_superuser or user.role in ["Manager", "Supervisor", "Superuser"]
+
+
+class ShiftListView(generics.ListAPIView):
+    """Shifts with their running totals; ``?open=true`` for the ones still running, ``?staff=`` to filter"""
+    serializer_class = ShiftSerializer
+    permission_classes = [IsManager | IsSupervisor | IsSuperuser]
+
+    def get_queryset(self):
+        queryset = Shift.objects.select_related("staff").order_by("-opened_at")
+        if self.request.query_params.get("open") in ("1", "true"):
+            queryset = queryset.filter(closed_at__isnull=True)
+        staff = self.request.query_params.get("staff")
+        if staff and staff.isdigit():
+            queryset = queryset.filter(staff_id=int(staff))
+        return queryset
+
+
+class OpenShiftView(APIView):
+    """Open a shift for the caller, or for ``{"staff": id}`` when a supervisor opens it on their behalf"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        staff_id = request.data.get("staff", request.user.user_id)
+        if not isinstance(staff_id, int):
+            return Response({"error": "staff must be a user id"}, status=status.HTTP_400_BAD_REQUEST)
+        if not _oversees(request.user, staff_id):
+            return Response({"error": "You are not allowed to open a shift for this user."}, status=status.HTTP_403_FORBIDDEN)
+
+        staff = get_object_or_404(User, user_id=staff_id, is_active=True)
+        try:
+            shift = shifts.open_shift(staff, opened_by=request.user)
+        except shifts.ShiftError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(ShiftSerializer(shift).data, status=status.HTTP_201_CREATED)
+
+
+class CloseShiftView(APIView):
+    """Close a shift and return its Z-report"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, shift_id):
+        shift = get_object_or_404(Shift.objects.select_related("staff"), shift_id=shift_id)
+        if not _oversees(request.user, shift.staff_id):
+            return Response({"error": "You are not allowed to close this shift."}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            shift = shifts.close_shift(shift, closed_by=request.user)
+        except shifts.ShiftError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(shifts.z_report(shift))
+
+
+class ZReportView(APIView):
+    """Totals for a shift, read straight from its running counters"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, shift_id):
+        shift = get_object_or_404(Shift.objects.select_related("staff"), shift_id=shift_id)
+        if not _oversees(request.user, shift.staff_id):
+            return Response({"error": "You are not allowed to view this shift."}, status=status.HTTP_403_FORBIDDEN)
+        return Response(shifts.z_report(shift))
@@ -0,0 +1,27 @@
+from rest_framework import generics
+
+from pos_app.models.stock_adjustment import StockAdjustment
+from pos_app.permissions import IsManager, IsSuperuser, IsSupervisor
+from pos_app.serializers.stock_adjustment_serializer import StockAdjustmentSerializer
+
+
+class StockAdjustmentListCreateView(generics.ListCreateAPIView):
+    """
+    Stock counts and deliveries for many items at once.
+
+    POST ``{"reason": "count", "items": [{"item": 1, "counted": 40}, {"item": 2, "delta": 24}]}``.
+    GET lists the latest adjustments (``?limit=``, default 50), newest first.
+    """
+    serializer_class = StockAdjustmentSerializer
+    permission_classes = [IsManager | IsSupervisor | IsSuperuser]
+
+    def get_queryset(self):
+        try:
+            limit = min(max(int(self.request.query_params.get("limit", 50)), 1), 500)
+        except ValueError:
+            limit = 50
+        queryset = StockAdjustment.objects.prefetch_related("lines__item").order_by("-adjustment_id")
+        reason = self.request.query_params.get("reason")
+        if reason:
+            queryset = queryset.filter(reason=reason)
+        return queryset[:limit]
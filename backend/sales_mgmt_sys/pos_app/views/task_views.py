@@ -0,0 +1,51 @@
+import hashlib
+import json
+
+from rest_framework import generics, status
+from rest_framework.response import Response
+
+from pos_app.models.task import Task
+from pos_app.permissions import IsManager, IsSuperuser
+from pos_app.serializers.task_serializer import TaskRequestSerializer, TaskSerializer
+from pos_app.services import tasks
+
+
+class TaskListCreateView(generics.ListAPIView):
+    """
+    Recent background tasks (``?status=``, ``?job=`` to filter). POST
+    ``{"job": name, "args": {...}, "delay": seconds}`` to queue one of the
+    jobs in ``API_JOBS`` and return at once; asking again while the same job
+    and args wait returns the queued task.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [IsManager | IsSuperuser]
+
+    def get_queryset(self):
+        queryset = Task.objects.order_by("-task_id")
+        for field in ("status", "job"):
+            value = self.request.query_params.get(field)
+            if value:
+                queryset = queryset.filter(**{field: value})
+        return queryset[:200]
+
+    def post(self, request, *args, **kwargs):
+        serializer = TaskRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        job, job_args, delay = (serializer.validated_data[name] for name in ("job", "args", "delay"))
+
+        digest = hashlib.sha1(json.dumps(job_args, sort_keys=True).encode()).hexdigest()[:16]
+        key = f"api:{job}:{digest}"
+        tasks.enqueue(job, job_args, key=key, delay=delay)
+        task = tasks.queued(key)
+        if task is None:
+            # A worker already picked it up
+            task = Task.objects.filter(dedupe_key=key).order_by("-task_id").first()
+        return Response(TaskSerializer(task).data, status=status.HTTP_202_ACCEPTED)
+
+
+class TaskDetailView(generics.RetrieveAPIView):
+    """A background task, to follow one queued through POST v1/tasks/"""
+    queryset = Task.objects.all()
+    serializer_class = TaskSerializer
+    permission_classes = [IsManager | IsSuperuser]
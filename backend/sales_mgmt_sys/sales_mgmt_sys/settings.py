@@ -47,8 +47,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'pos_app.middleware.SamplingProfilerMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'pos_app.middleware.CompressionMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware', 
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -76,8 +78,17 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'pos_app.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
+# JSON encoding: "auto" uses orjson when installed, "stdlib" forces DRF's json encoder
+JSON_ENCODER = os.environ.get("JSON_ENCODER", "auto")
+# Responses smaller than this are sent uncompressed
+API_COMPRESSION_MIN_BYTES = 1024
+
 # JWT Settings
 from datetime import timedelta
 SIMPLE_JWT = {
@@ -118,6 +129,20 @@ DATABASES = {
     }
 }
 
+# Read replica for reports, history, exports and analytics (see pos_app.db_router).
+# Locally it is a snapshot of db.sqlite3 kept fresh by `manage.py refresh_replica --interval 60`;
+# until the first copy exists, or once it is older than REPLICA_MAX_LAG seconds, reads use the primary.
+REPLICA_PATH = os.environ.get("POS_REPLICA_PATH", str(BASE_DIR / 'db.replica.sqlite3'))
+REPLICA_MAX_LAG = int(os.environ.get("POS_REPLICA_MAX_LAG", 300))
+if REPLICA_PATH:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        # Opened read-only: nothing may write to the copy
+        'NAME': f'file:{REPLICA_PATH}?mode=ro',
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['pos_app.db_router.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -163,6 +188,91 @@ STORAGES = {
     },
 }
 
+# Cache
+# Holds receipts, the catalog version and tagged report results (see pos_app.services.query_cache).
+# Local memory is per process: with several workers, point POS_CACHE_URL at a shared Redis
+# (e.g. redis://localhost:6379/1, needs the redis package) so invalidations reach every worker.
+CACHE_URL = os.environ.get("POS_CACHE_URL", "")
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_URL,
+    } if CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+QUERY_CACHE_TIMEOUT = 60 * 60
+# Processes keep the price list and pricing rules in memory and check their version in the database at most this often (seconds)
+CACHE_VERSION_CHECK_INTERVAL = 1.0
+
+# Receipts
+# Pre-render receipts in the background after checkout so printing hits the cache
+RECEIPT_PRERENDER = os.environ.get("RECEIPT_PRERENDER", "1") == "1"
+RECEIPT_WORKERS = int(os.environ.get("RECEIPT_WORKERS", 2))
+RECEIPT_SHOP_NAME = "Kali Coffee"
+
+# Archival of old sales (see the archive_sales command)
+ARCHIVE_ROOT = BASE_DIR / 'archive'
+ARCHIVE_HORIZON_DAYS = int(os.environ.get("ARCHIVE_HORIZON_DAYS", 365))
+
+# Online backups (see the backup_db and restore_db commands)
+BACKUP_ROOT = BASE_DIR / 'backups'
+# Pages copied per step of the online backup; a checkout waits for at most one step (about 3 ms per MiB).
+# Every step re-collides with writers and any commit restarts the copy, so fewer, larger steps measured
+# better than many small ones: databases up to 64 MiB copy in one step.
+BACKUP_STEP_PAGES = 16384
+BACKUP_KEEP = 24
+BACKUP_KEEP_DAILY = 14
+
+# Delta catalog syncs (?since= on /v1/items/)
+# Changes stamped this many seconds before a cursor are sent again, covering writes that commit late
+CATALOG_SYNC_OVERLAP = 5
+# Deleted items are remembered this long; terminals that last synced earlier download everything again
+CATALOG_TOMBSTONE_DAYS = 90
+
+# Outbox of sale and stock events (see the dispatch_outbox command)
+# Each sink is a class with a send(events) method plus its keyword arguments, e.g.
+# {"class": "pos_app.services.outbox.WebhookSink", "url": "https://accounting.example/hooks/pos"}
+OUTBOX_SINKS = [
+    {"class": "pos_app.services.outbox.FileSink", "path": BASE_DIR / 'outbox' / 'events.jsonl'},
+]
+OUTBOX_BATCH_SIZE = 200
+OUTBOX_MAX_ATTEMPTS = 10
+OUTBOX_RETAIN_DAYS = 7
+
+# Background tasks (see pos_app.services.tasks and the run_worker command)
+# Jobs run on a pool of threads, or of processes for CPU-bound work such as forecasts
+TASK_WORKERS = int(os.environ.get("TASK_WORKERS", 2))
+TASK_POOL = os.environ.get("TASK_POOL", "thread")
+TASK_MAX_ATTEMPTS = 5
+TASK_RETAIN_DAYS = 7
+# Periodic jobs queued by the worker: each runs again this many seconds after its last run finished
+TASK_SCHEDULE = {
+    "staff_performance": {"job": "staff_performance", "every": 15 * 60},
+    "forecasts": {"job": "forecasts", "every": 24 * 60 * 60},
+    "purge_tasks": {"job": "purge_tasks", "every": 24 * 60 * 60},
+}
+# Materialized staff performance rows are refreshed in the background this many seconds after a sale changes them
+STAFF_PERFORMANCE_REFRESH_DELAY = 30
+
+# Startup
+# Serve collected static files through WhiteNoise from the WSGI entry point
+SERVE_STATIC = True
+# Prime the URLconf, price list and auth machinery while the worker boots (see pos_app.warmup)
+WARMUP_ON_STARTUP = os.environ.get("POS_WARMUP", "1") == "1"
+
+# Sampling profiler (see pos_app.middleware.SamplingProfilerMiddleware)
+# Folded stacks per endpoint land in PROFILER_DIR; render with e.g. `cat profiles/*.folded | flamegraph.pl`
+PROFILER_ENABLED = os.environ.get("POS_PROFILER", "0") == "1"
+PROFILER_SAMPLE_RATE = float(os.environ.get("POS_PROFILER_RATE", 0.01))
+# Per URL name overrides of the sample rate, e.g. {"sales": 0.2}
+PROFILER_ROUTES = {}
+# Requests carrying this value in an X-Profile header are always profiled; empty disables the header
+PROFILER_HEADER_SECRET = os.environ.get("POS_PROFILER_SECRET", "")
+PROFILER_INTERVAL = 0.005
+PROFILER_DIR = BASE_DIR / 'profiles'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
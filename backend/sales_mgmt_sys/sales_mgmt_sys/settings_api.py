@@ -0,0 +1,45 @@
+"""
+API-only settings profile for serverless and Passenger deployments.
+
+Select it with ``DJANGO_SETTINGS_MODULE=sales_mgmt_sys.settings_api``. The
+JSON API authenticates with JWT and never renders HTML, so the admin,
+sessions, messages and static file apps, their middleware and the browsable
+API are left out, which keeps them off the cold-start import path. Run the
+admin from a process using the default ``sales_mgmt_sys.settings``.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS
+    if app not in (
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+    )
+]
+
+MIDDLEWARE = [
+    'pos_app.middleware.SamplingProfilerMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'pos_app.middleware.CompressionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        'pos_app.renderers.FastJSONRenderer',
+    ],
+    # DRF's default parsers import the multipart machinery eagerly; JSON is all terminals send
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+    ],
+}
+
+# No static files are served by the API process
+SERVE_STATIC = False
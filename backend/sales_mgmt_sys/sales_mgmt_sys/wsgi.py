@@ -1,6 +1,6 @@
 import os
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
-from whitenoise import WhiteNoise
 from pathlib import Path
 
 # Define the base directory
@@ -11,7 +11,16 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sales_mgmt_sys.settings')
 application = get_wsgi_application()
 
 # Correct WhiteNoise configuration
-application = WhiteNoise(application, root=os.path.join(BASE_DIR, 'staticfiles'))
+if getattr(settings, "SERVE_STATIC", True):
+    from whitenoise import WhiteNoise
+
+    application = WhiteNoise(application, root=os.path.join(BASE_DIR, 'staticfiles'))
+
+# Pay for imports and caches at boot instead of on the first request
+if getattr(settings, "WARMUP_ON_STARTUP", False):
+    from pos_app.warmup import warm_up
+
+    warm_up()
 
 # For Vercel
-app = application
\ No newline at end of file
+app = application